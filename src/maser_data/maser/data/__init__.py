@@ -1,50 +1,70 @@
 # -*- coding: utf-8 -*-
 from .base import Data
+from .collection import Collection  # noqa: F401
 from pathlib import Path
 
-from .cdpp import (  # noqa: F401
-    WindWavesRad1L260sV2BinData,
-    WindWavesRad1L2BinData,
-    WindWavesRad2L260sV2BinData,
-    WindWavesTnrL260sV2BinData,
-    WindWavesTnrL3Bqt1mnBinData,
-    WindWavesTnrL3NnBinData,
-    WindWavesRad1L260sV1BinData,
-    WindWavesRad2L260sV1BinData,
-    WindWavesTnrL260sV1BinData,
-    VikingV4nE5BinData,
-    InterballAuroralPolradRspBinData,
-)
-from .ecallisto import (  # noqa: F401
-    ECallistoFitsData,
-)
-from .nancay import (  # noqa: F401
-    SrnNdaRoutineJupEdrCdfData,
-    NenufarBstFitsData,
-)
+# the readers are only imported when they are accessed (e.g., `maser.data.Pds3Data`),
+# or when their dataset is resolved by `Data` (see `base/registry.py`)
+_LAZY_IMPORTS = {
+    ".cdpp": [
+        "WindWavesRad1L260sV2BinData",
+        "WindWavesRad1L2BinData",
+        "WindWavesRad2L260sV2BinData",
+        "WindWavesTnrL260sV2BinData",
+        "WindWavesTnrL3Bqt1mnBinData",
+        "WindWavesTnrL3NnBinData",
+        "WindWavesRad1L260sV1BinData",
+        "WindWavesRad2L260sV1BinData",
+        "WindWavesTnrL260sV1BinData",
+        "VikingV4nE5BinData",
+        "InterballAuroralPolradRspBinData",
+    ],
+    ".ecallisto": [
+        "ECallistoFitsData",
+    ],
+    ".nancay": [
+        "SrnNdaRoutineJupEdrCdfData",
+        "NenufarBstFitsData",
+    ],
+    ".padc": [
+        "JnoWavLesiaL3aV02Data",
+        "CoRpwsHfrKronosN1Data",
+        "CoRpwsHfrKronosN2Data",
+    ],
+    ".pds": [
+        "Pds3Data",
+        "Vg1JPra3RdrLowband6secV1Data",
+        "Vg1JPra4SummBrowse48secV1Data",
+        "Vg1SPra3RdrLowband6secV1Data",
+        "Vg2NPra2RdrHighrate60msV1Data",
+        "Vg2NPra3RdrLowband6secV1Data",
+        "CoVEJSSSRpws2RefdrWbrFullV1Data",
+        "CoVEJSSSRpws3RdrLrFullV1Data",
+    ],
+    ".psa": [
+        "MexMMarsis3RdrAisExt4V1Data",
+    ],
+    ".rpw": [
+        "RpwLfrSurvBp1",
+    ],
+}
+_LAZY_MODULES = {
+    name: module for module, names in _LAZY_IMPORTS.items() for name in names
+}
 
-# -*- coding: utf-8 -*-
-from .padc import (  # noqa: F401
-    JnoWavLesiaL3aV02Data,
-    CoRpwsHfrKronosN1Data,
-    CoRpwsHfrKronosN2Data,
-)
-
-from .pds import (  # noqa: F401
-    Pds3Data,
-    Vg1JPra3RdrLowband6secV1Data,
-    Vg1JPra4SummBrowse48secV1Data,
-    Vg1SPra3RdrLowband6secV1Data,
-    Vg2NPra2RdrHighrate60msV1Data,
-    Vg2NPra3RdrLowband6secV1Data,
-    CoVEJSSSRpws2RefdrWbrFullV1Data,
-    CoVEJSSSRpws3RdrLrFullV1Data,
-)
-from .psa import MexMMarsis3RdrAisExt4V1Data  # noqa: F401
-
-from .rpw import (  # noqa: F401
-    RpwLfrSurvBp1,
-)
+
+def __getattr__(name):
+    if name in _LAZY_MODULES:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY_MODULES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_MODULES))
 
 
 if __name__ == "__main__":
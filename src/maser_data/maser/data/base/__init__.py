@@ -18,6 +18,12 @@ Iterator classes
 * `Sweeps` Class: Generic iterator class for sweep-based access.
 * `Records` Class: Generic iterator class for record-based access.
 
+Ragged array classes
+--------------------
+
+* `RaggedArray` Class: Flat array of values split into variable-length sweeps.
+* `RaggedData` Class: Sweeps of a dataset stored as ragged arrays (see `as_ragged`).
+
 """
 
 
@@ -34,3 +40,4 @@ from .mixins import (  # noqa: F401
 )
 from .sweeps import Sweeps  # noqa: F401
 from .records import Records  # noqa: F401
+from .ragged import RaggedArray, RaggedData  # noqa: F401
@@ -1,22 +1,30 @@
 # -*- coding: utf-8 -*-
-from typing import Union, Dict, Type, cast, Optional
+from typing import TYPE_CHECKING, Callable, Union, Dict, Type, cast, Optional
 
 from pathlib import Path
-import re
-from astropy.io import fits
 import numpy
 from .sweeps import Sweeps
 from .records import Records
+from .registry import LazyRegistry
+from .cache import get_cache
+from .detection import (
+    bin_filename_patterns,
+    dataset_cache,
+    read_head,
+    sniff_format,
+)
 
-from astropy.time import Time
-from astropy.units import Quantity
+if TYPE_CHECKING:
+    from astropy.time import Time
+    from astropy.units import Quantity
 
 
 class BaseData:
     """Base class for all data classes."""
 
     dataset: str
-    _registry: Dict[str, Type["BaseData"]] = {}
+    # dataset classes are imported on their first lookup (see `registry.py`)
+    _registry: Dict[str, Type["BaseData"]] = LazyRegistry()
     _access_modes = ["sweeps", "records", "file"]
     _iter_sweep_class = Sweeps
     _iter_record_class = Records
@@ -52,8 +60,9 @@ class BaseData:
         else:
             self.access_mode = access_mode
 
-        # a reference to the file object
-        self._file = None
+        # a reference to the file object (it may have been opened by the dataset
+        # detection, see `Data.__new__`)
+        self._file = getattr(self, "_file", None)
 
         # store the computed times/frequencies to avoid computing them again
         self._times = None
@@ -72,6 +81,11 @@ class BaseData:
     def get_dataset(cls, filepath):
         pass
 
+    @classmethod
+    def _detect_dataset(cls, filepath):
+        """Dataset of a file, and the file object opened to detect it (or None)"""
+        return cls.get_dataset(filepath), None
+
 
 class Data(BaseData, dataset="default"):
     """Generic Data class
@@ -90,24 +104,30 @@ class Data(BaseData, dataset="default"):
         if dataset is None:
             # call the base data class __new__ method
             return super().__new__(cls)
-        elif dataset == "__auto__":
+
+        file = None
+        if dataset == "__auto__":
             # try to guess the dataset
-            dataset = cls.get_dataset(cls, filepath)
+            dataset, file = Data._resolve_dataset(filepath)
 
-            # get the dataset class from the registry
-            # we need an explicit cast to make mypy happy
-            dataset_class = BaseData._registry[cast(str, dataset)]
+        # get the dataset class from the registry
+        # we need an explicit cast to make mypy happy
+        dataset_class = BaseData._registry[cast(str, dataset)]
 
-            # create a new instance of the dataset class
+        if not issubclass(dataset_class, cls):
+            # __init__ won't be called on the returned instance
+            if file is not None:
+                dataset_class.close(file)
             # ignore 'gets multiple values for keyword argument "dataset"'
             return dataset_class(filepath, dataset=None, *args, **kwargs)  # type: ignore
-        else:
-            # get the dataset class from the registry
-            dataset_class = BaseData._registry[cast(str, dataset)]
 
-            # create a new instance of the dataset class
-            # ignore 'gets multiple values for keyword argument "dataset"'
-            return dataset_class(filepath, dataset=None, *args, **kwargs)  # type: ignore
+        # create a new instance of the dataset class: __init__ is then called (once) with
+        # the arguments given to Data()
+        instance = super().__new__(dataset_class)
+        if file is not None:
+            # hand over the file object opened during the detection
+            instance._file = file
+        return instance
 
     @classmethod
     def open(cls, filepath: Path, *args, **kwargs):
@@ -144,12 +164,12 @@ class Data(BaseData, dataset="default"):
         return dict()
 
     @property
-    def times(self) -> Optional[Time]:
+    def times(self) -> Optional["Time"]:
         """Generic method to get the time axis."""
         return None
 
     @property
-    def frequencies(self) -> Union[Quantity, Dict, None]:
+    def frequencies(self) -> Union["Quantity", Dict, None]:
         """Generic method to get the spectral axis."""
         return None
 
@@ -171,6 +191,28 @@ class Data(BaseData, dataset="default"):
         if self._file:
             self.close(self._file)
 
+    # version of the arrays decoded by the reader (to be increased when they change, to
+    # invalidate the corresponding entries of the on-disk cache)
+    _cache_version = 1
+
+    def _cached(self, decoder: str, decode: Callable[[], Dict]) -> Dict:
+        """Arrays (dict of arrays, or of dicts of arrays) returned by `decode()`, taken from
+        the on-disk cache if it is enabled (see `maser.data.base.cache`).
+
+        Args:
+            decoder (str): name of the decoder (and of its options)
+            decode (Callable): function decoding the arrays from the file
+        """
+        cache = get_cache()
+        if cache is None:
+            return decode()
+        return cache.get(
+            self.filepath,
+            self.dataset,
+            f"{type(self).__qualname__}.{decoder}:{self._cache_version}",
+            decode,
+        )
+
     @property
     def file_size(self):
         import os
@@ -191,16 +233,43 @@ class Data(BaseData, dataset="default"):
         This method identifies CdfData, FitsData and Pds3Data.
         Other datasets are treated as BinData.
         """
+        dataset, file = Data._resolve_dataset(filepath)
+        if file is not None:
+            BaseData._registry[dataset].close(file)
+        return dataset
+
+    @staticmethod
+    def _resolve_dataset(filepath):
+        """Dataset of a file, and the file object opened to detect it (or None).
+
+        The format of the file is sniffed from its first bytes (or from its extension),
+        and the detected datasets are cached (see `maser.data.base.detection`).
+        """
         filepath = Path(filepath)
-        if filepath.suffix.lower() == ".cdf":
-            dataset = BaseData._registry["cdf"].get_dataset(filepath)
-        elif filepath.suffix.lower() in [".fits", ".fit"]:
-            dataset = BaseData._registry["fits"].get_dataset(filepath)
-        elif filepath.suffix.lower() == ".lbl":
-            dataset = BaseData._registry["pds3"].get_dataset(filepath)
+        key = dataset_cache.key(filepath)
+        dataset = dataset_cache.get(key)
+        if dataset is not None:
+            return dataset, None
+
+        head = read_head(filepath)
+        file_format = sniff_format(filepath, head=head) or "bin"
+        format_class = BaseData._registry[file_format]
+        if file_format == "pds3":
+            dataset, file = format_class.get_dataset(filepath, head=head), None
         else:
-            dataset = BaseData._registry["bin"].get_dataset(filepath)
-        return dataset
+            dataset, file = format_class._detect_dataset(filepath)
+
+        if file is not None:
+            dataset_class = BaseData._registry[dataset]
+            if getattr(dataset_class.open, "__func__", None) is not getattr(
+                format_class.open, "__func__", None
+            ):
+                # the dataset class doesn't use the file object of its format
+                format_class.close(file)
+                file = None
+
+        dataset_cache.set(key, dataset)
+        return dataset, file
 
 
 class CdfData(Data, dataset="cdf"):
@@ -216,10 +285,21 @@ class CdfData(Data, dataset="cdf"):
     @classmethod
     def get_dataset(cls, filepath):
         """Dataset selector for CDF files (must be ISTP compliant)"""
-        with cls.open(filepath) as c:
-            dataset = c.attrs["Logical_source"][...][0]
+        dataset, file = cls._detect_dataset(filepath)
+        cls.close(file)
         return dataset
 
+    @classmethod
+    def _detect_dataset(cls, filepath):
+        # the CDF file is kept open, to be used by the dataset class
+        file = cls.open(filepath)
+        try:
+            dataset = file.attrs["Logical_source"][...][0]
+        except Exception:
+            file.close()
+            raise
+        return dataset, file
+
 
 class FitsData(Data, dataset="fits"):
     """Base class for FITS formatted data. FITS formatted NenuFAR data requires `nenupy`."""
@@ -227,16 +307,22 @@ class FitsData(Data, dataset="fits"):
     @classmethod
     def open(cls, filepath: Path, *args, **kwargs):
         """Open method for FITS formatted data products"""
+        from astropy.io import fits
+
         return fits.open(filepath, *args, **kwargs)
 
     @classmethod
     def get_dataset(cls, filepath):
-        """Dataset selector for FITS files"""
-        with cls.open(filepath) as f:
-            if f[0].header["INSTRUME"] == "NenuFar" and filepath.stem.endswith("_BST"):
-                dataset = "srn_nenufar_bst"
-            elif "e-CALLISTO" in f[0].header["CONTENT"]:
-                dataset = "ecallisto"
+        """Dataset selector for FITS files (only the primary header is read)"""
+        from astropy.io import fits
+
+        filepath = Path(filepath)
+        with open(filepath, "rb") as f:
+            header = fits.Header.fromfile(f)
+        if header["INSTRUME"] == "NenuFar" and filepath.stem.endswith("_BST"):
+            dataset = "srn_nenufar_bst"
+        elif "e-CALLISTO" in header["CONTENT"]:
+            dataset = "ecallisto"
         return dataset
 
 
@@ -256,13 +342,113 @@ class BinData(Data, dataset="bin"):
         """
         filepath = Path(filepath)
 
-        import json
-
-        with open(Path(__file__).parent / "dataset_filename_regex.json") as f:
-            filename_regex = json.load(f)
-
-        for dataset, regex in filename_regex["bin"]:
-            if re.match(regex, filepath.name) is not None:
+        for dataset, regex in bin_filename_patterns():
+            if regex.match(filepath.name) is not None:
                 return dataset
         else:
             raise NotImplementedError()
+
+    def sel(self, time: Optional[slice] = None, frequency: Optional[slice] = None):
+        """Select the sweeps within a time and/or a frequency window.
+
+        Args:
+            time (slice): time interval, as `slice(start, stop)` (bounds are included,
+                `None` for an open bound)
+            frequency (slice): frequency interval, as `slice(start, stop)` (bounds are
+                included, values in kHz if they are not Quantity objects)
+
+        Returns:
+            an iterator over the selected sweeps (with their data restricted to the
+            frequency interval)
+        """
+        sweep_ids = self._sel_sweep_ids(_time_bounds(time))
+        return self._sel_sweeps(sweep_ids, _frequency_bounds(frequency))
+
+    def _sweep_times(self) -> numpy.ndarray:
+        """Time of each sweep (`datetime64[ns]` array) used to resolve time selections.
+
+        Subclasses should override this method if times can be obtained without decoding
+        the sweeps (e.g., from the sweep headers).
+        """
+        if self.times is None:
+            raise NotImplementedError(
+                "Time selection is not available for this dataset."
+            )
+        return self.times.datetime64.astype("datetime64[ns]")
+
+    def _sel_sweep_ids(self, time_bounds) -> Optional[numpy.ndarray]:
+        """Indices of the sweeps within the time bounds (None if all sweeps are selected)"""
+        if time_bounds is None:
+            return None
+        start, stop = time_bounds
+        times = self._sweep_times()
+        mask = numpy.ones(len(times), dtype=bool)
+        if start is not None:
+            mask &= times >= start
+        if stop is not None:
+            mask &= times <= stop
+        return numpy.flatnonzero(mask)
+
+    def _sel_sweeps(self, sweep_ids, frequency_bounds):
+        """Iterate over the selected sweeps.
+
+        This generic version decodes all the sweeps up to the last selected one, and
+        doesn't support frequency selection: subclasses should override it to skip the
+        sweeps (and frequencies) outside of the selection.
+        """
+        if frequency_bounds is not None:
+            raise NotImplementedError(
+                "Frequency selection is not available for this dataset."
+            )
+        if sweep_ids is None:
+            yield from self.sweeps
+            return
+        sweep_ids = set(sweep_ids.tolist())
+        for sweep_id, sweep in enumerate(self.sweeps):
+            if not sweep_ids:
+                break
+            if sweep_id in sweep_ids:
+                sweep_ids.remove(sweep_id)
+                yield sweep
+
+
+def _time_bounds(time: Optional[slice]):
+    """Convert a time slice into a (start, stop) tuple of `datetime64[ns]` (or None)"""
+    from astropy.time import Time
+
+    if time is None:
+        return None
+    return tuple(
+        None if bound is None else Time(bound).datetime64.astype("datetime64[ns]")
+        for bound in (time.start, time.stop)
+    )
+
+
+def _frequency_bounds(frequency: Optional[slice]):
+    """Convert a frequency slice into a (start, stop) tuple of values in kHz (or None)"""
+    from astropy.units import Quantity
+
+    if frequency is None:
+        return None
+    return tuple(
+        (
+            None
+            if bound is None
+            else (
+                bound.to_value("kHz") if isinstance(bound, Quantity) else float(bound)
+            )
+        )
+        for bound in (frequency.start, frequency.stop)
+    )
+
+
+def _frequency_mask(frequencies, frequency_bounds) -> numpy.ndarray:
+    """Mask of the frequencies (in kHz) within the frequency bounds"""
+    frequencies = numpy.asarray(getattr(frequencies, "value", frequencies))
+    mask = numpy.ones(frequencies.shape, dtype=bool)
+    start, stop = frequency_bounds
+    if start is not None:
+        mask &= frequencies >= start
+    if stop is not None:
+        mask &= frequencies <= stop
+    return mask
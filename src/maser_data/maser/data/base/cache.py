@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+
+"""
+On-disk cache of decoded data
+=============================
+
+The arrays decoded by the readers (times, frequencies, per-field values, header tables)
+can be stored in an on-disk cache, so that opening the same file again (e.g., in another
+job) is a memory mapping of the cached arrays instead of a full decoding of the file.
+
+The cache is disabled by default:
+
+    from maser.data.base.cache import enable_cache
+    enable_cache("/path/to/cache", max_size=10 * 2**30)
+
+Each entry of the cache is a directory of `.npy` files (which can be memory mapped),
+keyed by the path, size and modification time of the data file (or by the hash of its
+content), the dataset id, and the name and version of the cached decoder. The least
+recently used entries are evicted when the size of the cache exceeds `max_size`.
+
+Only (nested) dicts of arrays that can be stored without pickling are cached: other
+outputs of the decoders are returned as is, without being stored.
+"""
+
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy
+
+# default maximum size of the cache (bytes)
+DEFAULT_MAX_SIZE = 2**30
+
+_ENTRY_FILE = "entry.json"
+
+
+def default_cache_dir() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "maser" / "data"
+
+
+class DataCache:
+    """Content-addressed on-disk cache of decoded arrays.
+
+    Args:
+        cache_dir (str, Path): directory of the cache (default: `~/.cache/maser/data`)
+        max_size (int): maximum size of the cache, in bytes
+        key_mode (str): "stat" to key the files by (path, size, mtime), or "content" to
+            key them by the hash of their content (slower, but robust to copies/moves)
+    """
+
+    _key_modes = ["stat", "content"]
+
+    def __init__(
+        self,
+        cache_dir: Union[None, str, Path] = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        key_mode: str = "stat",
+    ):
+        if key_mode not in self._key_modes:
+            raise ValueError("Illegal key mode.")
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_size = max_size
+        self.key_mode = key_mode
+        # size of the cache (bytes): scanned on the first save, then updated with the size
+        # of the entries stored by this object (the entries stored by other processes are
+        # only accounted for at the next scan, i.e., when this estimate exceeds `max_size`)
+        self._size: Optional[int] = None
+
+    def __repr__(self):
+        return f"<DataCache: {self.cache_dir}>"
+
+    def _file_key(self, filepath: Path) -> str:
+        if self.key_mode == "content":
+            digest = hashlib.sha256()
+            with open(filepath, "rb") as f:
+                for chunk in iter(lambda: f.read(2**20), b""):
+                    digest.update(chunk)
+            return digest.hexdigest()
+        stat = os.stat(filepath)
+        return f"{os.path.abspath(filepath)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def key(self, filepath: Path, dataset: str, decoder: str) -> str:
+        """Key of the entry storing the output of `decoder` for a file"""
+        return hashlib.sha256(
+            "|".join([self._file_key(filepath), dataset, decoder]).encode()
+        ).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def load(self, key: str) -> Optional[Dict]:
+        """Load (memory map) the arrays of an entry, or return None if not cached."""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path / _ENTRY_FILE) as f:
+                entry = json.load(f)
+            arrays = {}
+            for name in entry["arrays"]:
+                arrays[name] = _load_array(entry_path / f"{name}.npy")
+        except (OSError, ValueError, KeyError):
+            return None
+        # the modification time of the entry file is used for the LRU eviction
+        os.utime(entry_path / _ENTRY_FILE)
+        return _unflatten(arrays, entry.get("dicts", []))
+
+    def save(self, key: str, arrays: Dict) -> bool:
+        """Store the arrays (dict of arrays, or nested dicts of arrays) into an entry.
+
+        Returns:
+            False if the arrays could not be stored (e.g., object arrays, or entry stored
+            by another process meanwhile)
+        """
+        try:
+            arrays, dicts = _flatten(arrays)
+        except (TypeError, ValueError):
+            return False
+        entry_path = self._entry_path(key)
+        tmp_path = entry_path.with_name(f"{key}.{os.getpid()}.tmp")
+        try:
+            tmp_path.mkdir(parents=True, exist_ok=True)
+            for name, array in arrays.items():
+                numpy.save(tmp_path / f"{name}.npy", array, allow_pickle=False)
+            with open(tmp_path / _ENTRY_FILE, "w") as f:
+                json.dump({"arrays": list(arrays), "dicts": dicts}, f)
+            entry_size = sum(path.stat().st_size for path in tmp_path.iterdir())
+            os.replace(tmp_path, entry_path)
+        except (OSError, ValueError):
+            # e.g., the entry has been stored by another process
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return False
+
+        if self._size is None:
+            self._size = self.size
+        else:
+            self._size += entry_size
+        if self._size > self.max_size:
+            self.evict()
+        return True
+
+    def get(self, filepath: Path, dataset: str, decoder: str, decode: Callable) -> Dict:
+        """Arrays returned by `decode()` for a file, taken from the cache if available."""
+        key = self.key(filepath, dataset, decoder)
+        arrays = self.load(key)
+        if arrays is None:
+            arrays = decode()
+            self.save(key, arrays)
+        return arrays
+
+    def _entries(self):
+        """(last access time, size, path) of the entries of the cache"""
+        entries = []
+        if not self.cache_dir.is_dir():
+            return entries
+        for entry_path in self.cache_dir.iterdir():
+            if entry_path.suffix == ".tmp":
+                # entry being stored
+                continue
+            try:
+                atime = os.stat(entry_path / _ENTRY_FILE).st_mtime_ns
+                size = sum(path.stat().st_size for path in entry_path.iterdir())
+            except OSError:
+                continue
+            entries.append((atime, size, entry_path))
+        return entries
+
+    @property
+    def size(self) -> int:
+        """Total size of the cache entries (bytes)"""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in `max_size`."""
+        entries = sorted(self._entries(), key=lambda entry: entry[0])
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in entries:
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(entry_path, ignore_errors=True)
+            total_size -= size
+        self._size = total_size
+
+    def clear(self):
+        for _, _, entry_path in self._entries():
+            shutil.rmtree(entry_path, ignore_errors=True)
+        self._size = None
+
+
+def _load_array(array_path: Path) -> numpy.ndarray:
+    try:
+        return numpy.load(array_path, mmap_mode="r", allow_pickle=False)
+    except ValueError:
+        # e.g., empty arrays can't be memory mapped
+        return numpy.load(array_path, allow_pickle=False)
+
+
+def _flatten(
+    arrays: Dict, prefix: str = ""
+) -> Tuple[Dict[str, numpy.ndarray], List[str]]:
+    """Flatten nested dicts of arrays into a `{"name.sub_name": array}` dict.
+
+    Returns:
+        the flat dict, and the names of the nested dicts (so that the empty ones are
+        restored too)
+
+    Raises:
+        ValueError: if a name can't be used as a file name, or if a value can't be stored
+            without pickling (e.g., object arrays)
+    """
+    flat = {}
+    dicts = []
+    for name, value in arrays.items():
+        if not isinstance(name, str) or name in ("", ".", "..") or "." in name:
+            raise ValueError("Illegal cache entry name.")
+        if "/" in name or os.sep in name:
+            raise ValueError("Illegal cache entry name.")
+        path = prefix + name
+        if isinstance(value, dict):
+            sub_flat, sub_dicts = _flatten(value, path + ".")
+            dicts += [path] + sub_dicts
+            flat.update(sub_flat)
+        else:
+            array = numpy.asarray(value)
+            if array.dtype.hasobject:
+                raise ValueError("Illegal cache entry value.")
+            flat[path] = array
+    return flat, dicts
+
+
+def _unflatten(flat: Dict[str, numpy.ndarray], dicts: List[str]) -> Dict:
+    arrays: Dict = {}
+
+    def parent(names):
+        parent_dict = arrays
+        for name in names:
+            parent_dict = parent_dict.setdefault(name, {})
+        return parent_dict
+
+    for path in dicts:
+        parent(path.split("."))
+    for path, value in flat.items():
+        *names, name = path.split(".")
+        parent(names)[name] = value
+    return arrays
+
+
+_cache: Optional[DataCache] = None
+
+
+def enable_cache(
+    cache_dir: Union[None, str, Path] = None,
+    max_size: int = DEFAULT_MAX_SIZE,
+    key_mode: str = "stat",
+) -> DataCache:
+    """Enable the on-disk cache for the datasets supporting it."""
+    global _cache
+    _cache = DataCache(cache_dir, max_size=max_size, key_mode=key_mode)
+    return _cache
+
+
+def disable_cache():
+    global _cache
+    _cache = None
+
+
+def get_cache() -> Optional[DataCache]:
+    """The enabled cache (or None)"""
+    return _cache
+
+
+@contextmanager
+def cache_enabled(
+    cache_dir: Union[None, str, Path] = None,
+    max_size: int = DEFAULT_MAX_SIZE,
+    key_mode: str = "stat",
+) -> Iterator[DataCache]:
+    """Context manager enabling the on-disk cache (the previous cache is restored on exit)"""
+    global _cache
+    previous_cache = _cache
+    try:
+        yield enable_cache(cache_dir, max_size=max_size, key_mode=key_mode)
+    finally:
+        _cache = previous_cache
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+"""
+Dataset detection
+=================
+
+Helpers used by `Data` to identify the dataset of a file at low cost:
+
+* the file format (CDF, FITS or PDS3) is sniffed from the first bytes of the file,
+* the PDS3 keywords (e.g., `DATA_SET_ID`) are read from the head of the label,
+* the file name regular expressions of the binary datasets are compiled once,
+* the detected datasets are kept in a LRU cache, keyed by the path, size and
+  modification time of the files.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+import json
+import os
+from pathlib import Path
+import re
+from typing import Hashable, List, Optional, Tuple
+
+# number of bytes read to sniff the format of a file
+SNIFF_SIZE = 4096
+
+# first 4 bytes of CDF files (v3.x, v2.6-2.7 and older versions)
+CDF_MAGIC_NUMBERS = (b"\xcd\xf3\x00\x01", b"\xcd\xf2\x60\x02", b"\x00\x00\xff\xff")
+
+# first card of the primary header of FITS files
+FITS_MAGIC = b"SIMPLE  ="
+
+# PDS3 labels start with PDS_VERSION_ID (possibly preceded by a SFDU label)
+PDS3_LABEL_REGEX = re.compile(rb"\s*(CCSD[^\r\n]*\s+)?PDS_VERSION_ID\s*=")
+
+# extensions used when the format can't be sniffed from the file content
+FORMAT_SUFFIXES = {
+    ".cdf": "cdf",
+    ".fits": "fits",
+    ".fit": "fits",
+    ".lbl": "pds3",
+}
+
+
+def read_head(filepath: Path, size: int = SNIFF_SIZE) -> bytes:
+    """First bytes of a file (empty if the file can't be read)"""
+    try:
+        with open(filepath, "rb") as f:
+            return f.read(size)
+    except OSError:
+        return b""
+
+
+def sniff_format(filepath: Path, head: Optional[bytes] = None) -> Optional[str]:
+    """Format of a file ("cdf", "fits" or "pds3") as given by its first bytes, or by
+    its extension. None is returned for other (i.e., custom binary) files.
+    """
+    if head is None:
+        head = read_head(filepath)
+    if head[:4] in CDF_MAGIC_NUMBERS:
+        return "cdf"
+    if head.startswith(FITS_MAGIC):
+        return "fits"
+    if PDS3_LABEL_REGEX.match(head) is not None:
+        return "pds3"
+    return FORMAT_SUFFIXES.get(Path(filepath).suffix.lower())
+
+
+def sniff_pds3_keyword(
+    filepath: Path, keyword: str, head: Optional[bytes] = None
+) -> Optional[str]:
+    """Value of a (single line) PDS3 keyword found in the head of a label, or None if the
+    keyword is not found.
+    """
+    if head is None:
+        head = read_head(filepath)
+    match = re.search(
+        rb"^[ \t]*"
+        + re.escape(keyword.encode())
+        + rb"[ \t]*=[ \t]*([^\r\n]*?)[ \t]*\r?$",
+        head,
+        flags=re.MULTILINE,
+    )
+    if match is None:
+        return None
+    value = match.group(1).decode("ascii", errors="replace")
+    if value.startswith('"') and not (len(value) > 1 and value.endswith('"')):
+        # multi-line string: let the label parser deal with it
+        return None
+    return value
+
+
+@lru_cache(maxsize=None)
+def bin_filename_patterns() -> List[Tuple[str, "re.Pattern"]]:
+    """Compiled file name regular expressions of the binary datasets"""
+    with open(Path(__file__).parent / "dataset_filename_regex.json") as f:
+        filename_regex = json.load(f)
+    return [(dataset, re.compile(regex)) for dataset, regex in filename_regex["bin"]]
+
+
+class DatasetCache:
+    """LRU cache of the detected datasets, keyed by the path, size and modification time
+    of the files (so that modified files are detected again).
+
+    Args:
+        maxsize (int): maximum number of files kept in the cache
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[Hashable, str]" = OrderedDict()
+
+    @staticmethod
+    def key(filepath: Path) -> Optional[Hashable]:
+        """Cache key of a file (None if the file doesn't exist)"""
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        return os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns
+
+    def get(self, key: Optional[Hashable]) -> Optional[str]:
+        if key is None or key not in self._items:
+            return None
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def set(self, key: Optional[Hashable], dataset: str):
+        if key is None or self.maxsize <= 0:
+            return
+        self._items[key] = dataset
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+dataset_cache = DatasetCache()
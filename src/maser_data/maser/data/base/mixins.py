@@ -1,7 +1,35 @@
 # -*- coding: utf-8 -*-
 
 import numpy
-from typing import Union
+from typing import Union, Sequence, Tuple
+
+from .ragged import RaggedArray, RaggedData
+
+
+def classify_sweep_modes(frequencies: Sequence) -> Tuple[numpy.ndarray, list]:
+    """Group sweeps by sweep mode (i.e., by list of frequencies).
+
+    Sweeps are compared using the raw bytes of their frequency arrays, so that each
+    sweep is hashed once, without any conversion or string formatting.
+
+    Args:
+        frequencies (Sequence): list of the frequency arrays (or Quantity) of the sweeps
+
+    Returns:
+        tuple: the mode id of each sweep (int array), and the list of the frequency
+        arrays of the modes (in order of first appearance)
+    """
+    mode_ids = numpy.empty(len(frequencies), dtype=numpy.int64)
+    mode_frequencies = []
+    mode_keys = {}
+    for i, freqs in enumerate(frequencies):
+        key = numpy.ascontiguousarray(getattr(freqs, "value", freqs)).tobytes()
+        mode_id = mode_keys.get(key)
+        if mode_id is None:
+            mode_id = mode_keys[key] = len(mode_frequencies)
+            mode_frequencies.append(freqs)
+        mode_ids[i] = mode_id
+    return mode_ids, mode_frequencies
 
 
 class RecordsOnly:
@@ -21,6 +49,7 @@ class VariableFrequencies:
         self.fixed_frequencies = False
         self._sweep_masks = None
         self._sweep_mode_masks = None
+        self._sweep_modes = None
         self.__frequencies = None
         self.__max_sweep_length = None
 
@@ -28,9 +57,22 @@ class VariableFrequencies:
     def sweep_masks(self) -> Union[list, None]:
         return None
 
+    @property
+    def sweep_modes(self) -> Tuple[numpy.ndarray, list]:
+        """Sweep mode id of each sweep, and list of the frequencies of each mode
+        (see `classify_sweep_modes`)"""
+        if self._sweep_modes is None:
+            self._sweep_modes = classify_sweep_modes(self.frequencies)
+        return self._sweep_modes
+
     @property
     def sweep_mode_masks(self) -> Union[list, None]:
-        return None
+        if self._sweep_mode_masks is None:
+            mode_ids, mode_frequencies = self.sweep_modes
+            self._sweep_mode_masks = [
+                mode_ids == mode_id for mode_id in range(len(mode_frequencies))
+            ]
+        return self._sweep_mode_masks
 
     @property
     def _max_sweep_length(self):
@@ -38,26 +80,44 @@ class VariableFrequencies:
             self.__max_sweep_length = numpy.max([len(f) for f in self.frequencies])
         return self.__max_sweep_length
 
+    def as_ragged(self) -> RaggedData:
+        """Sweeps stored as ragged arrays (see `maser.data.base.ragged`), i.e., one flat
+        array of values and one array of sweep offsets per field, without padding."""
+        frequencies = RaggedArray.from_segments(
+            [f.to_value("kHz") for f in self.frequencies]
+        )
+        segments = {field: [] for field in self.fields}
+        for sweep in self.sweeps:
+            for field in self.fields:
+                segments[field].append(sweep.data[field])
+        return RaggedData(
+            self.times,
+            frequencies,
+            {
+                field: RaggedArray.from_segments(field_segments)
+                for field, field_segments in segments.items()
+            },
+            dict(zip(self.fields, self.units)),
+        )
+
     def as_xarray(self):
         import xarray
 
-        fields = self.fields
-        units = self.units
+        ragged = self.as_ragged()
+        max_sweep_length = self._max_sweep_length
 
-        freq_arr = numpy.full((self._nsweep, self._max_sweep_length), numpy.nan)
-        for i in range(self._nsweep):
-            f = self.frequencies[i].value
-            freq_arr[i, : len(f)] = f
-            freq_arr[i, len(f) :] = f[-1]
+        # the frequencies of the shorter sweeps are padded with their last value
+        freq_arr = ragged.frequencies.to_padded(max_sweep_length, edge=True).astype(
+            float
+        )
 
-        freq_index = range(self._max_sweep_length)
+        freq_index = range(max_sweep_length)
 
         datasets = {}
-        for dataset_key, dataset_unit in zip(fields, units):
-            data_arr = numpy.full((self._nsweep, self._max_sweep_length), numpy.nan)
-            for i, sweep in enumerate(self.sweeps):
-                d = sweep.data[dataset_key]
-                data_arr[i, : len(d)] = d
+        for dataset_key, dataset_unit in zip(self.fields, self.units):
+            data_arr = (
+                ragged.data[dataset_key].to_padded(max_sweep_length).astype(float)
+            )
 
             datasets[dataset_key] = xarray.DataArray(
                 data=data_arr,
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+"""
+Intra-file parallel decoding
+============================
+
+Readers of large files made of independent items (records or sweeps, at known offsets)
+can split the items into contiguous chunks, decoded concurrently by worker processes.
+Each worker reopens the file (with `Data(filepath, dataset, **data_kwargs)`) and calls a
+decoding method of the reader with the `slice` of items of its chunk. The partial results
+are returned in the order of the chunks, so that the output is identical to a serial
+decoding.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, List, Optional
+
+
+def chunk_slices(n_items: int, n_chunks: int) -> List[slice]:
+    """Split `n_items` items into (at most) `n_chunks` contiguous slices of similar size"""
+    n_chunks = max(1, min(n_chunks, n_items))
+    bounds = [n_items * i // n_chunks for i in range(n_chunks + 1)]
+    return [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def _decode_chunk(
+    dataset: str, filepath: Path, data_kwargs: dict, method: str, index: slice
+) -> Any:
+    from .base import Data
+
+    data = Data(filepath, dataset=dataset, **data_kwargs)
+    try:
+        return getattr(data, method)(index)
+    finally:
+        if data._file:
+            data.close(data._file)
+
+
+def parallel_decode(
+    data,
+    method: str,
+    n_items: int,
+    workers: Optional[int],
+    data_kwargs: Optional[dict] = None,
+    min_chunk_size: int = 1,
+) -> List[Any]:
+    """Decode the items of a file by chunks, with `data.<method>(slice)`.
+
+    Args:
+        data (Data): the data object
+        method (str): name of the decoding method (called with the slice of the items of
+            a chunk)
+        n_items (int): number of items of the file
+        workers (int): number of worker processes (the chunks are decoded in the current
+            process if None or lower than 2)
+        data_kwargs (dict): keyword arguments used to reopen the file in the workers
+        min_chunk_size (int): minimum number of items in a chunk
+
+    Returns:
+        the list of the results of each chunk (in order)
+    """
+    n_chunks = 1 if not workers or workers < 2 else workers
+    n_chunks = min(n_chunks, max(1, n_items // max(1, min_chunk_size)))
+    chunks = chunk_slices(n_items, n_chunks) if n_items > 0 else [slice(0, 0)]
+    if len(chunks) == 1:
+        return [getattr(data, method)(chunks[0])]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        futures = [
+            executor.submit(
+                _decode_chunk,
+                data.dataset,
+                data.filepath,
+                data_kwargs or {},
+                method,
+                index,
+            )
+            for index in chunks
+        ]
+        return [future.result() for future in futures]
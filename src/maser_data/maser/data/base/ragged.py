@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+"""
+Ragged arrays of variable-length sweeps
+=======================================
+
+The sweeps of some datasets (e.g., Wind/Waves L2, Cassini/Kronos or Interball/Polrad)
+have a variable number of frequencies (or samples). Instead of padding each sweep to the
+length of the longest one, the values of all the sweeps are stored in one flat array,
+along with an int64 array of offsets: the values of sweep `i` are
+`values[offsets[i]:offsets[i+1]]`.
+
+    ragged = data.as_ragged()
+    peak_flux = ragged.data["VSPAL"].max()  # one value per sweep
+    padded_flux = ragged.data["VSPAL"].to_padded()  # (nsweep, max_length) array
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy
+
+
+class RaggedArray:
+    """Flat array of values, split into variable-length segments (one per sweep).
+
+    Args:
+        values (numpy.ndarray): values of all the segments (concatenated)
+        offsets (numpy.ndarray): index of the first value of each segment, followed by
+            the total number of values (i.e., `len(offsets)` is the number of segments
+            plus one)
+    """
+
+    def __init__(self, values: numpy.ndarray, offsets: numpy.ndarray):
+        offsets = numpy.asarray(offsets, dtype=numpy.int64)
+        if (
+            offsets.ndim != 1
+            or len(offsets) == 0
+            or offsets[0] != 0
+            or offsets[-1] != len(values)
+            or numpy.any(offsets[1:] < offsets[:-1])
+        ):
+            raise ValueError("Illegal ragged array offsets.")
+        self.values = values
+        self.offsets = offsets
+
+    @classmethod
+    def from_segments(cls, segments: Sequence, dtype=None) -> "RaggedArray":
+        """Build a ragged array from a list of segments (None being an empty segment)"""
+        segments = [
+            (
+                numpy.zeros(0, dtype=dtype or float)
+                if segment is None
+                else numpy.asarray(segment, dtype=dtype)
+            )
+            for segment in segments
+        ]
+        offsets = numpy.zeros(len(segments) + 1, dtype=numpy.int64)
+        numpy.cumsum([len(segment) for segment in segments], out=offsets[1:])
+        if segments:
+            values = numpy.concatenate(segments)
+        else:
+            values = numpy.zeros(0, dtype=dtype or float)
+        return cls(values, offsets)
+
+    def __repr__(self):
+        return f"<RaggedArray: {len(self)} segments, {len(self.values)} values>"
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> numpy.ndarray:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Segment index out of range.")
+        return self.values[self.offsets[index] : self.offsets[index + 1]]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def lengths(self) -> numpy.ndarray:
+        """Number of values of each segment"""
+        return numpy.diff(self.offsets)
+
+    @property
+    def max_length(self) -> int:
+        return int(self.lengths.max()) if len(self) else 0
+
+    @property
+    def segment_ids(self) -> numpy.ndarray:
+        """Segment id of each value"""
+        return numpy.repeat(numpy.arange(len(self)), self.lengths)
+
+    @property
+    def positions(self) -> numpy.ndarray:
+        """Position of each value within its segment"""
+        return numpy.arange(len(self.values)) - numpy.repeat(
+            self.offsets[:-1], self.lengths
+        )
+
+    def reduce(self, ufunc: numpy.ufunc, empty=numpy.nan) -> numpy.ndarray:
+        """Reduce each segment with `ufunc` (e.g., `numpy.add`), without any loop over
+        the segments.
+
+        Args:
+            ufunc (numpy.ufunc): binary ufunc used for the reduction
+            empty: value returned for the empty segments
+
+        Returns:
+            the array of the reduced values (one per segment)
+        """
+        lengths = self.lengths
+        nonempty = lengths > 0
+        reduced = ufunc.reduceat(self.values, self.offsets[:-1][nonempty])
+        result = numpy.full(len(self), empty, dtype=numpy.result_type(reduced, empty))
+        result[nonempty] = reduced
+        return result
+
+    def sum(self) -> numpy.ndarray:
+        return self.reduce(numpy.add, empty=0)
+
+    def min(self) -> numpy.ndarray:
+        return self.reduce(numpy.minimum)
+
+    def max(self) -> numpy.ndarray:
+        return self.reduce(numpy.maximum)
+
+    def mean(self) -> numpy.ndarray:
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            return self.reduce(numpy.add) / self.lengths
+
+    def _padded_index(
+        self, length: Optional[int]
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Index of the values in the padded array, and mask of the padded items"""
+        if length is None:
+            length = self.max_length
+        positions = numpy.arange(length)
+        index = self.offsets[:-1, numpy.newaxis] + positions
+        mask = positions >= self.lengths[:, numpy.newaxis]
+        return index, mask
+
+    def to_padded(
+        self, length: Optional[int] = None, fill_value=numpy.nan, edge: bool = False
+    ) -> numpy.ndarray:
+        """Convert into a 2D (segments, length) array.
+
+        Args:
+            length (int): length of the padded segments (default: `max_length`). A
+                ValueError is raised if a segment is longer.
+            fill_value: value of the padded items
+            edge (bool): if True, the segments are padded with their last value instead
+                (the empty segments are filled with `fill_value`)
+
+        Returns:
+            the padded array
+        """
+        if length is not None and length < self.max_length:
+            raise ValueError("Illegal length.")
+        index, mask = self._padded_index(length)
+        if edge:
+            index = numpy.minimum(index, self.offsets[1:, numpy.newaxis] - 1)
+        dtype = numpy.result_type(self.values, fill_value)
+        padded = numpy.full(index.shape, fill_value, dtype=dtype)
+        valid = ~mask | (edge & (self.lengths > 0))[:, numpy.newaxis]
+        padded[valid] = self.values[index[valid]]
+        return padded
+
+
+class RaggedData:
+    """Sweeps of a dataset stored as ragged arrays.
+
+    Args:
+        times (astropy.time.Time): time of each sweep
+        frequencies (RaggedArray): frequencies (kHz) of each sweep
+        data (dict): ragged array of the values of each field
+        units (dict): unit of each field
+    """
+
+    def __init__(
+        self,
+        times,
+        frequencies: RaggedArray,
+        data: Dict[str, RaggedArray],
+        units: Optional[Dict[str, str]] = None,
+    ):
+        if any(len(values) != len(frequencies) for values in data.values()):
+            raise ValueError("The number of sweeps of the fields must be the same.")
+        self.times = times
+        self.frequencies = frequencies
+        self.data = data
+        self.units = units or {}
+
+    def __repr__(self):
+        return f"<RaggedData: {len(self)} sweeps, fields {list(self.data)}>"
+
+    def __len__(self):
+        return len(self.frequencies)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the values and offsets arrays (bytes)"""
+        return sum(
+            array.values.nbytes + array.offsets.nbytes
+            for array in [self.frequencies, *self.data.values()]
+        )
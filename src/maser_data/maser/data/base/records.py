@@ -1,5 +1,11 @@
 # -*- coding: utf-8 -*-
+from collections.abc import Mapping
+import operator
+
+
 class Record:
+    __slots__ = ("header", "data", "_time")
+
     def __init__(self, header, data):
         self.header = header
         self.data = data
@@ -10,6 +16,79 @@ class Record:
         return self._time
 
 
+class HeaderTable:
+    """Headers of the sweeps (or records) of a file, stored as one numpy structured
+    array (one item per sweep), instead of one dict per sweep.
+
+    The items of the table are `HeaderView` objects, i.e., read-only mappings on a row of
+    the array, with the same keys and (Python scalar) values as the header dicts.
+
+    Args:
+        array (numpy.ndarray): structured array of the headers
+        converters (dict): functions converting the raw values of some fields (by
+            default, the values are converted with `.item()`)
+        constants (dict): additional fields with the same value in all the headers
+    """
+
+    def __init__(self, array, converters=None, constants=None):
+        self.array = array
+        self.converters = converters or {}
+        self.constants = constants or {}
+        self._columns = {name: array[name] for name in array.dtype.names}
+        self._keys = tuple(array.dtype.names) + tuple(self.constants)
+
+    def __repr__(self):
+        return f"<HeaderTable: {len(self)} headers>"
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, index) -> "HeaderView":
+        i = operator.index(index)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Header index out of range.")
+        return HeaderView(self, i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield HeaderView(self, i)
+
+    def value(self, index: int, key: str):
+        """Value of the field `key` in the header `index`"""
+        try:
+            column = self._columns[key]
+        except KeyError:
+            return self.constants[key]
+        converter = self.converters.get(key)
+        if converter is None:
+            return column[index].item()
+        return converter(column[index])
+
+
+class HeaderView(Mapping):
+    """Header of a sweep (or record), as a view on a row of a `HeaderTable`"""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: HeaderTable, index: int):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._table.value(self._index, key)
+
+    def __iter__(self):
+        return iter(self._table._keys)
+
+    def __len__(self):
+        return len(self._table._keys)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
 class Records:
     def __init__(self, *, data_instance):
         """_summary_
@@ -18,6 +97,7 @@ class Records:
             data_instance (maser.data.Data): a reference to the parent data object
         """
         self.data_reference = data_instance
+        self._iterator = None
 
     def __iter__(self):
         for d in self.generator:
@@ -40,4 +120,6 @@ class Records:
             yield d
 
     def __next__(self):
-        next(self.generator)
+        if self._iterator is None:
+            self._iterator = iter(self.generator)
+        return next(self._iterator)
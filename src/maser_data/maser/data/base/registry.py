@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+"""
+Lazy dataset registry
+=====================
+
+The dataset classes register themselves in `BaseData._registry` when their module is
+imported. To avoid importing every reader (and their dependencies) when `maser.data` is
+imported, the module implementing each dataset is declared in a static manifest
+(`dataset_modules.json`), and is only imported when the dataset is first resolved.
+
+The manifest is generated with:
+
+    python -m maser.data.base.registry
+"""
+
+from functools import lru_cache
+import importlib
+import json
+from pathlib import Path
+from typing import Dict
+
+DATASET_MODULES_JSON_FILE = Path(__file__).parent / "dataset_modules.json"
+
+# modules defining all the dataset classes of maser.data (used to build the manifest)
+READER_PACKAGES = [
+    "maser.data.cdpp",
+    "maser.data.ecallisto",
+    "maser.data.nancay",
+    "maser.data.padc",
+    "maser.data.pds",
+    "maser.data.psa",
+    "maser.data.rpw",
+]
+
+
+@lru_cache(maxsize=None)
+def dataset_modules() -> Dict[str, str]:
+    """Mapping of the dataset names to the modules implementing them"""
+    with open(DATASET_MODULES_JSON_FILE) as f:
+        return json.load(f)
+
+
+class LazyRegistry(dict):
+    """Registry of the dataset classes. The module of an unregistered dataset is imported
+    (using the manifest) on the first lookup of the dataset."""
+
+    def __missing__(self, dataset):
+        module = dataset_modules().get(dataset)
+        if module is None:
+            raise KeyError(dataset)
+        # importing the module registers its dataset classes
+        importlib.import_module(module)
+        if not dict.__contains__(self, dataset):
+            raise KeyError(dataset)
+        return dict.__getitem__(self, dataset)
+
+
+def build_manifest() -> Dict[str, str]:
+    """Import all the readers, and map the registered datasets to their modules"""
+    from .base import BaseData
+
+    for package in READER_PACKAGES:
+        importlib.import_module(package)
+    return {
+        dataset: cls.__module__
+        for dataset, cls in sorted(BaseData._registry.items())
+        if cls.__module__ != "maser.data.base.base"
+    }
+
+
+if __name__ == "__main__":
+    with open(DATASET_MODULES_JSON_FILE, "w") as f:
+        json.dump(build_manifest(), f, indent=2)
+        f.write("\n")
@@ -3,6 +3,8 @@ from .records import Records, Record
 
 
 class Sweep(Record):
+    __slots__ = ("_frequencies",)
+
     def __init__(self, header, data):
         super().__init__(header, data)
         self._frequencies = None
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batch processing of data files
+==============================
+
+`map_files` applies a function to the `Data` objects of a list of files, in a pool of
+worker processes:
+
+    from maser.data.batch import map_files
+
+    def max_flux(data):
+        return max(numpy.max(sweep.data["VSPAL"]) for sweep in data.sweeps)
+
+    results = map_files(paths, max_flux, workers=32)
+    for result in results:
+        if result.ok:
+            print(result.filepath, result.value)
+        else:
+            print(result.filepath, result.error)
+
+Each file is opened and decoded in a worker process (the `Data` objects are never sent
+between processes, only the file paths and the values returned by the function), and a
+failure on a file is reported in its result without stopping the other files. This
+includes a worker process dying while processing a file (e.g., killed by the OS): the
+pool is then recreated for the files not processed yet, and only the file being
+processed by the dead worker is reported as failed.
+
+The function must be picklable (i.e., defined at the top level of a module), and its
+return values too. When `cache_dir` is given, the workers store the decoded arrays in the
+on-disk cache (see `maser.data.base.cache`), so that the files can then be reopened in the
+main process without decoding them again.
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+import os
+from pathlib import Path
+import traceback
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+from .base import Data
+from .base.cache import DEFAULT_MAX_SIZE, cache_enabled, enable_cache
+
+
+class FileResult(NamedTuple):
+    """Result of the function applied to a file (`error` is the formatted traceback of the
+    exception raised while processing the file, or None)"""
+
+    filepath: Path
+    value: Any = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _apply(func: Callable, filepath: Path, dataset: str, kwargs: dict) -> FileResult:
+    try:
+        data = Data(filepath, dataset=dataset, **kwargs)
+        try:
+            return FileResult(filepath, func(data))
+        finally:
+            if data._file:
+                data.close(data._file)
+    except Exception:
+        return FileResult(filepath, error=traceback.format_exc())
+
+
+def _init_worker(cache_dir, cache_max_size):
+    if cache_dir is not None:
+        enable_cache(cache_dir, max_size=cache_max_size)
+
+
+def _map_pool(
+    func: Callable,
+    items: List[tuple],
+    indices: List[int],
+    workers: int,
+    kwargs: dict,
+    initargs: tuple,
+    results: List[Optional[FileResult]],
+) -> tuple:
+    """Apply `func` to the files `items[indices]` (filepath, dataset) in a new pool of
+    worker processes, with at most `workers` files in progress, and store their results
+    in `results`.
+
+    If a worker process dies, the pool stops: the files in progress get a failed result,
+    and the files not started yet are left to the caller.
+
+    Returns:
+        the indices of the files in progress when a worker process died, and of the files
+        not started yet (both empty if the pool did not break)
+    """
+    todo = deque(indices)
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=initargs
+    ) as executor:
+        running: dict = {}
+        while todo or running:
+            while todo and len(running) < workers:
+                index = todo.popleft()
+                future = executor.submit(_apply, func, *items[index], kwargs)
+                running[future] = index
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            crashed = []
+            for future in done:
+                index = running.pop(future)
+                try:
+                    results[index] = future.result()
+                except BrokenProcessPool:
+                    results[index] = FileResult(
+                        items[index][0], error=traceback.format_exc()
+                    )
+                    crashed.append(index)
+            if crashed:
+                # the pool is broken: the other files in progress fail too
+                for future, index in running.items():
+                    try:
+                        results[index] = future.result()
+                    except BrokenProcessPool:
+                        results[index] = FileResult(
+                            items[index][0], error=traceback.format_exc()
+                        )
+                        crashed.append(index)
+                return sorted(crashed), list(todo)
+    return [], []
+
+
+def map_files(
+    paths: Iterable[Union[str, Path]],
+    func: Callable[[Data], Any],
+    workers: Optional[int] = None,
+    dataset: Union[str, Sequence[str]] = "__auto__",
+    cache_dir: Union[None, str, Path] = None,
+    cache_max_size: int = DEFAULT_MAX_SIZE,
+    **kwargs,
+) -> List[FileResult]:
+    """Apply `func` to the `Data` object of each file, in parallel.
+
+    Args:
+        paths (Iterable): paths of the files
+        func (Callable): function called with the `Data` object of each file
+        workers (int): number of worker processes (default: number of CPUs). With 0 or 1,
+            the files are processed sequentially in the current process.
+        dataset (str, Sequence): dataset of the files (or list of the datasets of each
+            file), detected for each file by default
+        cache_dir (str, Path): if given, the decoded arrays are stored in the on-disk
+            cache located in this directory
+        cache_max_size (int): maximum size of the on-disk cache (bytes)
+        **kwargs: keyword arguments passed to `Data` when opening the files
+
+    Returns:
+        the list of the `FileResult` of each file, in the order of `paths`
+    """
+    paths = [Path(path) for path in paths]
+    if isinstance(dataset, str):
+        datasets = [dataset] * len(paths)
+    else:
+        datasets = list(dataset)
+        if len(datasets) != len(paths):
+            raise ValueError("The number of datasets and paths must be the same.")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        if cache_dir is None:
+            context = nullcontext()
+        else:
+            context = cache_enabled(cache_dir, max_size=cache_max_size)
+        with context:
+            return [
+                _apply(func, path, file_dataset, kwargs)
+                for path, file_dataset in zip(paths, datasets)
+            ]
+
+    items = list(zip(paths, datasets))
+    initargs = (cache_dir, cache_max_size)
+    results: List[Optional[FileResult]] = [None] * len(items)
+    todo = list(range(len(items)))
+    while todo:
+        crashed, todo = _map_pool(func, items, todo, workers, kwargs, initargs, results)
+        if len(crashed) > 1:
+            # several files were in progress when a worker process died: retry them one
+            # at a time, so that only the file killing its worker is reported as failed
+            for index in crashed:
+                _map_pool(func, items, [index], 1, kwargs, initargs, results)
+    return results
@@ -32,3 +32,6 @@ from .interball import (  # noqa: F401
     InterballAuroralPolradRspRecords,
     InterballAuroralPolradRspRecord,
 )
+from .index import (  # noqa: F401
+    SweepIndex,
+)
@@ -12,6 +12,7 @@ __project__ = "MASER/CDPP"
 
 __all__ = [
     "decode_ccsds_date",
+    "decode_ccsds_dates",
     "CCSDSDate",
     "CCSDSDateCUC",
     "CCSDSDateCDS",
@@ -22,6 +23,9 @@ __all__ = [
 
 import datetime
 
+import numpy
+from astropy.time import Time, TimeDelta
+
 # TODO: implement BCD for CCS (but ISEE3-SBH doesn't follow the CCS standard)
 # TODO: fix MSB as described in the CCSDS standard - first bit read is least significant bit
 
@@ -67,6 +71,156 @@ def decode_ccsds_date(p_field, t_field, epoch=None) -> "CCSDSDate":
         raise Exception("Illegal Time Code ID")  # This is for reserved and unknown
 
 
+def decode_ccsds_dates(p_fields, t_fields, epoch=None, bcd=False) -> numpy.ndarray:
+    """Decode arrays of CCSDS dates into a `datetime64[ns]` array.
+
+    This is the vectorized version of `decode_ccsds_date`: the dates are decoded all at
+    once (one pass per distinct `p_field` value), without any intermediate `CCSDSDate` or
+    `datetime` object, and the sub-microsecond part of the time codes is kept.
+
+    :param p_fields: (int or array of int) time code preamble of each date
+    :param t_fields: (2D uint8 array) time specification field of each date (one row per date)
+    :param epoch: Time start epoch (CDS level 2 time codes). If it is an astropy `Time`,
+        the elapsed times are counted in its time scale (i.e., with leap seconds for UTC).
+    :param bcd: (bool) the CCS time codes are encoded in Binary Coded Decimal
+    :return: `datetime64[ns]` array
+    """
+    t_fields = numpy.atleast_2d(numpy.asarray(t_fields, dtype=numpy.uint8))
+    p_fields = numpy.broadcast_to(
+        numpy.asarray(p_fields, dtype=numpy.int64), (len(t_fields),)
+    )
+
+    dates = numpy.empty(len(t_fields), dtype="datetime64[ns]")
+    for p_field in numpy.unique(p_fields):
+        mask = p_fields == p_field
+        dates[mask] = _decode_t_fields(int(p_field), t_fields[mask], epoch, bcd)
+    return dates
+
+
+def _decode_t_fields(p_field, t_fields, epoch, bcd) -> numpy.ndarray:
+    """Decode the T_fields (2D uint8 array) of dates sharing the same P_field"""
+    time_code_id = int((p_field & 14) // 2)
+    n_bytes_t_field = t_fields.shape[1]
+
+    if time_code_id == 1:
+        # CCSDS CUC level 1 format
+        n_bytes_coarse_time = int(((p_field & 48) / 16) + 1)
+        n_bytes_fine_time = int((p_field & 192) / 64)
+        if n_bytes_t_field != n_bytes_coarse_time + n_bytes_fine_time:
+            raise Exception(
+                "T_field length does match P_field time format specification"
+            )
+        seconds = _bytes_to_int(t_fields[:, :n_bytes_coarse_time])
+        nanoseconds = (
+            _bytes_to_int(t_fields[:, n_bytes_coarse_time:])
+            * 10**9
+            // 2 ** (8 * n_bytes_fine_time)
+        )
+        return _elapsed_datetime64(
+            numpy.datetime64("1958-01-01", "ns"), seconds * 10**9 + nanoseconds
+        )
+    elif time_code_id == 4:
+        # CCSDS CDS format (level 1 or 2)
+        if p_field & 16 == 0:
+            epoch = numpy.datetime64("1958-01-01", "ns")
+        elif epoch is None:
+            raise Exception("CCSDS CDS level 2 time codes require an epoch")
+        n_bytes_day = int(((p_field & 32) / 32) + 2)
+        n_bytes_sub_millisecond = int((p_field & 192) / 32)
+        if n_bytes_t_field != n_bytes_day + 4 + n_bytes_sub_millisecond:
+            raise Exception(
+                "T_field length does match P_field time format specification"
+            )
+        days = _bytes_to_int(t_fields[:, :n_bytes_day])
+        milliseconds = _bytes_to_int(t_fields[:, n_bytes_day : n_bytes_day + 4])
+        sub_milliseconds = _bytes_to_int(t_fields[:, n_bytes_day + 4 :])
+        if n_bytes_sub_millisecond == 4:
+            # picoseconds of millisecond
+            nanoseconds = sub_milliseconds // 1000
+        else:
+            # microseconds of millisecond
+            nanoseconds = sub_milliseconds * 1000
+        return _elapsed_datetime64(
+            epoch, (days * 86400000 + milliseconds) * 10**6 + nanoseconds
+        )
+    elif time_code_id == 5:
+        # CCSDS CCS format
+        resolution = int((p_field & 224) / 32)
+        if n_bytes_t_field != 7 + resolution:
+            raise Exception(
+                "T_field length does match P_field time format specification"
+            )
+        values = t_fields.astype(numpy.int64)
+        if bcd:
+            values = (values >> 4) * 10 + (values & 15)
+            year = values[:, 0] * 100 + values[:, 1]
+        else:
+            year = values[:, 0] * 256 + values[:, 1]
+        years = (year - 1970).astype("datetime64[Y]")
+        if p_field & 16 == 16:
+            # day of year
+            factor = 100 if bcd else 256
+            days = years.astype("datetime64[D]") + (
+                values[:, 2] * factor + values[:, 3] - 1
+            ).astype("timedelta64[D]")
+        else:
+            months = years.astype("datetime64[M]") + (values[:, 2] - 1).astype(
+                "timedelta64[M]"
+            )
+            days = months.astype("datetime64[D]") + (values[:, 3] - 1).astype(
+                "timedelta64[D]"
+            )
+        seconds = (values[:, 4] * 60 + values[:, 5]) * 60 + values[:, 6]
+
+        # each byte of the sub-second field holds 2 decimal digits
+        sub_second = numpy.zeros(len(values), dtype=numpy.int64)
+        for i in range(7, 7 + resolution):
+            sub_second = sub_second * 100 + values[:, i]
+        if 2 * resolution <= 9:
+            nanoseconds = sub_second * 10 ** (9 - 2 * resolution)
+        else:
+            nanoseconds = sub_second // 10 ** (2 * resolution - 9)
+        return days.astype("datetime64[ns]") + (seconds * 10**9 + nanoseconds).astype(
+            "timedelta64[ns]"
+        )
+    elif time_code_id == 2:
+        raise NotImplementedError("CCSDS CUC level 2")
+    elif time_code_id == 6:
+        raise NotImplementedError("CCSDS Agency Defined level 2")
+    else:
+        raise Exception("Illegal Time Code ID")
+
+
+def _bytes_to_int(columns) -> numpy.ndarray:
+    """Big-endian integer value of the (uint8) columns of a 2D array"""
+    value = numpy.zeros(len(columns), dtype=numpy.int64)
+    for i in range(columns.shape[1]):
+        value = value * 256 + columns[:, i]
+    return value
+
+
+def _elapsed_datetime64(epoch, nanoseconds) -> numpy.ndarray:
+    """Add elapsed times (int64 nanoseconds) to an epoch.
+
+    As in `epoch + datetime.timedelta(...)`, the elapsed times are counted in the time
+    scale of the epoch if it is an astropy `Time` (i.e., UTC leap seconds are taken into
+    account), and added to the calendar time otherwise.
+    """
+    if not isinstance(epoch, Time):
+        return numpy.datetime64(epoch, "ns") + nanoseconds.astype("timedelta64[ns]")
+    origin = numpy.datetime64(epoch.datetime64, "ns")
+    seconds = nanoseconds // 10**9
+    shifted = (epoch + TimeDelta(seconds, format="sec")).datetime64.astype(
+        "datetime64[ns]"
+    )
+    # number of leap seconds between the epoch and each time
+    leap_seconds = numpy.round(
+        (shifted - origin - seconds.astype("timedelta64[s]"))
+        / numpy.timedelta64(1, "s")
+    ).astype(numpy.int64)
+    return origin + (nanoseconds + leap_seconds * 10**9).astype("timedelta64[ns]")
+
+
 class CCSDSDate(object):
     """Base Class for CCSDS time format object.
 
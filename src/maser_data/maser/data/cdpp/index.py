@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+"""
+Sweep offset index for CDPP record-length-prefixed binary files
+===============================================================
+
+In CDPP binary files, each sweep (or record) is stored as `[length][payload][length]`,
+so that the position of sweep N is only known after reading the N-1 previous ones. The
+`SweepIndex` class scans the length prefixes once and records the byte offset, the length
+and the fixed-size header of each sweep. The index can be persisted as a sidecar file,
+which is reused as long as the size and modification time of the data file are unchanged.
+
+The `IndexedBinData` (data class) and `IndexedItems` (iterator class) mixins use the index
+to provide `len(data)`, `data.sweeps[i]` and `data.sweeps[i:j]` without decoding the
+payloads of the other sweeps.
+"""
+
+import mmap
+import operator
+import os
+from pathlib import Path
+from typing import Union, Optional
+
+import numpy
+from astropy.time import Time
+
+from maser.data.base.records import HeaderTable
+from .utils import _scan_sweep_offsets, _read_records, _header_datetime64
+
+
+class SweepIndex:
+    """Index of the sweeps of a CDPP record-length-prefixed binary file.
+
+    Attributes:
+        offsets (numpy.ndarray): byte offset of each sweep payload (after the leading length prefix)
+        lengths (numpy.ndarray): length (in bytes) of each sweep payload
+        headers (numpy.ndarray): fixed-size header of each sweep (numpy structured array)
+    """
+
+    _version = 1
+    _sidecar_suffix = ".sweep_index.npz"
+
+    def __init__(self, offsets, lengths, headers):
+        self.offsets = offsets
+        self.lengths = lengths
+        self.headers = headers
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __repr__(self):
+        return f"<SweepIndex: {len(self)} sweeps>"
+
+    @classmethod
+    def build(cls, filepath: Path, header_dtype: numpy.dtype) -> "SweepIndex":
+        """Build the index by scanning the length prefixes of the file.
+
+        The file is memory mapped, so that only the pages containing the length prefixes
+        and the sweep headers are actually read.
+        """
+        header_dtype = numpy.dtype(header_dtype)
+        with open(filepath, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(
+                    numpy.zeros(0, dtype=numpy.int64),
+                    numpy.zeros(0, dtype=numpy.int64),
+                    numpy.zeros(0, dtype=header_dtype.newbyteorder("=")),
+                )
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                offsets, lengths = _scan_sweep_offsets(buffer)
+                headers = _read_records(buffer, offsets, header_dtype)
+        return cls(offsets, lengths, headers)
+
+    @classmethod
+    def sidecar_path(
+        cls, filepath: Path, index_dir: Union[None, str, Path] = None
+    ) -> Path:
+        """Path of the sidecar index file (next to the data file, or in `index_dir`)"""
+        filepath = Path(filepath)
+        if index_dir is None:
+            index_dir = filepath.parent
+        return Path(index_dir) / (filepath.name + cls._sidecar_suffix)
+
+    @staticmethod
+    def _file_key(filepath: Path):
+        stat = os.stat(filepath)
+        return numpy.array([stat.st_size, stat.st_mtime_ns], dtype=numpy.int64)
+
+    def save(self, index_path: Path, filepath: Path):
+        """Save the index into `index_path`, keyed by the size and mtime of `filepath`."""
+        index_path = Path(index_path)
+        tmp_path = index_path.with_name(index_path.name + f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            numpy.savez(
+                f,
+                version=numpy.array(self._version),
+                file_key=self._file_key(filepath),
+                offsets=self.offsets,
+                lengths=self.lengths,
+                headers=self.headers,
+            )
+        os.replace(tmp_path, index_path)
+
+    @classmethod
+    def load(
+        cls, index_path: Path, filepath: Path, header_dtype: numpy.dtype
+    ) -> Optional["SweepIndex"]:
+        """Load the index from `index_path`.
+
+        Returns None if the sidecar file doesn't exist or is stale (i.e., it was built for
+        another version of the data file, or with another header layout).
+        """
+        try:
+            with numpy.load(index_path, allow_pickle=False) as sidecar:
+                if (
+                    int(sidecar["version"]) != cls._version
+                    or not numpy.array_equal(
+                        sidecar["file_key"], cls._file_key(filepath)
+                    )
+                    or sidecar["headers"].dtype
+                    != numpy.dtype(header_dtype).newbyteorder("=")
+                ):
+                    return None
+                return cls(sidecar["offsets"], sidecar["lengths"], sidecar["headers"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @classmethod
+    def from_file(
+        cls,
+        filepath: Path,
+        header_dtype: numpy.dtype,
+        persist: bool = False,
+        index_dir: Union[None, str, Path] = None,
+    ) -> "SweepIndex":
+        """Get the index of a file, using (and updating) the sidecar file if `persist` is True."""
+        if not persist:
+            return cls.build(filepath, header_dtype)
+
+        index_path = cls.sidecar_path(filepath, index_dir)
+        index = cls.load(index_path, filepath, header_dtype)
+        if index is None:
+            index = cls.build(filepath, header_dtype)
+            try:
+                index.save(index_path, filepath)
+            except OSError:
+                # read-only location: the index is simply not persisted
+                pass
+        return index
+
+
+class IndexedItems:
+    """Mixin for Sweeps/Records iterator classes, providing random access through
+    the sweep index of the parent data object.
+
+    Iterator classes using this mixin must implement `_decode_item(item_id)`, which
+    decodes the item starting at the current position of the file.
+    """
+
+    def __len__(self):
+        return len(self.data_reference.index)
+
+    def __getitem__(self, item):
+        nitem = len(self)
+        if isinstance(item, slice):
+            return [self._read_item(i) for i in range(*item.indices(nitem))]
+        i = operator.index(item)
+        if i < 0:
+            i += nitem
+        if not 0 <= i < nitem:
+            raise IndexError("Sweep index out of range.")
+        return self._read_item(i)
+
+    def _read_item(self, item_id: int):
+        # go back to the leading length prefix of the item
+        self.file.seek(int(self.data_reference.index.offsets[item_id]) - 4)
+        return self._decode_item(item_id)
+
+    def _decode_item(self, item_id: Optional[int] = None):  # pragma: no cover
+        raise NotImplementedError()
+
+
+class IndexedBinData:
+    """Mixin for CDPP record-length-prefixed binary data classes, providing the sweep
+    offset index (`index` attribute), `len(data)`, and random access to sweeps/records.
+
+    Data classes using this mixin must define the numpy dtype of the fixed-size header
+    located just after the length prefix of each sweep (`_index_header_dtype`). The
+    headers of the index are also the headers of the sweeps/records (`header_table`),
+    and give the times of the sweeps/records (`times`).
+    """
+
+    _index_header_dtype: numpy.dtype
+
+    def _init_index(
+        self, persist_index: bool = False, index_dir: Union[None, str, Path] = None
+    ):
+        self._index = None
+        self._header_table = None
+        self.persist_index = persist_index
+        self.index_dir = index_dir
+
+    @property
+    def index(self) -> SweepIndex:
+        if self._index is None:
+            self._index = SweepIndex.from_file(
+                self.filepath,
+                self._index_header_dtype,
+                persist=self.persist_index,
+                index_dir=self.index_dir,
+            )
+        return self._index
+
+    @property
+    def header_table(self) -> HeaderTable:
+        """Headers of the sweeps/records (one `HeaderView` per sweep/record)"""
+        if self._header_table is None:
+            self._header_table = self._make_header_table(self.index.headers)
+        return self._header_table
+
+    def _make_header_table(self, headers: numpy.ndarray) -> HeaderTable:
+        return HeaderTable(headers)
+
+    def _sweep_times(self) -> numpy.ndarray:
+        # times decoded from the headers of the index, without decoding the sweeps
+        return _header_datetime64(self.index.headers)
+
+    @property
+    def times(self):
+        if self._times is None:
+            self._times = Time(self._sweep_times())
+        return self._times
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def sweeps(self):
+        return self._iter_sweep_class(data_instance=self)
+
+    @property
+    def records(self):
+        return self._iter_record_class(data_instance=self)
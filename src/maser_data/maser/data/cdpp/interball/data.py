@@ -6,118 +6,201 @@ from pathlib import Path
 import numpy
 
 from typing import Union
-from astropy.time import Time
+from maser.data.base.base import _frequency_mask
+from maser.data.base.records import HeaderTable
+from maser.data.base.ragged import RaggedArray, RaggedData
 from ..const import CCSDS_CDS_FIELDS
-from ..utils import _read_sweep_length, _read_block
+from ..utils import (
+    CCSDS_CDS_LEVEL2_EPOCH,
+    _cdpp_p_fields,
+    _numpy_dtype,
+    _read_records,
+)
+from ..index import IndexedBinData
 
 
-class InterballAuroralPolradRspBinData(BinData, dataset="cdpp_int_aur_polrad_rspn2"):
+class InterballAuroralPolradRspBinData(
+    IndexedBinData, BinData, dataset="cdpp_int_aur_polrad_rspn2"
+):
     """Class for `cdpp_int_aur_polrad_rspn2` binary data"""
 
     _iter_sweep_class = InterballAuroralPolradRspSweeps
     _iter_record_class = InterballAuroralPolradRspRecords
 
+    _sfa_conf_fields, _sfa_conf_dtype = (
+        ["STEPS", "FIRST_FREQ", "CHANNELS", "SWEEP_DURATION", "ATTENUATION"],
+        ">ififi",
+    )
+    _index_header_dtype = numpy.dtype(
+        _numpy_dtype(CCSDS_CDS_FIELDS[1], CCSDS_CDS_FIELDS[0]).descr
+        + [("SESSION_NAME", "S8")]
+        + _numpy_dtype(_sfa_conf_dtype, _sfa_conf_fields).descr
+    )
+
     def __init__(
         self,
         filepath: Path,
         dataset: Union[None, str] = "__auto__",
         access_mode: str = "sweeps",
+        persist_index: bool = False,
+        index_dir: Union[None, str, Path] = None,
     ):
         super().__init__(
             filepath,
             dataset,
             access_mode,
         )
-        self._data = None
-        self._nsweep = None
-        self._data = self._loader()
-
-    def _loader(self, count_only=False):
-        data = []
-        nsweep = 0
-
-        ccsds_fields, ccsds_dtype = CCSDS_CDS_FIELDS
-        sfa_conf_fields, sfa_conf_dtype = (
-            ["STEPS", "FIRST_FREQ", "CHANNELS", "SWEEP_DURATION", "ATTENUATION"],
-            ">ififi",
-        )
+        self._init_index(persist_index, index_dir)
+        self.__data = None
+        self.__sweep_locations = None
 
-        while True:
-            try:
-                # Reading number of octets in the current sweep
-                loctets1 = _read_sweep_length(self.file)
-                if loctets1 is None:
-                    break
-
-                header_i = _read_block(self.file, ccsds_dtype, ccsds_fields)
-
-                # => Here we fix the `P_Field` which is corrupted
-                # First we reverse the order of the bits in the byte
-                P_Field_tmp = int("{:08b}".format(header_i["CCSDS_PREAMBLE"])[::-1], 2)
-                # Then we put back the initial 4-6 bits into bits 1-3 (defining the CSSDS code)
-                # as those bits are not in reverse order in the file...
-                P_Field_tmp = (P_Field_tmp & 241) + (
-                    header_i["CCSDS_PREAMBLE"] & 112
-                ) // 8
-
-                header_i["P_Field"] = P_Field_tmp
-                header_i["T_Field"] = bytearray(
-                    [
-                        header_i["CCSDS_JULIAN_DAY_B1"],
-                        header_i["CCSDS_JULIAN_DAY_B2"],
-                        header_i["CCSDS_JULIAN_DAY_B3"],
-                        header_i["CCSDS_MILLISECONDS_OF_DAY_B0"],
-                        header_i["CCSDS_MILLISECONDS_OF_DAY_B1"],
-                        header_i["CCSDS_MILLISECONDS_OF_DAY_B2"],
-                        header_i["CCSDS_MILLISECONDS_OF_DAY_B3"],
-                    ]
-                )
-
-                header_i["CCSDS_CDS_LEVEL2_EPOCH"] = Time("1950-01-01 00:00:00")
-                header_i["SESSION_NAME"] = "".join(
-                    [x.decode() for x in _read_block(self.file, ">cccccccc")]
-                )
-                header_i.update(_read_block(self.file, sfa_conf_dtype, sfa_conf_fields))
-                header_i["SWEEP_ID"] = nsweep
-
-                data_dtype = ">" + "f" * header_i["STEPS"]
-
-                data_i = dict((("EX", None), ("EY", None), ("EZ", None)))
-                data_i["EY"] = _read_block(self.file, data_dtype)
-                if header_i["CHANNELS"] == 3:
-                    data_i["EZ"] = _read_block(self.file, data_dtype)
-                    data_i["EX"] = _read_block(self.file, data_dtype)
-
-                # Reading number of octets in the current sweep
-                loctets2 = _read_sweep_length(self.file)
-                if loctets2 != loctets1:
-                    print("Error reading file!")
-                    return None
-
-            except EOFError:
-                print("End of file reached")
-                break
-
-            else:
-                data.append((header_i, data_i))
-                nsweep += 1
-
-        self._nsweep = nsweep
-        return data
-
-    def __len__(self):
-        if self._nsweep is None:
-            self._loader(count_only=True)
-        return self._nsweep
+    @property
+    def _data(self):
+        """Decoded sweeps, grouped by (CHANNELS, STEPS) values (see `_decode_sweeps`)"""
+        if self.__data is None:
+            self.__data = self._cached("decode_sweeps", self._decode_sweeps)
+        return self.__data
 
     @property
-    def times(self):
-        if self._times is None:
-            times = []
-            for sweep in self.sweeps:
-                times.append(sweep.time)
-            self._times = Time(times)
-        return self._times
+    def _nsweep(self):
+        return len(self.index)
+
+    def _decode_sweeps(self):
+        """Decode all the sweeps with bulk numpy operations, using the sweep index.
+
+        The sweeps with the same number of channels and steps are decoded together,
+        into dense (nsweep, STEPS) float32 arrays: `EY`, plus `EZ` and `EX` for the
+        sweeps recorded with 3 channels.
+
+        Returns:
+            dict: the arrays of each group of sweeps (keyed by `"{CHANNELS}x{STEPS}"`),
+            along with the ids of the sweeps of the group (`SWEEP_ID`)
+        """
+        index = self.index
+        self.file.seek(0)
+        buffer = self.file.read()
+
+        steps = index.headers["STEPS"].astype(numpy.int64)
+        channels = numpy.where(index.headers["CHANNELS"] == 3, 3, 1)
+        header_size = self._index_header_dtype.itemsize
+        if numpy.any(index.lengths != header_size + 4 * channels * steps):
+            raise IOError("Corrupted file...")
+
+        groups = {}
+        for group_channels, group_steps in set(zip(channels.tolist(), steps.tolist())):
+            sweep_ids = numpy.flatnonzero(
+                (channels == group_channels) & (steps == group_steps)
+            )
+            # block layout in each sweep: EY, EZ, EX
+            keys = ["EY", "EZ", "EX"][:group_channels]
+            blocks = _read_records(
+                buffer,
+                index.offsets[sweep_ids] + header_size,
+                numpy.dtype([(key, ">f4", (group_steps,)) for key in keys]),
+            )
+            groups[f"{group_channels}x{group_steps}"] = dict(
+                SWEEP_ID=sweep_ids,
+                **{key: numpy.ascontiguousarray(blocks[key]) for key in keys},
+            )
+        return groups
+
+    @property
+    def _sweep_locations(self):
+        """Group and row of each sweep in the decoded arrays"""
+        if self.__sweep_locations is None:
+            self.__sweep_locations = [None] * self._nsweep
+            for group in self._data.values():
+                for row, sweep_id in enumerate(group["SWEEP_ID"].tolist()):
+                    self.__sweep_locations[sweep_id] = (group, row)
+        return self.__sweep_locations
+
+    def _read_sweep(self, sweep_id: int):
+        """Decode the sweep `sweep_id` alone, starting at its leading length prefix (at
+        the current position of the file), as a (header, data) tuple.
+
+        This is used for random access (`sweeps[i]`, `sel`), so that the other sweeps are
+        neither read nor decoded.
+        """
+        header_i = self.header_table[sweep_id]
+        steps = int(header_i["STEPS"])
+        # block layout in each sweep: EY, EZ, EX
+        keys = ["EY", "EZ", "EX"][: 3 if header_i["CHANNELS"] == 3 else 1]
+        header_size = self._index_header_dtype.itemsize
+        if self.index.lengths[sweep_id] != header_size + 4 * len(keys) * steps:
+            raise IOError("Corrupted file...")
+
+        self.file.seek(4 + header_size, 1)
+        block = self.file.read(4 * len(keys) * steps)
+        if len(block) != 4 * len(keys) * steps:
+            raise IOError("Corrupted file...")
+        values = numpy.frombuffer(block, dtype=">f4").astype(numpy.float32)
+
+        data_i = dict((("EX", None), ("EY", None), ("EZ", None)))
+        data_i.update(zip(keys, values.reshape(len(keys), steps)))
+        return header_i, data_i
+
+    def _sweep(self, sweep_id: int):
+        """Sweep `sweep_id`, as a (header, data) tuple (the data are rows of the arrays
+        decoded at once for all the sweeps, see `_decode_sweeps`)"""
+        group, row = self._sweep_locations[sweep_id]
+        data_i = {
+            key: group[key][row] if key in group else None for key in ["EX", "EY", "EZ"]
+        }
+        return self.header_table[sweep_id], data_i
+
+    def _make_header_table(self, headers):
+        table = numpy.zeros(
+            len(headers),
+            dtype=headers.dtype.descr
+            + [("P_Field", "u1"), ("T_Field", "u1", (7,)), ("SWEEP_ID", "i8")],
+        )
+        for name in headers.dtype.names:
+            table[name] = headers[name]
+
+        # => Here we fix the `P_Field` which is corrupted
+        table["P_Field"] = _cdpp_p_fields(headers["CCSDS_PREAMBLE"])
+
+        table["T_Field"] = numpy.stack(
+            [
+                headers[name]
+                for name in [
+                    "CCSDS_JULIAN_DAY_B1",
+                    "CCSDS_JULIAN_DAY_B2",
+                    "CCSDS_JULIAN_DAY_B3",
+                    "CCSDS_MILLISECONDS_OF_DAY_B0",
+                    "CCSDS_MILLISECONDS_OF_DAY_B1",
+                    "CCSDS_MILLISECONDS_OF_DAY_B2",
+                    "CCSDS_MILLISECONDS_OF_DAY_B3",
+                ]
+            ],
+            axis=-1,
+        )
+        table["SWEEP_ID"] = numpy.arange(len(headers))
+        return HeaderTable(
+            table,
+            converters={
+                "SESSION_NAME": lambda value: value.decode(),
+                "T_Field": bytearray,
+            },
+            constants={"CCSDS_CDS_LEVEL2_EPOCH": CCSDS_CDS_LEVEL2_EPOCH},
+        )
+
+    def _sel_sweeps(self, sweep_ids, frequency_bounds):
+        sweeps = self.sweeps
+        if sweep_ids is None:
+            sweep_ids = range(len(sweeps))
+        for sweep_id in sweep_ids:
+            # only the selected sweeps are read and decoded (seeking to them using the
+            # sweep offset index)
+            sweep = sweeps[sweep_id]
+            if frequency_bounds is not None:
+                mask = _frequency_mask(sweep.frequencies, frequency_bounds)
+                sweep._frequencies = sweep.frequencies[mask]
+                sweep.data = {
+                    key: None if value is None else value[mask]
+                    for key, value in sweep.data.items()
+                }
+            yield sweep
 
     @property
     def frequencies(self):
@@ -126,6 +209,40 @@ class InterballAuroralPolradRspBinData(BinData, dataset="cdpp_int_aur_polrad_rsp
             self._frequencies = sweep.frequencies
         return self._frequencies
 
+    def as_ragged(self) -> RaggedData:
+        """Sweeps as ragged arrays (the EX and EZ values of the sweeps recorded with one
+        channel are empty)"""
+        steps = self.index.headers["STEPS"].astype(numpy.int64)
+        offsets = numpy.zeros(len(steps) + 1, dtype=numpy.int64)
+        numpy.cumsum(steps, out=offsets[1:])
+        frequencies = RaggedArray(numpy.zeros(offsets[-1]), offsets)
+        # decreasing frequencies of each sweep, as in InterballAuroralPolradRspSweep
+        frequencies.values = (
+            numpy.repeat(steps, steps) - 1 - frequencies.positions
+        ) * 4.096 + 4.096
+        data = {}
+        for key in ["EX", "EY", "EZ"]:
+            # values of the groups of sweeps, scattered at the offsets of their sweeps
+            lengths = numpy.zeros(len(steps), dtype=numpy.int64)
+            groups = [group for group in self._data.values() if key in group]
+            for group in groups:
+                lengths[group["SWEEP_ID"]] = group[key].shape[1]
+            key_offsets = numpy.zeros(len(steps) + 1, dtype=numpy.int64)
+            numpy.cumsum(lengths, out=key_offsets[1:])
+            values = numpy.empty(key_offsets[-1], dtype=numpy.float32)
+            for group in groups:
+                values[
+                    key_offsets[group["SWEEP_ID"], numpy.newaxis]
+                    + numpy.arange(group[key].shape[1])
+                ] = group[key]
+            data[key] = RaggedArray(values, key_offsets)
+        return RaggedData(
+            self.times,
+            frequencies,
+            data,
+            {key: "W m^-2 Hz^-1" for key in ["EX", "EY", "EZ"]},
+        )
+
     @staticmethod
     def decode_session_name(session_name):
         tmp = dict()
@@ -4,6 +4,8 @@ from .sweeps import InterballAuroralPolradRspSweeps
 
 
 class InterballAuroralPolradRspRecord(Record):
+    __slots__ = ("_frequency",)
+
     def __init__(self, header, data, time, frequency):
         super().__init__(header, data)
         self._time = time
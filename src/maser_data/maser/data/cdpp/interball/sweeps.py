@@ -1,31 +1,53 @@
 # -*- coding: utf-8 -*-
+from functools import lru_cache
 from maser.data.base.sweeps import Sweeps, Sweep
-from ..ccsds import decode_ccsds_date
+from ..ccsds import decode_ccsds_dates
+from ..index import IndexedItems
 import numpy
 from astropy.time import Time
 from astropy.units import Unit
 
 
+@lru_cache(maxsize=None)
+def _sweep_frequencies(steps: int):
+    """Frequencies (decreasing, in kHz) of the sweeps of `steps` steps, shared by all the
+    sweeps (read-only)"""
+    frequencies = numpy.flipud(numpy.arange(steps) * 4.096 + 4.096) * Unit("kHz")
+    frequencies.flags.writeable = False
+    return frequencies
+
+
 class InterballAuroralPolradRspSweep(Sweep):
+    __slots__ = ()
+
     @property
     def time(self):
-        return Time(
-            decode_ccsds_date(
-                self.header["P_Field"],
-                self.header["T_Field"],
-                self.header["CCSDS_CDS_LEVEL2_EPOCH"],
-            ).datetime
-        )
+        if self._time is None:
+            self._time = Time(
+                decode_ccsds_dates(
+                    self.header["P_Field"],
+                    self.header["T_Field"],
+                    self.header["CCSDS_CDS_LEVEL2_EPOCH"],
+                )[0]
+            )
+        return self._time
 
     @property
     def frequencies(self):
-        return numpy.flipud(numpy.arange(self.header["STEPS"]) * 4.096 + 4.096) * Unit(
-            "kHz"
-        )
+        if self._frequencies is None:
+            self._frequencies = _sweep_frequencies(self.header["STEPS"])
+        return self._frequencies
 
 
-class InterballAuroralPolradRspSweeps(Sweeps):
+class InterballAuroralPolradRspSweeps(IndexedItems, Sweeps):
     @property
     def generator(self):
-        for sweep in self.data_reference._data:
-            yield InterballAuroralPolradRspSweep(*sweep)
+        # the sweeps are decoded at once by the data object when iterating over them
+        for sweep_id in range(len(self)):
+            yield InterballAuroralPolradRspSweep(*self.data_reference._sweep(sweep_id))
+
+    def _decode_item(self, item_id=None):
+        # random access: only this sweep is read (see `IndexedItems._read_item`)
+        return InterballAuroralPolradRspSweep(
+            *self.data_reference._read_sweep(item_id)
+        )
@@ -1,5 +1,27 @@
 # -*- coding: utf-8 -*-
 import struct
+import numpy
+from astropy.time import Time
+
+from .ccsds import decode_ccsds_dates
+from .const import CCSDS_CDS_FIELDS
+
+# mapping between `struct` format characters and numpy type codes
+_STRUCT_TO_NUMPY_TYPES = {
+    "b": "i1",
+    "B": "u1",
+    "h": "i2",
+    "H": "u2",
+    "i": "i4",
+    "I": "u4",
+    "l": "i4",
+    "L": "u4",
+    "q": "i8",
+    "Q": "u8",
+    "f": "f4",
+    "d": "f8",
+    "c": "S1",
+}
 
 
 def _merge_dtype(dtypes):
@@ -21,3 +43,230 @@ def _read_block(file, dtype, fields=None):
             return struct.unpack(dtype, block)
         else:
             return dict(zip(fields, struct.unpack(dtype, block)))
+
+
+def _numpy_dtype(dtype, fields):
+    """Convert a `struct` format string (with its list of field names) into a
+    numpy structured dtype with the same (packed) memory layout.
+
+    Args:
+        dtype (str): `struct` format string, starting with a byte order character
+        fields (list): names of the fields described by `dtype`
+
+    Returns:
+        numpy.dtype: the equivalent numpy structured dtype
+    """
+    byte_order = dtype[0]
+    type_codes = [_STRUCT_TO_NUMPY_TYPES[c] for c in dtype[1:]]
+    if len(type_codes) != len(fields):
+        raise ValueError("The number of fields does not match the struct format.")
+    return numpy.dtype(
+        [(field, byte_order + code) for field, code in zip(fields, type_codes)]
+    )
+
+
+def _scan_sweep_offsets(buffer):
+    """First pass of the two-pass decoder: walk the record length prefixes of a
+    CDPP binary file and build the table of sweep offsets.
+
+    Each sweep is stored as `[length (>i4)][payload][length (>i4)]`. The trailing
+    lengths are checked against the leading ones in a single vectorized operation.
+
+    Args:
+        buffer (bytes): content of the file
+
+    Returns:
+        tuple: the byte offsets of the sweep payloads and their lengths (numpy int64 arrays)
+    """
+    file_size = len(buffer)
+    starts = []
+    lengths = []
+    position = 0
+    while position + 4 <= file_size:
+        length = int.from_bytes(buffer[position : position + 4], "big", signed=True)
+        starts.append(position + 4)
+        lengths.append(length)
+        position += length + 8
+    if position != file_size:
+        raise IOError("Corrupted file...")
+
+    starts = numpy.array(starts, dtype=numpy.int64)
+    lengths = numpy.array(lengths, dtype=numpy.int64)
+
+    trailing_lengths = _read_records(buffer, starts + lengths, numpy.dtype(">i4"))
+    if numpy.any(trailing_lengths != lengths):
+        raise IOError("Corrupted file...")
+
+    return starts, lengths
+
+
+def _read_records(buffer, offsets, dtype):
+    """Read one (possibly structured) item of type `dtype` at each of the given
+    byte offsets of the buffer.
+
+    Args:
+        buffer (bytes): content of the file
+        offsets (numpy.ndarray): byte offsets of the items
+        dtype (numpy.dtype): dtype of the items
+
+    Returns:
+        numpy.ndarray: the decoded items, in native byte order
+    """
+    dtype = numpy.dtype(dtype)
+    byte_array = numpy.frombuffer(buffer, dtype=numpy.uint8)
+    byte_index = numpy.asarray(offsets, dtype=numpy.int64)[:, None] + numpy.arange(
+        dtype.itemsize
+    )
+    records = byte_array[byte_index].view(dtype).reshape(len(byte_index))
+    return records.astype(dtype.newbyteorder("="))
+
+
+def _read_segments(buffer, offsets, counts, dtype):
+    """Read variable length runs of items of type `dtype` into a single
+    contiguous array.
+
+    The runs are gathered with one memory copy each, and decoded all at once.
+
+    Args:
+        buffer (bytes): content of the file
+        offsets (numpy.ndarray): byte offsets of the first item of each run
+        counts (numpy.ndarray): number of items in each run
+        dtype (numpy.dtype): dtype of the items
+
+    Returns:
+        tuple: the concatenated items (native byte order), and the (len(counts) + 1)
+        array of index offsets of each run in the concatenated array
+    """
+    dtype = numpy.dtype(dtype)
+    counts = numpy.asarray(counts, dtype=numpy.int64)
+
+    index_offsets = numpy.zeros(len(counts) + 1, dtype=numpy.int64)
+    numpy.cumsum(counts, out=index_offsets[1:])
+
+    view = memoryview(buffer)
+    raw = b"".join(
+        [
+            view[offset : offset + nbytes]
+            for offset, nbytes in zip(
+                numpy.asarray(offsets, dtype=numpy.int64).tolist(),
+                (counts * dtype.itemsize).tolist(),
+            )
+        ]
+    )
+    values = numpy.frombuffer(raw, dtype=dtype).astype(dtype.newbyteorder("="))
+
+    return values, index_offsets
+
+
+# epoch of the JULIAN_SEC times of the CDPP datasets
+CDPP_EPOCH = numpy.datetime64("1950-01-01", "ns")
+
+# epoch of the UR8 times (Wind)
+UR8_EPOCH = numpy.datetime64("1982-01-01", "ns")
+
+# (agency defined) epoch of the CCSDS CDS level 2 times of the CDPP datasets
+CCSDS_CDS_LEVEL2_EPOCH = Time("1950-01-01 00:00:00")
+
+# bit-reversed value of each byte
+_REVERSED_BYTES = numpy.array(
+    [int("{:08b}".format(i)[::-1], 2) for i in range(256)], dtype=numpy.uint8
+)
+
+
+def _cdpp_p_fields(preamble) -> numpy.ndarray:
+    """Fix the (corrupted) CCSDS P_Field of the CDPP files, from the CCSDS_PREAMBLE column"""
+    preamble = numpy.asarray(preamble).astype(numpy.uint8)
+    # First we reverse the order of the bits in the byte
+    # Then we put back the initial 4-6 bits into bits 1-3 (defining the CSSDS code)
+    # as those bits are not in reverse order in the file...
+    return (_REVERSED_BYTES[preamble] & 241) + (preamble & 112) // 8
+
+
+def _as_int64(values):
+    return numpy.asarray(values).astype(numpy.int64)
+
+
+def _calendar_datetime64(
+    year, month, day, hour=0, minute=0, second=0, millisecond=0
+) -> numpy.ndarray:
+    """Convert columns of calendar date fields into a `datetime64[ns]` array.
+
+    Args:
+        year, month, day, hour, minute, second, millisecond: arrays (or scalars) of the
+            calendar date fields
+
+    Returns:
+        numpy.ndarray: the `datetime64[ns]` times
+    """
+    months = (_as_int64(year) - 1970) * 12 + _as_int64(month) - 1
+    days = months.astype("datetime64[M]").astype("datetime64[D]") + (
+        _as_int64(day) - 1
+    ).astype("timedelta64[D]")
+    milliseconds = (
+        (_as_int64(hour) * 60 + _as_int64(minute)) * 60 + _as_int64(second)
+    ) * 1000 + _as_int64(millisecond)
+    return days.astype("datetime64[ns]") + milliseconds.astype("timedelta64[ms]")
+
+
+def _julian_sec_datetime64(julian_sec, fraction=0, epoch=CDPP_EPOCH) -> numpy.ndarray:
+    """Convert columns of Wind JULIAN_SEC times (seconds since 1950-01-01, and optional
+    fraction of second) into a `datetime64[ns]` array."""
+    nanoseconds = numpy.round(numpy.asarray(fraction, dtype=numpy.float64) * 1e9)
+    return (
+        epoch
+        + _as_int64(julian_sec).astype("timedelta64[s]")
+        + nanoseconds.astype("timedelta64[ns]")
+    )
+
+
+def _header_columns(headers, fields) -> dict:
+    """Columns (arrays) of some fields of a list of header dicts"""
+    return {
+        field: numpy.array([header[field] for header in headers]) for field in fields
+    }
+
+
+def _header_datetime64(headers) -> numpy.ndarray:
+    """Times (`datetime64[ns]`) of the sweeps/records, from the columns of their headers.
+
+    The time is decoded from the first available set of fields: the calendar date fields
+    (`CALEND_DATE_*`), the Wind `JULIAN_SEC` (and `JULIAN_SEC_FRAC`), the Wind
+    `UR8_TIME`, or the CCSDS CDS fields (`CCSDS_PREAMBLE`, `CCSDS_JULIAN_DAY_B*` and
+    `CCSDS_MILLISECONDS_OF_DAY_B*`, see `decode_ccsds_dates`).
+
+    Args:
+        headers: numpy structured array of the headers, or dict of header columns
+
+    Returns:
+        numpy.ndarray: the `datetime64[ns]` times
+    """
+    names = headers.dtype.names if hasattr(headers, "dtype") else list(headers)
+    if "CALEND_DATE_YEAR" in names:
+        return _calendar_datetime64(
+            headers["CALEND_DATE_YEAR"],
+            headers["CALEND_DATE_MONTH"],
+            headers["CALEND_DATE_DAY"],
+            headers["CALEND_DATE_HOUR"],
+            headers["CALEND_DATE_MINUTE"],
+            headers["CALEND_DATE_SECOND"],
+            (
+                headers["CALEND_DATE_MILLI_SECOND"]
+                if "CALEND_DATE_MILLI_SECOND" in names
+                else 0
+            ),
+        )
+    if "JULIAN_SEC" in names:
+        return _julian_sec_datetime64(
+            headers["JULIAN_SEC"],
+            headers["JULIAN_SEC_FRAC"] if "JULIAN_SEC_FRAC" in names else 0,
+        )
+    if "UR8_TIME" in names:
+        nanoseconds = numpy.round(numpy.asarray(headers["UR8_TIME"]) * 86400e9)
+        return UR8_EPOCH + nanoseconds.astype("timedelta64[ns]")
+    if "CCSDS_JULIAN_DAY_B1" in names:
+        return decode_ccsds_dates(
+            _cdpp_p_fields(headers["CCSDS_PREAMBLE"]),
+            numpy.stack([headers[name] for name in CCSDS_CDS_FIELDS[0][1:]], axis=-1),
+            CCSDS_CDS_LEVEL2_EPOCH,
+        )
+    raise ValueError("No time fields in the headers.")
@@ -1,14 +1,27 @@
 # -*- coding: utf-8 -*-
 from pathlib import Path
-from typing import Union, Type
+from typing import List, Union, Type
 from maser.data.base import BinData, RecordsOnly
-from .records import VikingV4nE5Records
+from maser.data.base.parallel import parallel_decode
+from .records import (
+    VikingV4nE5Records,
+    PRODUCTS,
+    RECORD_LENGTH,
+    _read_products,
+    _read_records,
+)
+from ..const import CALDATE_FIELDS
+from ..utils import _header_columns, _header_datetime64
 
 from astropy.time import Time
 
 
 class VikingV4nE5BinData(RecordsOnly, BinData, dataset="cdpp_viking_v4n_e5"):
     _iter_sweep_class = Type[VikingV4nE5Records]
+    _iter_record_class = VikingV4nE5Records
+
+    # minimum number of records decoded by a worker process (see `workers`)
+    _min_chunk_size = 64
 
     def __init__(
         self,
@@ -16,24 +29,71 @@ class VikingV4nE5BinData(RecordsOnly, BinData, dataset="cdpp_viking_v4n_e5"):
         dataset: Union[None, str] = "__auto__",
         access_mode: str = "records",
         load_data: bool = True,
+        workers: int = 1,
+        products: Union[None, List[str]] = None,
     ) -> None:
         super().__init__(filepath, dataset, access_mode, load_data)
+        # number of worker processes used to decode the records
+        self.workers = workers
+        # products decoded in the records (all of them if None, see `PRODUCTS`)
+        if products is not None:
+            if any(product not in PRODUCTS for product in products):
+                raise ValueError("Illegal product.")
+            products = list(products)
+        self.products = products
+        self.__records = None
+
+    @property
+    def _nrecord(self):
+        return self.file_size // RECORD_LENGTH
+
+    @property
+    def _records(self):
+        """Records decoded by chunks in worker processes (None if `workers` < 2, the
+        records are then decoded on the fly while iterating over them)"""
+        if self.workers < 2:
+            return None
+        if self.__records is None:
+            self.__records = [
+                record
+                for chunk in parallel_decode(
+                    self,
+                    "_decode_records",
+                    self._nrecord,
+                    self.workers,
+                    data_kwargs={"products": self.products},
+                    min_chunk_size=self._min_chunk_size,
+                )
+                for record in chunk
+            ]
+        return self.__records
+
+    def _decode_records(self, index: slice) -> list:
+        """Decode a (contiguous) range of records"""
+        with self.open(self.filepath) as f:
+            f.seek(index.start * RECORD_LENGTH)
+            return list(self._read_records(f, index.stop - index.start))
+
+    def _read_records(self, file, nrecords=None):
+        """Decode the records from the current position of `file` (all the products, or
+        the selected ones as masked arrays)"""
+        if self.products is None:
+            return _read_records(file, nrecords)
+        return _read_products(file, self.products, nrecords)
 
     @property
     def times(self):
         if self._times is None:
-            times = []
-            _load_data, self._load_data = self._load_data, False
-            for header, _ in self.sweeps:
-                times.append(
-                    Time(
-                        f"{header[0]['CALEND_DATE_YEAR']}-{header[0]['CALEND_DATE_MONTH']}-"
-                        f"{header[0]['CALEND_DATE_DAY']} {header[0]['CALEND_DATE_HOUR']}:"
-                        f"{header[0]['CALEND_DATE_MINUTE']}:{header[0]['CALEND_DATE_SECOND']}"
+            # only the headers are needed
+            self.file.seek(0)
+            headers = [header[0] for header, *_ in _read_products(self.file, [])]
+            self._times = Time(
+                _header_datetime64(
+                    _header_columns(
+                        headers, CALDATE_FIELDS[0] + ["CALEND_DATE_MILLI_SECOND"]
                     )
                 )
-            self._load_data = _load_data
-            self._times = Time(times)
+            )
         return self._times
 
     def frequencies(self):
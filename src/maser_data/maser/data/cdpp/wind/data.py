@@ -2,15 +2,29 @@
 from typing import Union
 from pathlib import Path
 from maser.data.base import BinData, RecordsOnly, VariableFrequencies
+from maser.data.base.base import _frequency_mask
+from maser.data.base.ragged import RaggedArray, RaggedData
+from maser.data.base.records import HeaderTable
 from .sweeps import (
     WindWavesL260sSweeps,
     WindWavesL2HighResSweeps,
     WindWaves60sSweeps,
 )
 from .records import WindWavesTnrL3Bqt1mnRecords
+from ..index import IndexedBinData, SweepIndex
 from astropy.time import Time
 from astropy.units import Unit
-from ..utils import _read_sweep_length, _merge_dtype, _read_block
+from ..utils import (
+    _read_sweep_length,
+    _merge_dtype,
+    _read_block,
+    _numpy_dtype,
+    _scan_sweep_offsets,
+    _read_records,
+    _read_segments,
+    _header_columns,
+    _header_datetime64,
+)
 from ..const import (
     CCSDS_CDS_FIELDS,
     CALDATE_FIELDS,
@@ -19,7 +33,151 @@ from ..const import (
 import numpy
 
 
-class WindWavesRad1L260sV2BinData(BinData, dataset="cdpp_wi_wa_rad1_l2_60s_v2"):
+class WindWavesL260sV2BinData(
+    VariableFrequencies, IndexedBinData, BinData, dataset="cdpp_wi_wa___l2_60s_v2"
+):
+    """Placeholder class for `cdpp_wi_wa_XXX_l2_60s_v2` binary data.
+
+    The file is decoded once, at the first access to the sweeps (or to the frequencies),
+    into contiguous float32 arrays (`FREQ`, `SMOY`, `SMIN`, `SMAX`, concatenated over
+    all the sweeps) and an array of the `ORBIT` of each sweep. These arrays are then
+    shared by `sweeps`, `frequencies` and `as_xarray`, and iterating again over the
+    sweeps doesn't read the file.
+    """
+
+    _iter_sweep_class = WindWavesL260sSweeps
+    _index_header_dtype = _numpy_dtype(
+        WindWavesL260sSweeps._header_dtype, WindWavesL260sSweeps._header_fields
+    )
+    _orbit_dtype = _numpy_dtype(ORBIT_FIELDS[1], ORBIT_FIELDS[0])
+    _data_fields = ["SMOY", "SMIN", "SMAX"]
+
+    # unit of the intensities, for each value of the IUNIT header field
+    _iunit_units = {1: "V", 2: "V2/Hz", 3: "uV2/Hz", 4: "sfu"}
+
+    def __init__(
+        self,
+        filepath: Path,
+        dataset: Union[None, str] = "__auto__",
+        access_mode: str = "sweeps",
+        load_data: bool = True,
+        persist_index: bool = False,
+        index_dir: Union[None, str, Path] = None,
+    ):
+        BinData.__init__(self, filepath, dataset, access_mode, load_data)
+        VariableFrequencies.__init__(self)
+        self._init_index(persist_index, index_dir)
+        self._decoded = None
+        self._segments = None
+        self.fields = self._data_fields
+
+    @property
+    def units(self):
+        iunit = self.index.headers["IUNIT"]
+        if len(iunit) == 0:
+            return [None] * len(self.fields)
+        return [self._iunit_units.get(int(iunit[0]))] * len(self.fields)
+
+    @property
+    def _arrays(self):
+        return self._decoded_sweeps["arrays"]
+
+    @property
+    def _offsets(self):
+        return self._decoded_sweeps["offsets"]
+
+    @property
+    def _decoded_sweeps(self):
+        if self._decoded is None:
+            self._decoded = self._cached(
+                f"decode_sweeps:{self.load_data}", self._decode_sweeps
+            )
+        return self._decoded
+
+    def _decode_sweeps(self):
+        """Decode all the sweeps with bulk numpy operations, using the sweep index.
+
+        Returns:
+            dict: the data arrays (`arrays`, concatenated over all sweeps as contiguous
+            float32 arrays), the index offsets of each sweep in these arrays (`offsets`),
+            and the orbit of each sweep (`orbits`, numpy structured array)
+        """
+        index = self.index
+        self.file.seek(0)
+        buffer = self.file.read()
+
+        nfreq = index.headers["NFREQ"].astype(numpy.int64)
+        header_size = self._index_header_dtype.itemsize
+        if numpy.any(
+            index.lengths != header_size + self._orbit_dtype.itemsize + 16 * nfreq
+        ):
+            raise IOError("Corrupted file...")
+
+        # block layout in each sweep: ORBIT, FREQ, SMOY, SMIN, SMAX
+        block_start = index.offsets + header_size
+        orbits = _read_records(buffer, block_start, self._orbit_dtype)
+        block_start = block_start + self._orbit_dtype.itemsize
+
+        keys = ["FREQ"] + self._data_fields if self.load_data else ["FREQ"]
+        arrays = {}
+        offsets = {}
+        for key in keys:
+            arrays[key], offsets[key] = _read_segments(
+                buffer, block_start, nfreq, numpy.dtype(">f4")
+            )
+            block_start = block_start + 4 * nfreq
+
+        return {"arrays": arrays, "offsets": offsets, "orbits": orbits}
+
+    @property
+    def _sweep_segments(self):
+        """Data arrays of each sweep (slices of the decoded arrays)"""
+        if self._segments is None:
+            self._segments = {
+                key: numpy.split(array, self._offsets[key][1:-1])
+                for key, array in self._arrays.items()
+            }
+        return self._segments
+
+    def _sweep_item(self, sweep_id: int):
+        """Sweep `sweep_id`, as a (header, data) tuple"""
+        header_i = self.header_table[sweep_id]
+        if not self.load_data:
+            return header_i, None
+        segments = self._sweep_segments
+        data_i = {key: segments[key][sweep_id] for key in ["FREQ"] + self._data_fields}
+        data_i["ORBIT"] = dict(
+            zip(ORBIT_FIELDS[0], self._decoded_sweeps["orbits"][sweep_id].tolist())
+        )
+        return header_i, data_i
+
+    @property
+    def frequencies(self):
+        if self._frequencies is None:
+            self._frequencies = [
+                freq * Unit("kHz") for freq in self._sweep_segments["FREQ"]
+            ]
+        return self._frequencies
+
+    def as_ragged(self) -> RaggedData:
+        """Sweeps as ragged arrays (the decoded arrays are used as is)"""
+        if not self.load_data:
+            raise ValueError("The data are not loaded (load_data=False).")
+        arrays = {
+            key: RaggedArray(self._arrays[key], self._offsets[key])
+            for key in ["FREQ"] + self._data_fields
+        }
+        return RaggedData(
+            self.times,
+            arrays.pop("FREQ"),
+            arrays,
+            dict(zip(self.fields, self.units)),
+        )
+
+
+class WindWavesRad1L260sV2BinData(
+    WindWavesL260sV2BinData, dataset="cdpp_wi_wa_rad1_l2_60s_v2"
+):
     """CDPP Wind Waves RAD1 Level 2 60s-Average (version 2) dataset
 
     - Observatory/Facility: WIND
@@ -28,25 +186,87 @@ class WindWavesRad1L260sV2BinData(BinData, dataset="cdpp_wi_wa_rad1_l2_60s_v2"):
     - Dataset-id: `cdpp_wi_wa_rad1_l2_60s_v2`
     - Data format: Binary"""
 
-    _iter_sweep_class = WindWavesL260sSweeps
+    pass
 
 
 class WindWavesL2BinData(VariableFrequencies, BinData, dataset="cdpp_wi_wa___l2"):
-    """Placeholder class for `cdpp_wi_wa_XXX_l2` binary data."""
+    """Placeholder class for `cdpp_wi_wa_XXX_l2` binary data.
+
+    Two decoding modes are available (`decode_mode` keyword):
+
+    - `vectorized` (default): the file is decoded in two passes. The sweep length prefixes
+      are first scanned to build a table of sweep offsets, then all the headers are read as
+      one numpy structured array and the data blocks are read as contiguous float32 arrays.
+    - `sequential`: the file is decoded sweep by sweep (legacy decoder).
+    """
 
     _iter_sweep_class = WindWavesL2HighResSweeps
+    _decode_modes = ["vectorized", "sequential"]
+
+    _header_fields = (
+        CCSDS_CDS_FIELDS[0]
+        + ["RECEIVER_CODE", "JULIAN_SEC"]
+        + CALDATE_FIELDS[0]
+        + [
+            "JULIAN_SEC_FRAC",
+            "ISWEEP",
+            "IUNIT",
+            "NPBS",
+            "SUN_ANGLE",
+            "SPIN_RATE",
+            "KSPIN",
+            "MODE",
+            "LISTFR",
+            "NFREQ",
+            "ICAL",
+            "IANTEN",
+            "IPOLA",
+            "IDIPXY",
+            "SDURCY",
+            "SDURPA",
+            "NPALCY",
+            "NFRPAL",
+            "NPALIF",
+            "NSPALF",
+            "NZPALF",
+        ]
+    )
+    _header_dtype = _merge_dtype(
+        (CCSDS_CDS_FIELDS[1], ">hL", CALDATE_FIELDS[1], ">fihhffhhhhhhhhffhhhhh")
+    )
+    _data_fields = ["VSPAL", "VZPAL", "TSPAL", "TZPAL"]
 
     def __init__(
         self,
         filepath: Path,
         dataset: Union[None, str] = "__auto__",
         access_mode: str = "sweeps",
+        decode_mode: str = "vectorized",
     ):
         BinData.__init__(self, filepath, dataset, access_mode)
         VariableFrequencies.__init__(self)
+        if decode_mode not in self._decode_modes:
+            raise ValueError("Illegal decode mode.")
+        self.decode_mode = decode_mode
         self._data = None
         self._nsweep = None
-        self._data = self._loader()
+        self._headers = None
+        self._header_table = None
+        self._arrays = None
+        self._offsets = None
+        self.__max_sweep_length = None
+        if self.decode_mode == "vectorized":
+            decoded = self._cached(
+                f"vectorized_loader:{self.load_data}",
+                lambda: dict(
+                    zip(["headers", "arrays", "offsets"], self._vectorized_loader())
+                ),
+            )
+            self._headers = decoded["headers"]
+            self._arrays, self._offsets = decoded["arrays"], decoded["offsets"]
+            self._nsweep = len(self._headers)
+        else:
+            self._data = self._loader()
         self.fields = ["VSPAL", "VZPAL", "TSPAL", "TZPAL"]
         self.units = ["V2/Hz", "V2/Hz", "V2/Hz", "V2/Hz"]
 
@@ -63,39 +283,8 @@ class WindWavesL2BinData(VariableFrequencies, BinData, dataset="cdpp_wi_wa___l2"
         data = []
         nsweep = 0
 
-        ccsds_fields, ccsds_dtype = CCSDS_CDS_FIELDS
-        caldate_fields, caldate_dtype = CALDATE_FIELDS
-        header_fields = (
-            ccsds_fields
-            + ["RECEIVER_CODE", "JULIAN_SEC"]
-            + caldate_fields
-            + [
-                "JULIAN_SEC_FRAC",
-                "ISWEEP",
-                "IUNIT",
-                "NPBS",
-                "SUN_ANGLE",
-                "SPIN_RATE",
-                "KSPIN",
-                "MODE",
-                "LISTFR",
-                "NFREQ",
-                "ICAL",
-                "IANTEN",
-                "IPOLA",
-                "IDIPXY",
-                "SDURCY",
-                "SDURPA",
-                "NPALCY",
-                "NFRPAL",
-                "NPALIF",
-                "NSPALF",
-                "NZPALF",
-            ]
-        )
-        header_dtype = _merge_dtype(
-            (ccsds_dtype, ">hL", caldate_dtype, ">fihhffhhhhhhhhffhhhhh")
-        )
+        header_fields = self._header_fields
+        header_dtype = self._header_dtype
 
         while True:
             try:
@@ -145,27 +334,129 @@ class WindWavesL2BinData(VariableFrequencies, BinData, dataset="cdpp_wi_wa___l2"
         self._nsweep = nsweep
         return data
 
+    def _vectorized_loader(self):
+        """Decode the whole file with bulk numpy operations.
+
+        Returns:
+            tuple: the headers (numpy structured array, one item per sweep), a dict with
+            the data arrays (`FREQ`, `VSPAL`, `VZPAL`, `TSPAL`, `TZPAL`, concatenated over
+            all sweeps as contiguous float32 arrays) and a dict with the corresponding index
+            offsets of each sweep in these arrays.
+        """
+        self.file.seek(0)
+        buffer = self.file.read()
+
+        # first pass: table of sweep offsets
+        starts, lengths = _scan_sweep_offsets(buffer)
+
+        # second pass: bulk read of headers and data blocks
+        header_dtype = _numpy_dtype(self._header_dtype, self._header_fields)
+        headers = _read_records(buffer, starts, header_dtype)
+        npalf = headers["NPALIF"].astype(numpy.int64)
+        nspal = headers["NSPALF"].astype(numpy.int64)
+        nzpal = headers["NZPALF"].astype(numpy.int64)
+
+        if numpy.any(
+            lengths != header_dtype.itemsize + 4 * npalf * (1 + 2 * nspal + 2 * nzpal)
+        ):
+            raise IOError("Corrupted file...")
+
+        # block layout in each sweep: FREQ, VSPAL, TSPAL, VZPAL, TZPAL
+        block_counts = {
+            "FREQ": npalf,
+            "VSPAL": npalf * nspal,
+            "TSPAL": npalf * nspal,
+            "VZPAL": npalf * nzpal,
+            "TZPAL": npalf * nzpal,
+        }
+        if not self.load_data:
+            block_counts = {"FREQ": npalf}
+
+        arrays = {}
+        offsets = {}
+        block_start = starts + header_dtype.itemsize
+        for key, counts in block_counts.items():
+            arrays[key], offsets[key] = _read_segments(
+                buffer, block_start, counts, numpy.dtype(">f4")
+            )
+            block_start = block_start + 4 * counts
+
+        return headers, arrays, offsets
+
+    @property
+    def header_table(self) -> HeaderTable:
+        """Headers of the sweeps (vectorized mode)"""
+        if self._header_table is None and self._headers is not None:
+            self._header_table = HeaderTable(self._headers)
+        return self._header_table
+
+    def _sweep_items(self):
+        """Iterate over the sweeps as (header, data) tuples."""
+        if self._headers is None:
+            for sweep in self._data:
+                yield sweep
+            return
+
+        for i, header in enumerate(self.header_table):
+            yield header, self._sweep_data(i)
+
+    def _sweep_data(self, sweep_id):
+        """Data of a sweep (vectorized mode), as slices of the data arrays"""
+        if not self.load_data:
+            return None
+        return {
+            key: self._arrays[key][
+                self._offsets[key][sweep_id] : self._offsets[key][sweep_id + 1]
+            ]
+            for key in ["FREQ", "VSPAL", "VZPAL", "TSPAL", "TZPAL"]
+        }
+
+    def _sel_sweeps(self, sweep_ids, frequency_bounds):
+        if sweep_ids is None:
+            sweep_ids = range(self._nsweep)
+        for sweep_id in sweep_ids:
+            if self._headers is None:
+                header_i, data_i = self._data[sweep_id]
+            else:
+                header_i = self.header_table[sweep_id]
+                data_i = self._sweep_data(sweep_id)
+            if frequency_bounds is not None and data_i is not None:
+                mask = _frequency_mask(data_i["FREQ"], frequency_bounds)
+                data_i = {
+                    # VSPAL/TSPAL/VZPAL/TZPAL blocks are (NSPALF or NZPALF) x NPALIF
+                    # arrays, with the frequency varying fastest
+                    key: numpy.asarray(value).reshape(-1, len(mask))[:, mask].ravel()
+                    for key, value in data_i.items()
+                }
+            yield header_i, data_i
+
     @property
     def times(self):
         if self._times is None:
-            times = []
-            for header, _ in self.sweeps:
-                times.append(
-                    Time(
-                        f"{header['CALEND_DATE_YEAR']}-{header['CALEND_DATE_MONTH']}-"
-                        f"{header['CALEND_DATE_DAY']} {header['CALEND_DATE_HOUR']}:"
-                        f"{header['CALEND_DATE_MINUTE']}:{header['CALEND_DATE_SECOND']}"
-                    )
-                )
-            self._times = Time(times)
+            self._times = Time(self._decode_times())
         return self._times
 
+    def _decode_times(self) -> numpy.ndarray:
+        if self._headers is not None:
+            return _header_datetime64(self._headers)
+        return _header_datetime64(
+            _header_columns([header for header, _ in self._data], CALDATE_FIELDS[0])
+        )
+
     @property
     def frequencies(self):
         if self._frequencies is None:
-            self._frequencies = []
-            for _, data in self.sweeps:
-                self._frequencies.append(data["FREQ"] * Unit("kHz"))
+            if self._headers is not None:
+                self._frequencies = [
+                    freq * Unit("kHz")
+                    for freq in numpy.split(
+                        self._arrays["FREQ"], self._offsets["FREQ"][1:-1]
+                    )
+                ]
+            else:
+                self._frequencies = []
+                for _, data in self.sweeps:
+                    self._frequencies.append(data["FREQ"] * Unit("kHz"))
         return self._frequencies
 
     @property
@@ -174,6 +465,87 @@ class WindWavesL2BinData(VariableFrequencies, BinData, dataset="cdpp_wi_wa___l2"
             self.__max_sweep_length = numpy.max([len(f) for f in self.frequencies])
         return self.__max_sweep_length
 
+    def as_ragged(self) -> RaggedData:
+        """Sweeps as ragged arrays (the VSPAL/TSPAL and VZPAL/TZPAL blocks of a sweep are
+        NSPALF x NPALIF and NZPALF x NPALIF arrays, flattened with the frequency varying
+        fastest)"""
+        if self._headers is not None:
+            # vectorized mode: the arrays are used as is
+            arrays = {
+                key: RaggedArray(self._arrays[key], self._offsets[key])
+                for key in ["FREQ"] + self._data_fields
+            }
+        else:
+            arrays = {
+                key: RaggedArray.from_segments(
+                    [data[key] for _, data in self._data], dtype=numpy.float32
+                )
+                for key in ["FREQ"] + self._data_fields
+            }
+        return RaggedData(
+            self.times,
+            arrays.pop("FREQ"),
+            arrays,
+            dict(zip(self.fields, self.units)),
+        )
+
+    @staticmethod
+    def _padded_spectra(ragged: RaggedArray, nfreq: numpy.ndarray, max_nfreq: int):
+        """(sweeps, spectra, frequencies) array of the values of each sweep, stored as
+        spectra of `nfreq` values (the frequency varying fastest), padded with NaN"""
+        nspectra = numpy.zeros(len(ragged), dtype=numpy.int64)
+        numpy.floor_divide(ragged.lengths, nfreq, out=nspectra, where=nfreq > 0)
+        if numpy.any(nspectra * nfreq != ragged.lengths):
+            raise IOError("Corrupted file...")
+        spectrum = numpy.arange(nspectra.max(initial=0))[:, numpy.newaxis]
+        freq = numpy.arange(max_nfreq)
+        index = (
+            ragged.offsets[:-1, numpy.newaxis, numpy.newaxis]
+            + spectrum * nfreq[:, numpy.newaxis, numpy.newaxis]
+            + freq
+        )
+        valid = (spectrum < nspectra[:, numpy.newaxis, numpy.newaxis]) & (
+            freq < nfreq[:, numpy.newaxis, numpy.newaxis]
+        )
+        padded = numpy.full(index.shape, numpy.nan)
+        padded[valid] = ragged.values[index[valid]]
+        return padded
+
+    def as_xarray(self):
+        """Sweeps as (time, spectrum, freq_index) DataArrays: the VSPAL/TSPAL (resp.
+        VZPAL/TZPAL) values of a sweep are NSPALF (resp. NZPALF) spectra of NPALIF
+        frequencies, padded with NaN"""
+        import xarray
+
+        ragged = self.as_ragged()
+        nfreq = ragged.frequencies.lengths
+        max_sweep_length = ragged.frequencies.max_length
+
+        # the frequencies of the shorter sweeps are padded with their last value
+        freq_arr = ragged.frequencies.to_padded(max_sweep_length, edge=True).astype(
+            float
+        )
+
+        datasets = {}
+        for dataset_key, dataset_unit in zip(self.fields, self.units):
+            data_arr = self._padded_spectra(
+                ragged.data[dataset_key], nfreq, max_sweep_length
+            )
+            datasets[dataset_key] = xarray.DataArray(
+                data=data_arr,
+                name=dataset_key,
+                coords={
+                    "spectrum": range(data_arr.shape[1]),
+                    "freq_index": range(max_sweep_length),
+                    "time": self.times.to_datetime(),
+                    "frequency": (["time", "freq_index"], freq_arr, {"units": "kHz"}),
+                },
+                attrs={"units": dataset_unit},
+                dims=("time", "spectrum", "freq_index"),
+            )
+
+        return datasets
+
 
 class WindWavesRad1L2BinData(WindWavesL2BinData, dataset="cdpp_wi_wa_rad1_l2"):
     """Class for `cdpp_wi_wa_rad1_l2` binary data."""
@@ -181,24 +553,44 @@ class WindWavesRad1L2BinData(WindWavesL2BinData, dataset="cdpp_wi_wa_rad1_l2"):
     pass
 
 
-class WindWavesRad2L260sV2BinData(BinData, dataset="cdpp_wi_wa_rad2_l2_60s_v2"):
+class WindWavesRad2L260sV2BinData(
+    WindWavesL260sV2BinData, dataset="cdpp_wi_wa_rad2_l2_60s_v2"
+):
     """Class for `cdpp_wi_wa_rad2_l2_60s_v2` binary data."""
 
     pass
 
 
-class WindWavesTnrL260sV2BinData(BinData, dataset="cdpp_wi_wa_tnr_l2_60s_v2"):
+class WindWavesTnrL260sV2BinData(
+    WindWavesL260sV2BinData, dataset="cdpp_wi_wa_tnr_l2_60s_v2"
+):
     """Class for `cdpp_wi_wa_tnr_l2_60s_v2` binary data."""
 
     pass
 
 
 class WindWavesTnrL3Bqt1mnBinData(
-    RecordsOnly, BinData, dataset="cdpp_wi_wa_tnr_l3_bqt_1mn"
+    RecordsOnly, IndexedBinData, BinData, dataset="cdpp_wi_wa_tnr_l3_bqt_1mn"
 ):
-    """Class for `cdpp_wi_wa_tnr_l3_bqt_1mn` data."""
+    """Class for `cdpp_wi_wa_tnr_l3_bqt_1mn` data.
+
+    The records have a fixed size: the whole file is read as one numpy structured array
+    (see `load_mode`), and the fields can be accessed as columns:
+
+        data = Data(filepath)
+        plasma_frequency = data["PLASMA_FREQUENCY"]  # one value per record
+    """
 
     _iter_record_class = WindWavesTnrL3Bqt1mnRecords
+    _index_header_dtype = _numpy_dtype(
+        WindWavesTnrL3Bqt1mnRecords._header_dtype,
+        WindWavesTnrL3Bqt1mnRecords._header_fields,
+    )
+    _record_dtype = WindWavesTnrL3Bqt1mnRecords._record_dtype
+
+    # "memory": the whole file is read into RAM (numpy.fromfile)
+    # "mmap": the file is memory mapped (numpy.memmap)
+    _load_modes = ["memory", "mmap"]
 
     def __init__(
         self,
@@ -206,8 +598,66 @@ class WindWavesTnrL3Bqt1mnBinData(
         dataset: Union[None, str] = "__auto__",
         access_mode: str = "records",
         load_data: bool = True,
+        persist_index: bool = False,
+        index_dir: Union[None, str, Path] = None,
+        load_mode: str = "memory",
     ) -> None:
         super().__init__(filepath, dataset, access_mode, load_data)
+        # the index is derived from the records (the sidecar index is never used)
+        self._init_index(persist_index, index_dir)
+        if load_mode not in self._load_modes:
+            raise ValueError("Illegal load mode.")
+        self.load_mode = load_mode
+        self._data_table = None
+        self._data = self.read_data_binary()
+
+    def read_data_binary(self) -> numpy.ndarray:
+        file_size = self.file_size
+        record_size = self._record_dtype.itemsize
+        if file_size % record_size != 0:
+            raise IOError("Corrupted file...")
+
+        if self.load_mode == "mmap" and file_size > 0:
+            data = numpy.memmap(self.filepath, dtype=self._record_dtype, mode="r")
+        else:
+            data = numpy.fromfile(self.filepath, dtype=self._record_dtype)
+
+        # all the records must have the expected length prefixes
+        payload_size = record_size - 8
+        if numpy.any(data["RECORD_LENGTH"] != payload_size) or numpy.any(
+            data["TRAILING_RECORD_LENGTH"] != payload_size
+        ):
+            raise IOError("Corrupted file...")
+        return data
+
+    def __getitem__(self, key: str) -> numpy.ndarray:
+        """Values of the field `key` (header or data field) of all the records"""
+        if key not in WindWavesTnrL3Bqt1mnRecords._header_fields + (
+            WindWavesTnrL3Bqt1mnRecords._data_fields
+        ):
+            raise KeyError(key)
+        return self._data[key]
+
+    @property
+    def index(self) -> SweepIndex:
+        if self._index is None:
+            nrecord = len(self._data)
+            record_size = self._record_dtype.itemsize
+            self._index = SweepIndex(
+                numpy.arange(nrecord, dtype=numpy.int64) * record_size + 4,
+                numpy.full(nrecord, record_size - 8, dtype=numpy.int64),
+                self._data[WindWavesTnrL3Bqt1mnRecords._header_fields],
+            )
+        return self._index
+
+    @property
+    def data_table(self) -> HeaderTable:
+        """Data of the records (one mapping per record)"""
+        if self._data_table is None:
+            self._data_table = HeaderTable(
+                self._data[WindWavesTnrL3Bqt1mnRecords._data_fields]
+            )
+        return self._data_table
 
 
 class WindWavesTnrL3NnBinData(BinData, dataset="cdpp_wi_wa_tnr_l3_nn"):
@@ -233,6 +683,18 @@ class WindWavesL260sV1BinData(BinData, dataset="cdpp_wi_wa___l2_60s_v1"):
         self.__max_sweep_length = None
         self._data = self._loader()
 
+    @property
+    def times(self):
+        if self._times is None:
+            self._times = Time(
+                _header_datetime64(
+                    _header_columns(
+                        [header for header, _ in self._data], CALDATE_FIELDS[0]
+                    )
+                )
+            )
+        return self._times
+
     def _loader(self):
         data = []
         nsweep = 0
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+
+"""
+Multi-file collections
+======================
+
+A `Collection` gathers the data files of a directory (or matching a glob pattern), and
+builds a time-range index of the files, so that a time interval spanning several (e.g.,
+daily) files can be selected without opening the files outside of the interval.
+
+For each file, the time range is taken from the cheapest available source:
+
+* the file name, for the datasets whose file names give the time coverage of the files
+  (see `FILENAME_TIME_PATTERNS`, e.g., `YYYYDDD.HH` for the hourly Kronos files),
+* the `Epoch` bounds of CDF files,
+* the times of the first and last sweeps of the file (read from the sweep headers when
+  the dataset allows it).
+"""
+
+from datetime import timedelta
+from glob import glob
+from pathlib import Path
+import heapq
+import re
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+import numpy
+
+from .base import BinData, Data, CdfData
+from .base.base import BaseData
+
+# time range of the files, as a function of their name: (regex, duration of the file,
+# margin added before/after the time range, since files often start a little before the
+# date given in their name)
+# the regex must define either the `year`, `month` and `day` groups, or the `year`, `doy`
+# and (optionally) `hour` groups
+_KRONOS_HOURLY_FILES = (
+    # Cassini/RPWS/HFR Kronos hourly files (e.g., R2012180.20)
+    re.compile(r"^[A-Z](?P<year>\d{4})(?P<doy>\d{3})\.(?P<hour>\d{2})$"),
+    timedelta(hours=1),
+    timedelta(minutes=1),
+)
+_WIND_DAILY_FILES = (
+    # Wind/WAVES daily files (e.g., wi_wa_rad1_l2_19941110_v01.dat)
+    re.compile(
+        r"(?<!\d)(?P<year>(19|20)\d{2})(?P<month>[01]\d)(?P<day>[0-3]\d)(?!\d)"
+    ),
+    timedelta(days=1),
+    timedelta(hours=1),
+)
+
+# filename time patterns of each dataset (the time range of the files of the other
+# datasets is read from the files)
+FILENAME_TIME_PATTERNS = {
+    "co_rpws_hfr_kronos": [_KRONOS_HOURLY_FILES],
+    "co_rpws_hfr_kronos_n1": [_KRONOS_HOURLY_FILES],
+    "co_rpws_hfr_kronos_n2": [_KRONOS_HOURLY_FILES],
+    "cdpp_wi_wa___l2": [_WIND_DAILY_FILES],
+    "cdpp_wi_wa_rad1_l2": [_WIND_DAILY_FILES],
+    "cdpp_wi_wa___l2_60s_v1": [_WIND_DAILY_FILES],
+    "cdpp_wi_wa_rad1_l2_60s_v1": [_WIND_DAILY_FILES],
+    "cdpp_wi_wa_rad2_l2_60s_v1": [_WIND_DAILY_FILES],
+    "cdpp_wi_wa_tnr_l2_60s_v1": [_WIND_DAILY_FILES],
+    "cdpp_wi_wa___l2_60s_v2": [_WIND_DAILY_FILES],
+    "cdpp_wi_wa_rad1_l2_60s_v2": [_WIND_DAILY_FILES],
+    "cdpp_wi_wa_rad2_l2_60s_v2": [_WIND_DAILY_FILES],
+    "cdpp_wi_wa_tnr_l2_60s_v2": [_WIND_DAILY_FILES],
+    "cdpp_wi_wa_tnr_l3_bqt_1mn": [_WIND_DAILY_FILES],
+    "cdpp_wi_wa_tnr_l3_nn": [_WIND_DAILY_FILES],
+}
+
+
+class CollectionItem(NamedTuple):
+    """Entry of the time index of a `Collection`"""
+
+    filepath: Path
+    dataset: str
+    start: numpy.datetime64
+    end: numpy.datetime64
+
+
+def _as_datetime64(time) -> numpy.datetime64:
+    if isinstance(time, numpy.datetime64):
+        return time.astype("datetime64[ns]")
+    from astropy.time import Time
+
+    return Time(time).datetime64.astype("datetime64[ns]")
+
+
+def filename_time_range(filepath: Path, dataset: str):
+    """Time range of a file of `dataset`, as given by its name (or None if not available,
+    see `FILENAME_TIME_PATTERNS`)"""
+    name = Path(filepath).name
+    for regex, duration, margin in FILENAME_TIME_PATTERNS.get(dataset, []):
+        match = regex.search(name)
+        if match is None:
+            continue
+        fields = match.groupdict()
+        if "doy" in fields:
+            start = (
+                numpy.datetime64(fields["year"], "D")
+                + numpy.timedelta64(int(fields["doy"]) - 1, "D")
+                + numpy.timedelta64(int(fields.get("hour") or 0), "h")
+            )
+        else:
+            start = numpy.datetime64(
+                f"{fields['year']}-{fields['month']}-{fields['day']}", "D"
+            )
+        start = start.astype("datetime64[ns]")
+        return (
+            start - numpy.timedelta64(margin),
+            start + numpy.timedelta64(duration + margin),
+        )
+    return None
+
+
+class Collection:
+    """Collection of data files, indexed by time.
+
+    Args:
+        source (str, Path, Iterable): a directory, a glob pattern, or a list of files
+        dataset (str): dataset of the files (default: detected for each file)
+        **kwargs: keyword arguments passed to `Data` when opening the files
+
+    Files that are not recognized as a supported dataset are ignored.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, Path, Iterable[Union[str, Path]]],
+        dataset: str = "__auto__",
+        **kwargs,
+    ):
+        self.dataset = dataset
+        self._data_kwargs = kwargs
+        self.index: List[CollectionItem] = sorted(
+            (
+                item
+                for item in map(self._index_file, self._list_files(source))
+                if item is not None
+            ),
+            key=lambda item: (item.start, item.filepath),
+        )
+
+    @staticmethod
+    def _list_files(source) -> List[Path]:
+        if isinstance(source, (str, Path)):
+            if Path(source).is_dir():
+                return sorted(path for path in Path(source).iterdir() if path.is_file())
+            return sorted(Path(path) for path in glob(str(source), recursive=True))
+        return [Path(path) for path in source]
+
+    def _index_file(self, filepath: Path) -> Optional[CollectionItem]:
+        if self.dataset == "__auto__":
+            try:
+                dataset = Data.get_dataset(Data, filepath)
+            except (NotImplementedError, KeyError):
+                return None
+        else:
+            dataset = self.dataset
+
+        time_range = filename_time_range(filepath, dataset)
+        if time_range is not None:
+            start, end = time_range
+        elif issubclass(BaseData._registry[dataset], CdfData):
+            start, end = self._cdf_time_range(filepath)
+        else:
+            start, end = self._sweep_time_range(filepath, dataset)
+
+        return CollectionItem(filepath, dataset, start, end)
+
+    @staticmethod
+    def _cdf_time_range(filepath: Path):
+        with CdfData.open(filepath) as cdf_file:
+            epoch = cdf_file["Epoch"]
+            return _as_datetime64(epoch[0]), _as_datetime64(epoch[-1])
+
+    def _sweep_time_range(self, filepath: Path, dataset: str):
+        times = self.open(filepath, dataset).times
+        if times is None or len(times) == 0:
+            raise ValueError(f"Unable to get the time range of {filepath}.")
+        return _as_datetime64(times[0]), _as_datetime64(times[-1])
+
+    def open(self, filepath: Path, dataset: str = "__auto__"):
+        """Open a file of the collection."""
+        return Data(filepath, dataset=dataset, **self._data_kwargs)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        for item in self.index:
+            yield self.open(item.filepath, item.dataset)
+
+    @property
+    def files(self) -> List[Path]:
+        return [item.filepath for item in self.index]
+
+    def files_in_range(self, start=None, end=None) -> List[CollectionItem]:
+        """Index entries of the files overlapping the [start, end] interval"""
+        start = None if start is None else _as_datetime64(start)
+        end = None if end is None else _as_datetime64(end)
+        return [
+            item
+            for item in self.index
+            if (start is None or item.end >= start)
+            and (end is None or item.start <= end)
+        ]
+
+    def _file_sweeps(self, item: CollectionItem, start, end) -> Iterator:
+        data = self.open(item.filepath, item.dataset)
+        times = data.times
+        if times is None:
+            # no time axis: the sweeps of the file can't be filtered
+            for sweep in data.sweeps:
+                yield item.start, sweep
+            return
+
+        if isinstance(data, BinData):
+            # only the sweeps of the interval are decoded (selection of `data.sel`)
+            sweep_ids = data._sel_sweep_ids((start, end))
+            yield from zip(
+                data._sweep_times()[sweep_ids], data._sel_sweeps(sweep_ids, None)
+            )
+            return
+
+        for time, sweep in zip(_as_datetime64(times), data.sweeps):
+            if start is not None and time < start:
+                continue
+            if end is not None and time > end:
+                break
+            yield time, sweep
+
+    def map(self, func: Callable, workers: Optional[int] = None, **kwargs) -> List:
+        """Apply `func` to the `Data` object of each file, in parallel (see
+        `maser.data.batch.map_files`).
+
+        Returns:
+            the list of the `FileResult` of each file, in time order
+        """
+        from .batch import map_files
+
+        return map_files(
+            self.files,
+            func,
+            workers=workers,
+            dataset=[item.dataset for item in self.index],
+            **self._data_kwargs,
+            **kwargs,
+        )
+
+    def sel(self, start=None, end=None) -> Iterator:
+        """Iterate over the sweeps of the [start, end] interval, in time order.
+
+        Only the files overlapping the interval are opened, and only when their first
+        sweep is needed. Within a file, sweeps are assumed to be sorted in time.
+        """
+        start = None if start is None else _as_datetime64(start)
+        end = None if end is None else _as_datetime64(end)
+
+        pending = self.files_in_range(start, end)[::-1]
+        heap: list = []
+
+        def push(file_id, file_sweeps):
+            for time, sweep in file_sweeps:
+                heapq.heappush(heap, (time, file_id, sweep, file_sweeps))
+                return
+
+        while pending or heap:
+            # open the files which may contain sweeps before the next one
+            while pending and (not heap or pending[-1].start <= heap[0][0]):
+                file_id = len(pending)
+                push(file_id, self._file_sweeps(pending.pop(), start, end))
+            if heap:
+                _, file_id, sweep, file_sweeps = heapq.heappop(heap)
+                yield sweep
+                push(file_id, file_sweeps)
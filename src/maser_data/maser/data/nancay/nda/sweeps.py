@@ -5,6 +5,8 @@ from astropy.units import Unit
 
 
 class SrnNdaRoutineJupEdrSweep(Sweep):
+    __slots__ = ()
+
     def __init__(self, header, data, time, frequencies):
         super().__init__(header, data)
         self._time = time
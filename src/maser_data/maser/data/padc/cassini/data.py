@@ -2,8 +2,11 @@
 from typing import Iterable, Union, Sequence
 
 from maser.data.base import BinData, Sweeps, Records, VariableFrequencies
+from maser.data.base.base import _frequency_mask
+from maser.data.base.parallel import parallel_decode
+from maser.data.base.ragged import RaggedArray, RaggedData
 from maser.data.base.sweeps import Sweep
-from .kronos import fi_freq, ti_datetime, t97_datetime
+from .kronos import fi_freq_array, ti_datetime_array, t97_datetime_array
 
 from astropy.units import Unit
 from astropy.time import Time
@@ -19,6 +22,8 @@ with open(KRONOS_LEVEL_FORMAT_JSON_FILE, "r") as f:
 
 
 class CoRpwsHfrKronosDataSweep(Sweep):
+    __slots__ = ()
+
     def __init__(self, header, data):
         super().__init__(header, data)
         self._frequencies = header["frequencies"]
@@ -28,19 +33,14 @@ class CoRpwsHfrKronosDataSweep(Sweep):
 class CoRpwsHfrKronosDataSweeps(Sweeps):
     @property
     def generator(self):
-        for f, t, sweep_mask in zip(
-            self.data_reference.frequencies,
-            self.data_reference.times,
-            self.data_reference._sweep_masks,
+        for sweep_id, (f, t) in enumerate(
+            zip(
+                self.data_reference.frequencies,
+                self.data_reference.times,
+            )
         ):
-            yield CoRpwsHfrKronosDataSweep(
-                {
-                    "frequencies": f,
-                    "time": t,
-                    "level": self.data_reference.level,
-                    "file": self.data_reference.filepath.name,
-                },
-                self.data_reference._data[sweep_mask],
+            yield self.data_reference._make_sweep(
+                self.data_reference._sweep_index(sweep_id), t, f
             )
 
 
@@ -56,11 +56,21 @@ class CoRpwsHfrKronosData(VariableFrequencies, BinData, dataset="co_rpws_hfr_kro
     _iter_sweep_class = CoRpwsHfrKronosDataSweeps
     _iter_record_class = CoRpwsHfrKronosDataRecords
 
+    # "memory": the whole file is read into RAM (numpy.fromfile)
+    # "mmap": the file is memory mapped (numpy.memmap), and the pages of the file are
+    # only read when the corresponding records/fields are accessed
+    _load_modes = ["memory", "mmap"]
+
+    # minimum number of records decoded by a worker process (see `workers`)
+    _min_chunk_size = 2**18
+
     def __init__(
         self,
         filepath: Path,
         dataset: Union[None, str] = "__auto__",
         access_mode: str = "sweeps",
+        load_mode: str = "memory",
+        workers: int = 1,
     ):
         BinData.__init__(
             self,
@@ -70,11 +80,18 @@ class CoRpwsHfrKronosData(VariableFrequencies, BinData, dataset="co_rpws_hfr_kro
         )
         VariableFrequencies.__init__(self)
 
+        if load_mode not in self._load_modes:
+            raise ValueError("Illegal load mode.")
+        self.load_mode = load_mode
+        # number of worker processes used to decode the times/frequencies of the records
+        self.workers = workers
+
         self.__format = None
+        self.__sweep_groups = None
+        self.__frequencies = None
         self.level = self.dataset[19:]
         self._data = self.read_data_binary()
         self._nrecord = len(self._data)
-        self._nsweep = len(self.sweep_masks)
         self._depend_datasets: Iterable[str] = []
         self.fields = self._format["vars"].keys()
         self.units = [self._format["vars"][field][1] for field in self.fields]
@@ -96,54 +113,101 @@ class CoRpwsHfrKronosData(VariableFrequencies, BinData, dataset="co_rpws_hfr_kro
                 self.__format["vars"][key] = (dtype, unit)
         return self.__format
 
+    @property
+    def _dtype(self):
+        return numpy.dtype(
+            [(key, self._format["vars"][key][0]) for key in self._format["vars"].keys()]
+        )
+
+    @property
+    def _nsweep(self):
+        return len(self._sweep_groups[1]) - 1
+
     def read_data_binary(self):
         file_size = self.file_size
         rec_size = self._format["length"]
-        dtype = [
-            (key, self._format["vars"][key][0]) for key in self._format["vars"].keys()
-        ]
         if file_size % rec_size != 0:
             raise IOError("Corrupted file...")
 
-        data = numpy.fromfile(
-            self.filepath,
-            dtype=dtype,
-        )
+        if self.load_mode == "mmap" and file_size > 0:
+            # zero-copy structured view of the file: the fields are decoded
+            # (and the file pages loaded) only when they are accessed
+            data = numpy.memmap(
+                self.filepath,
+                dtype=self._dtype,
+                mode="r",
+            )
+        else:
+            data = numpy.fromfile(
+                self.filepath,
+                dtype=self._dtype,
+            )
         return data
 
+    @property
+    def _sweep_groups(self):
+        """Grouping of the records into sweeps (one sweep per unique `ti`/`t97` value),
+        stored as a sort permutation of the records and an array of sweep offsets: the
+        records of sweep `i` are `order[offsets[i]:offsets[i+1]]`. The permutation is
+        None when the records are already sorted by sweep (i.e., sweeps are contiguous).
+        """
+        if self.__sweep_groups is None:
+            groups = self._cached("sweep_groups", self._decode_sweep_groups)
+            self.__sweep_groups = (groups.get("order"), groups["offsets"])
+        return self.__sweep_groups
+
+    def _decode_sweep_groups(self):
+        if self.level == "n1":
+            tvar = "ti"
+        else:
+            tvar = "t97"
+        _, inverse, counts = numpy.unique(
+            self._data[tvar], return_inverse=True, return_counts=True
+        )
+        offsets = numpy.zeros(len(counts) + 1, dtype=numpy.int64)
+        numpy.cumsum(counts, out=offsets[1:])
+        if numpy.all(inverse[1:] >= inverse[:-1]):
+            return {"offsets": offsets}
+        return {"order": numpy.argsort(inverse, kind="stable"), "offsets": offsets}
+
+    def _sweep_index(self, sweep_id: int):
+        """Index of the records of a sweep in `_data` (a slice if sweeps are contiguous)"""
+        order, offsets = self._sweep_groups
+        start, stop = offsets[sweep_id], offsets[sweep_id + 1]
+        if order is None:
+            return slice(start, stop)
+        return order[start:stop]
+
+    def _split_sweeps(self, values):
+        """Split a per-record array into the list of per-sweep arrays"""
+        order, offsets = self._sweep_groups
+        if order is not None:
+            values = values[order]
+        return numpy.split(values, offsets[1:-1])
+
+    @property
+    def _sweep_first_records(self):
+        """Index of the first record of each sweep"""
+        order, offsets = self._sweep_groups
+        first_records = offsets[:-1]
+        if order is not None:
+            first_records = order[first_records]
+        return first_records
+
     @property
     def sweep_masks(self):
         if self._sweep_masks is None:
-            if self.level == "n1":
-                tvar = "ti"
-            else:
-                tvar = "t97"
             sweep_masks = []
-            t_values = numpy.unique(self._data[tvar])
-            for t in t_values:
-                sweep_masks.append(self._data[tvar] == t)
+            for sweep_id in range(self._nsweep):
+                sweep_mask = numpy.zeros(self._nrecord, dtype=bool)
+                sweep_mask[self._sweep_index(sweep_id)] = True
+                sweep_masks.append(sweep_mask)
             self._sweep_masks = sweep_masks
         return self._sweep_masks
 
-    @property
-    def sweep_mode_masks(self):
-        if self._sweep_mode_masks is None:
-            sweep_mode_masks = []
-            mode_hashes = numpy.array(
-                [hash(item.to_string()) for item in self.frequencies]
-            )
-            for mode_hash in numpy.unique(mode_hashes):
-                sweep_mode_masks.append(mode_hashes == mode_hash)
-            self._sweep_mode_masks = sweep_mode_masks
-        return self._sweep_mode_masks
-
     @property
     def _max_sweep_length(self):
-        if self.__max_sweep_length is None:
-            self.__max_sweep_length = numpy.max(
-                [numpy.count_nonzero(mask) for mask in self.sweep_masks]
-            )
-        return self.__max_sweep_length
+        return numpy.max(numpy.diff(self._sweep_groups[1]))
 
     def __len__(self):
         if self.access_mode == "sweeps":
@@ -153,54 +217,129 @@ class CoRpwsHfrKronosData(VariableFrequencies, BinData, dataset="co_rpws_hfr_kro
         else:
             return self.file_size
 
-    def _decode_times(self) -> Sequence:  # pragma: no cover
+    def _decode_datetime64(
+        self, index=slice(None)
+    ) -> numpy.ndarray:  # pragma: no cover
         pass
 
+    def _decode_records(self, method: str):
+        """Decode all the records with `method` (by chunks of records decoded in parallel
+        if `workers` > 1)"""
+        chunks = parallel_decode(
+            self,
+            method,
+            self._nrecord,
+            self.workers,
+            data_kwargs={"load_mode": "mmap"},
+            min_chunk_size=self._min_chunk_size,
+        )
+        if len(chunks) == 1:
+            return chunks[0]
+        return numpy.concatenate(chunks)
+
+    def _decode_times(self) -> Time:
+        return Time(
+            self._cached(
+                "times", lambda: {"times": self._decode_records("_decode_datetime64")}
+            )["times"]
+        )
+
+    def _sweep_times(self) -> numpy.ndarray:
+        return self._cached(
+            "sweep_times",
+            lambda: {"times": self._decode_datetime64(self._sweep_first_records)},
+        )["times"]
+
     @property
     def times(self):
         if self._times is None:
-            times = self._decode_times()
             if self.access_mode == "records":
-                self._times = times
+                self._times = self._decode_times()
             elif self.access_mode == "sweeps":
-                self._times = Time([times[mask][0] for mask in self.sweep_masks])
+                self._times = Time(self._sweep_times())
         return self._times
 
-    def _decode_frequencies(self) -> Sequence:  # pragma: no cover
+    def _decode_frequencies(self, index=slice(None)) -> Sequence:  # pragma: no cover
         pass
 
+    def _make_sweep(self, index, time, frequencies):
+        return CoRpwsHfrKronosDataSweep(
+            {
+                "frequencies": frequencies,
+                "time": time,
+                "level": self.level,
+                "file": self.filepath.name,
+            },
+            self._data[index],
+        )
+
+    def _sel_sweeps(self, sweep_ids, frequency_bounds):
+        if sweep_ids is None:
+            sweep_ids = numpy.arange(self._nsweep)
+        times = Time(self._sweep_times()[sweep_ids])
+        for sweep_id, time in zip(sweep_ids, times):
+            index = self._sweep_index(sweep_id)
+            frequencies = self._decode_frequencies(index)
+            if frequency_bounds is not None:
+                # only the records within the frequency window are read
+                mask = _frequency_mask(frequencies, frequency_bounds)
+                if isinstance(index, slice):
+                    index = numpy.arange(index.start, index.stop)
+                index, frequencies = index[mask], frequencies[mask]
+            yield self._make_sweep(index, time, frequencies)
+
+    @property
+    def _record_frequencies(self):
+        """Frequency of each record"""
+        if self.__frequencies is None:
+            self.__frequencies = self._cached(
+                "frequencies",
+                lambda: {
+                    "frequencies": self._decode_records("_decode_frequencies").to_value(
+                        "kHz"
+                    )
+                },
+            )["frequencies"] * Unit("kHz")
+        return self.__frequencies
+
     @property
     def frequencies(self):
         if self._frequencies is None:
-            self.__frequencies = self._decode_frequencies()
             if self.access_mode == "records":
-                self._frequencies = self.__frequencies
+                self._frequencies = self._record_frequencies
             if self.access_mode == "sweeps":
-                self._frequencies = [
-                    self.__frequencies[mask] for mask in self.sweep_masks
-                ]
+                self._frequencies = self._split_sweeps(self._record_frequencies)
         return self._frequencies
 
+    def as_ragged(self) -> RaggedData:
+        # the records are only reordered if the sweeps are not contiguous
+        order, offsets = self._sweep_groups
+        frequencies = self._record_frequencies.to_value("kHz")
+        data = self._data
+        if order is not None:
+            frequencies, data = frequencies[order], data[order]
+        return RaggedData(
+            Time(self._sweep_times()),
+            RaggedArray(frequencies, offsets),
+            {field: RaggedArray(data[field], offsets) for field in self.fields},
+            dict(zip(self.fields, self.units)),
+        )
+
 
 class CoRpwsHfrKronosN1Data(CoRpwsHfrKronosData, dataset="co_rpws_hfr_kronos_n1"):
-    def _decode_times(self):
-        return Time(
-            list(
-                map(
-                    ti_datetime,
-                    self._data["ti"],  # time index (YYDDDSSSSS) with YY = YYYY - 1996
-                    self._data["c"],  # centiseconds
-                )
-            )
+    def _decode_datetime64(self, index=slice(None)):
+        return ti_datetime_array(
+            self._data["ti"][index],  # time index (YYDDDSSSSS) with YY = YYYY - 1996
+            self._data["c"][index],  # centiseconds
         )
 
-    def _decode_frequencies(self):
-        return numpy.array(list(map(fi_freq, self._data["fi"]))) * Unit("kHz")
+    def _decode_frequencies(self, index=slice(None)):
+        return fi_freq_array(self._data["fi"][index]) * Unit("kHz")
 
 
 class CoRpwsHfrKronosN2Data(CoRpwsHfrKronosData, dataset="co_rpws_hfr_kronos_n2"):
-    def _decode_times(self):
-        return Time(list(map(t97_datetime, self._data["t97"])))
+    def _decode_datetime64(self, index=slice(None)):
+        return t97_datetime_array(self._data["t97"][index])
 
-    def _decode_frequencies(self):
-        return self._data["f"] * Unit("kHz")
+    def _decode_frequencies(self, index=slice(None)):
+        return self._data["f"][index] * Unit("kHz")
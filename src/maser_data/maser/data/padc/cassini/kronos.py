@@ -2,6 +2,8 @@
 import datetime
 from typing import Union
 
+import numpy
+
 
 def freq_abc(nfilt):
     if nfilt == 8:
@@ -185,6 +187,13 @@ def freq_abc(nfilt):
         raise ValueError("Wrong number of ABC channels (allowed values: 8, 16, 32).")
 
 
+# ABC filter frequencies of the 3 bands, for the 8, 16 and 32 filters configurations,
+# concatenated in a single table (see `fi_freq_array`)
+_FREQ_ABC_NFILT = numpy.array([8, 16, 32])
+_FREQ_ABC_TABLE = numpy.concatenate([freq_abc(nfilt) for nfilt in _FREQ_ABC_NFILT])
+_FREQ_ABC_OFFSETS = numpy.concatenate([[0], numpy.cumsum(_FREQ_ABC_NFILT * 3)[:-1]])
+
+
 def fi_freq(fi: int) -> float:
 
     fi_b = fi // 10000000
@@ -219,3 +228,91 @@ def ydh_datetime(ydh: Union[int, str]):
     else:
         ydh_str = f"{ydh//100}.{ydh%100}"
     return datetime.datetime.strptime(ydh_str, "%Y%j.%H")
+
+
+def fi_freq_array(fi: numpy.ndarray) -> numpy.ndarray:
+    """Array version of `fi_freq` (frequency in kHz of each frequency index)"""
+    fi = numpy.asarray(fi, dtype=numpy.int64)
+
+    fi_b = fi // 10000000
+    fi_ccc = (fi % 10000000) // 10000
+    fi_ff = (fi % 10000) // 100
+    fi_nn = fi % 100
+
+    freq = (fi_ccc + (2 * fi_nn - fi_ff + 1) / (2 * fi_ff)) * 25
+
+    abc = fi_b <= 2
+    if numpy.any(abc):
+        nfilt_index = numpy.searchsorted(_FREQ_ABC_NFILT, fi_ff[abc])
+        nfilt_index[nfilt_index == len(_FREQ_ABC_NFILT)] = 0
+        if numpy.any(_FREQ_ABC_NFILT[nfilt_index] != fi_ff[abc]):
+            raise ValueError(
+                "Wrong number of ABC channels (allowed values: 8, 16, 32)."
+            )
+        channel = fi_b[abc] * fi_ff[abc] + fi_nn[abc]
+        # same bounds as the `freq_abc(nfilt)` list indexed by `fi_freq`
+        if numpy.any(channel >= 3 * fi_ff[abc]):
+            raise IndexError("ABC channel index out of range.")
+        freq[abc] = _FREQ_ABC_TABLE[_FREQ_ABC_OFFSETS[nfilt_index] + channel]
+
+    return freq
+
+
+def ti_datetime_array(ti: numpy.ndarray, c: numpy.ndarray) -> numpy.ndarray:
+    """Array version of `ti_datetime` (returns a `datetime64[ns]` array)"""
+    ti = numpy.asarray(ti, dtype=numpy.int64)
+    c = numpy.asarray(c, dtype=numpy.int64)
+
+    yy = ti // 100000000 + 1996
+    dd = (ti % 100000000) // 100000
+    ss = ti % 100000
+
+    return (
+        (yy - 1970).astype("datetime64[Y]").astype("datetime64[ns]")
+        + (dd - 1).astype("timedelta64[D]")
+        + ss.astype("timedelta64[s]")
+        + (c * 10).astype("timedelta64[ms]")
+    )
+
+
+def t97_datetime_array(t97: numpy.ndarray) -> numpy.ndarray:
+    """Array version of `t97_datetime` (returns a `datetime64[ns]` array)"""
+    t97 = numpy.asarray(t97, dtype=numpy.float64)
+
+    # same rounding as `datetime.timedelta(days=...)`: the whole number of microseconds
+    # of the day fraction is taken as is, and the remaining fraction of microsecond is
+    # rounded half to even (with respect to the total number of microseconds)
+    day_fraction, days = numpy.modf(t97 - 1)
+    us_fraction, us = numpy.modf(day_fraction * 86400e6)
+    us = days.astype(numpy.int64) * 86400000000 + us.astype(numpy.int64)
+    tie = numpy.abs(us_fraction) == 0.5
+    us += numpy.where(tie, us % 2, numpy.abs(us_fraction) > 0.5) * numpy.sign(
+        us_fraction
+    ).astype(numpy.int64)
+
+    return numpy.datetime64("1997-01-01", "ns") + us.astype("timedelta64[us]")
+
+
+def ydh_datetime_array(ydh: numpy.ndarray) -> numpy.ndarray:
+    """Array version of `ydh_datetime` (returns a `datetime64[ns]` array).
+
+    `ydh` values are either integers (YYYYDDDHH) or strings (YYYYDDD.HH).
+    """
+    ydh = numpy.asarray(ydh)
+    if ydh.dtype.kind in "US":
+        ydh_parts = numpy.char.partition(ydh.astype(str), ".")
+        ydh = ydh_parts[..., 0].astype(numpy.int64) * 100 + ydh_parts[..., 2].astype(
+            numpy.int64
+        )
+    else:
+        ydh = ydh.astype(numpy.int64)
+
+    yyyy = ydh // 100000
+    ddd = (ydh // 100) % 1000
+    hh = ydh % 100
+
+    return (
+        (yyyy - 1970).astype("datetime64[Y]").astype("datetime64[ns]")
+        + (ddd - 1).astype("timedelta64[D]")
+        + hh.astype("timedelta64[h]")
+    )
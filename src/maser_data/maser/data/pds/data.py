@@ -2,6 +2,7 @@
 from pathlib import Path
 from typing import Union
 from maser.data.base import Data
+from maser.data.base.detection import sniff_pds3_keyword
 from .utils import PDSLabelDict
 
 
@@ -75,9 +76,14 @@ class Pds3Data(Data, dataset="pds3"):
         return {"label": label, "data": data}
 
     @classmethod
-    def get_dataset(cls, filepath):
-        file_label = cls.open_label(filepath, fmt_label_dict=False)
-        return file_label["DATA_SET_ID"].strip('"')
+    def get_dataset(cls, filepath, head=None):
+        # DATA_SET_ID is usually found at the beginning of the label, which avoids
+        # parsing the whole label (and its FMT files)
+        dataset_id = sniff_pds3_keyword(filepath, "DATA_SET_ID", head=head)
+        if dataset_id is None:
+            file_label = cls.open_label(filepath, fmt_label_dict=False)
+            dataset_id = file_label["DATA_SET_ID"]
+        return dataset_id.strip('"')
 
     @classmethod
     def close(cls, file):
@@ -7,6 +7,8 @@ Python module to work with PDS Data
 """
 
 import os
+from collections.abc import ItemsView, KeysView, ValuesView
+from functools import lru_cache
 import numpy
 
 __author__ = "Baptiste Cecconi"
@@ -21,6 +23,44 @@ __date__ = "21-FEB-2022"
 __project__ = "MASER/PADC PDS"
 
 
+def _tokenize_pds3_label(lines):
+    """
+    Yields the (key, value) pairs of the lines of a PDS3 label, excluding comments, up to the
+    END line. The lines of multiple line values are yielded with an empty key.
+    """
+    for line in lines:
+        # if end of label file tag, then stop the loop
+        if line.strip() == "END":
+            break
+
+        # skipping comment lines and empty lines
+        elif line.startswith("/*") or line.strip() == "":
+            continue
+
+        # processing "key = value" lines
+        elif "=" in line:
+            kv = line.strip().split("=")
+            yield kv[0].strip(), kv[1].strip().strip('"')
+
+        # special case for multiple line values
+        else:
+            yield "", line.strip().strip('"')
+
+
+@lru_cache(maxsize=256)
+def _parse_fmt_file(fmt_file, mtime):
+    with open(fmt_file, "r") as f:
+        return tuple(_tokenize_pds3_label(f))
+
+
+def _read_fmt_tokens(fmt_file):
+    """
+    Tokens of an FMT file (see `_tokenize_pds3_label`), parsed once per process (and again
+    if the file is modified)
+    """
+    return _parse_fmt_file(str(fmt_file), os.stat(fmt_file).st_mtime_ns)
+
+
 class PDSLabelDict(dict):
     """
     Class for the dict-form PDSLabel
@@ -44,141 +84,77 @@ class PDSLabelDict(dict):
                 self.fmt_files = fmt_label_dict
             self.file = label_file
             self.process = list()
+            self._depth = []
+            # index of the entry receiving the multiple line values (None after an
+            # END_OBJECT line, whose value is dropped)
+            self._last = None
             self._load_pds3_label_as_list()
-            self._merge_multiple_line_values()
-            self._add_object_depth_to_label_list()
             if self.verbose:
                 print(self.process)
 
         def _load_pds3_label_as_list(self, input_file=None):
             """
-            This method loads label lines as pairs of (key, value) separated by "=", excluding comments.
-            The method recursively loads any other .FMT files, for each ^STRUCTURE key.
+            This method loads label lines as (key, value, depth) items in a single pass, where
+            depth is the list of the names of the enclosing objects. Multiple line values are
+            merged, and END_OBJECT lines are consumed. The method recursively loads any other
+            .FMT files, for each ^STRUCTURE key (the parsed FMT files are cached).
             """
 
             # If no input_file is set, retrieve current PDSLabelList file from self
             if input_file is None:
+                with open(self.file, "r") as f:
+                    tokens = list(_tokenize_pds3_label(f))
                 input_file = self.file
+            else:
+                tokens = _read_fmt_tokens(input_file)
 
-            # Opening input_file and looping through lines
-            with open(input_file, "r") as f:
-                for line in f.readlines():
-                    if self.verbose:
-                        print(line)
-
-                    # if end of label file tag, then stop the loop
-                    if line.strip() == "END":
-                        break
-
-                    # skipping comment lines and empty lines
-                    elif line.startswith("/*") or line.strip() == "":
-                        if self.verbose:
-                            print("... skipping.")
-                        continue
-
-                    # processing "key = value" lines
-                    elif "=" in line:
-                        kv = line.strip().split("=")
-                        cur_key = kv[0].strip()
-                        cur_val = kv[1].strip().strip('"')
-                        if self.verbose:
-                            print("... key = {}, value = {}".format(cur_key, cur_val))
-
-                        # in case of external FMT file, nested call to this function with the FMT file
-                        if cur_key == "^STRUCTURE":
-                            if self.extra_labels:
-                                fmt_file_name = cur_val.strip('"')
-                                if fmt_file_name in self.fmt_files.keys():
-                                    extra_file = self.fmt_files[fmt_file_name]
-                                else:
-                                    extra_file = os.path.join(
-                                        os.path.dirname(input_file), fmt_file_name
-                                    )
-                                if self.verbose:
-                                    print(
-                                        "Inserting external Label from {}".format(
-                                            extra_file
-                                        )
-                                    )
-                                self._load_pds3_label_as_list(extra_file)
-                            else:
-                                if self.verbose:
-                                    print("Skipping external Label.")
-
-                        # regular case: just write out a new line with (key, value)
+            for cur_key, cur_val in tokens:
+                if self.verbose:
+                    print("... key = {}, value = {}".format(cur_key, cur_val))
+
+                # in case of external FMT file, nested call to this function with the FMT file
+                if cur_key == "^STRUCTURE":
+                    if self.extra_labels:
+                        fmt_file_name = cur_val.strip('"')
+                        if fmt_file_name in self.fmt_files.keys():
+                            extra_file = self.fmt_files[fmt_file_name]
                         else:
-                            self.append((cur_key, cur_val))
-
-                    # special case for multiple line values
+                            extra_file = os.path.join(
+                                os.path.dirname(input_file), fmt_file_name
+                            )
+                        if self.verbose:
+                            print("Inserting external Label from {}".format(extra_file))
+                        self._load_pds3_label_as_list(extra_file)
                     else:
-                        self.append(("", line.strip().strip('"')))
-
-            self.process.append("Loaded from file")
-
-        def _merge_multiple_line_values(self):
-            """
-            This method merges multiple line values
-            """
-
-            prev_ii = 0
-            remove_list = []
-
-            # looping on Label list item, with enumerate, so that we get the item index in the list
-            for ii, item in enumerate(self.__iter__()):
-                (cur_key, cur_value) = item
-
-                # in case of multiple line values, key is an empty string
-                if cur_key == "":
-
-                    # fetching last previous line with non empty key
-                    (prev_key, prev_value) = self[prev_ii]
-                    cur_value = "{} {}".format(prev_value, cur_value)
-
-                    # appending current value to value of previous line with non empty key
-                    self[prev_ii] = (prev_key, cur_value)
-
-                    # flag the current line for deletion
-                    remove_list.append(ii)
-
-                # general case: non empty key
-                else:
-                    prev_ii = ii
-
-            # remove lines flagged for deletion
-            if len(remove_list) > 0:
-                for ii in sorted(remove_list, reverse=True):
-                    del self[ii]
-
-            self.process.append("Merged multi line")
-
-        def _add_object_depth_to_label_list(self):
-            """Adds an extra elements after in each (key, value) containing the current object depth"""
-
-            depth = []
-            remove_list = []
-
-            for ii, item in enumerate(self.__iter__()):
-                (cur_key, cur_value) = item
+                        if self.verbose:
+                            print("Skipping external Label.")
+
+                # in case of multiple line values, key is an empty string: appending current
+                # value to value of previous line with non empty key
+                elif cur_key == "":
+                    if self._last is not None:
+                        (prev_key, prev_value, prev_depth) = self[self._last]
+                        self[self._last] = (
+                            prev_key,
+                            "{} {}".format(prev_value, cur_val),
+                            prev_depth,
+                        )
 
-                # flag END_OBJECT line and removing the last element of the depth list
-                if cur_key == "END_OBJECT":
-                    remove_list.append(ii)
-                    del depth[-1]
+                # END_OBJECT line: removing the last element of the depth list
+                elif cur_key == "END_OBJECT":
+                    del self._depth[-1]
+                    self._last = None
 
-                # process other lines by adding the current version of the depth list
+                # regular case: add (key, value) with the current version of the depth list
                 else:
-                    self[ii] = (cur_key, cur_value, depth.copy())
+                    self.append((cur_key, cur_val, self._depth.copy()))
+                    self._last = len(self) - 1
 
                     # when we meet an OBJECT line, add the object name to the depth list
                     if cur_key == "OBJECT":
-                        depth.append(cur_value)
-
-            # remove lines flagged for deletion
-            if len(remove_list) > 0:
-                for ii in sorted(remove_list, reverse=True):
-                    del self[ii]
+                        self._depth.append(cur_val)
 
-            self.process.append("Added depth tag")
+            self.process.append("Loaded from file")
 
     def __init__(self, label_file, fmt_label_dict=None, verbose=False):
 
@@ -250,6 +226,8 @@ class PDSDataTableColumnHeader:
         if self.verbose:
             print(self.np_data_type)
 
+        self.np_item_dtype = self._get_np_item_dtype()
+
     def _get_np_data_type(self):
 
         struct_to_np_data_type = {
@@ -267,6 +245,18 @@ class PDSDataTableColumnHeader:
         }
         return struct_to_np_data_type[self.struct_format[-1]]
 
+    def _get_np_item_dtype(self):
+        """numpy dtype of the column items in the file (with their byte order)"""
+
+        if self.struct_format[0] in "<>":
+            endianess = self.struct_format[0]
+        else:
+            endianess = "="
+
+        if self.struct_format[-1] == "c":
+            return numpy.dtype("S1")
+        return numpy.dtype(endianess + self.struct_format[-1])
+
     def _get_struct_format(self):
 
         data_type = ""
@@ -324,8 +314,28 @@ class PDSDataTableColumnHeader:
 
 
 class PDSDataTableObject(dict):
-    def __init__(self, obj_label, data_file, data_offset=0, verbose=False):
-        super().__init__(self)
+    """
+    Class for a PDS3 TABLE object, as a dict of column arrays. Only the selected `columns`
+    are available (all of them by default), and each column is decoded on its first access
+    (or by `load_data`). The mapping methods (`in`, `keys`, `len`, `get`, ...) list all the
+    selected columns, decoded or not (see `is_decoded`).
+    """
+
+    # "memory": the rows of a binary table are read into RAM (numpy.fromfile)
+    # "mmap": the file is memory mapped (numpy.memmap), and the pages of the file are
+    # only read when the corresponding columns are accessed
+    _load_modes = ["memory", "mmap"]
+
+    def __init__(
+        self,
+        obj_label,
+        data_file,
+        data_offset=0,
+        verbose=False,
+        columns=None,
+        load_mode="memory",
+    ):
+        super().__init__()
         self.verbose = verbose
         self.filepath = data_file
         self.offset = data_offset
@@ -334,117 +344,198 @@ class PDSDataTableObject(dict):
         self.n_rows = int(obj_label["ROWS"])
         self.columns = list()
         for col_label in obj_label["COLUMN"]:
-            self.columns.append(
-                PDSDataTableColumnHeader(self.n_rows, col_label, verbose=self.verbose)
-            )
-        self._create_data_structure()
-
-    def _create_data_structure(self):
-        # Setting up columns
+            if columns is None or col_label["NAME"] in columns:
+                self.columns.append(
+                    PDSDataTableColumnHeader(
+                        self.n_rows, col_label, verbose=self.verbose
+                    )
+                )
+        if columns is not None and len(self.columns) != len(set(columns)):
+            raise ValueError("Illegal column.")
+        if load_mode not in self._load_modes:
+            raise ValueError("Illegal load mode.")
+        self.load_mode = load_mode
+        self._rows = None
+
+    def __missing__(self, key):
+        # the columns are decoded on their first access
+        self._check_interchange_format()
         for cur_col in self.columns:
+            if cur_col.name == key:
+                break
+        else:
+            raise KeyError(key)
+
+        self[key] = self._decode_column(self.rows, cur_col)
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        return any(cur_col.name == key for cur_col in self.columns)
+
+    def __iter__(self):
+        return iter([cur_col.name for cur_col in self.columns])
+
+    def __len__(self):
+        return len(self.columns)
 
-            if cur_col.n_items == 1:
-                self[cur_col.name] = numpy.zeros(self.n_rows, cur_col.np_data_type)
+    def keys(self):
+        return KeysView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def is_decoded(self, key):
+        """True if the column `key` is already decoded"""
+        return super().__contains__(key)
+
+    @property
+    def row_bytes(self):
+        """Length of the rows in the file, with their ROW_PREFIX_BYTES and ROW_SUFFIX_BYTES"""
+
+        return (
+            int(self.label.get("ROW_PREFIX_BYTES", 0))
+            + int(self.label["ROW_BYTES"])
+            + int(self.label.get("ROW_SUFFIX_BYTES", 0))
+        )
+
+    @property
+    def np_row_dtype(self):
+        """numpy structured dtype of the rows of a binary table, with the columns at their
+        START_BYTE (after the ROW_PREFIX_BYTES) and the ROW_SUFFIX_BYTES included in the
+        itemsize"""
+
+        prefix_length = int(self.label.get("ROW_PREFIX_BYTES", 0))
+        formats = []
+        for cur_col in self.columns:
+            if int(cur_col.n_items) == 1:
+                formats.append(cur_col.np_item_dtype)
             else:
-                self[cur_col.name] = numpy.zeros(
-                    (self.n_rows, cur_col.n_items), cur_col.np_data_type
+                formats.append((cur_col.np_item_dtype, (int(cur_col.n_items),)))
+
+        return numpy.dtype(
+            {
+                "names": [cur_col.name for cur_col in self.columns],
+                "formats": formats,
+                "offsets": [
+                    prefix_length + int(cur_col.start_byte) for cur_col in self.columns
+                ],
+                "itemsize": self.row_bytes,
+            }
+        )
+
+    @property
+    def _file_row_dtype(self):
+        # rows of an ASCII table are read as fixed-width byte strings
+        if self.label["INTERCHANGE_FORMAT"] == "BINARY":
+            return self.np_row_dtype
+        return numpy.dtype((numpy.uint8, (self.row_bytes,)))
+
+    @property
+    def rows(self):
+        """Rows of the table, memory mapped in "mmap" load mode: structured array for a
+        binary table (see `np_row_dtype`), or (rows x row bytes) matrix of bytes for an
+        ASCII table"""
+
+        if self._rows is None:
+            row_dtype = self._file_row_dtype
+            if self.verbose:
+                print("Loading {} rows with dtype: {}".format(self.n_rows, row_dtype))
+
+            if self.load_mode == "mmap" and self.n_rows > 0:
+                # zero-copy strided view of the file: the pages of the file are only
+                # read when the corresponding columns are decoded
+                if (
+                    os.path.getsize(self.filepath)
+                    < self.offset + self.n_rows * row_dtype.itemsize
+                ):
+                    raise IOError("Corrupted file...")
+                self._rows = numpy.memmap(
+                    self.filepath,
+                    dtype=row_dtype,
+                    mode="r",
+                    offset=self.offset,
+                    shape=(self.n_rows,),
                 )
-
-    def load_data(self):
-        # Loading data into columns
-        if self.label["INTERCHANGE_FORMAT"] == "ASCII":
-            self._load_data_ascii()
-        elif self.label["INTERCHANGE_FORMAT"] == "BINARY":
-            self._load_data_binary()
+            else:
+                # all the rows are read at once, as an array of structured items
+                with open(self.filepath, "rb") as f:
+                    f.seek(self.offset)
+                    self._rows = numpy.fromfile(f, dtype=row_dtype, count=self.n_rows)
+                if len(self._rows) != self.n_rows:
+                    self._rows = None
+                    raise IOError("Corrupted file...")
+
+        return self._rows
+
+    def _decode_column(self, rows, cur_col):
+        """Decode a column from `rows` (see `rows`)"""
+
+        if self.label["INTERCHANGE_FORMAT"] == "BINARY":
+            return rows[cur_col.name].astype(cur_col.np_data_type)
+
+        # ASCII table: the byte spans of the items are gathered for all the rows, and
+        # converted at once into numbers (or characters)
+        start = int(self.label.get("ROW_PREFIX_BYTES", 0)) + int(cur_col.start_byte)
+        n_items = int(cur_col.n_items)
+        if cur_col.struct_format[-1] == "c":
+            # one character per item (ASCII codes are also UCS4 codes)
+            chars = rows[:, start : start + n_items]
+            values = chars.astype(numpy.uint32).view("U1")
         else:
+            width = int(cur_col.item_bytes)
+            step = int(cur_col.label.get("ITEM_OFFSET", width))
+            index = start + step * numpy.arange(n_items)[:, None] + numpy.arange(width)
+            items = numpy.ascontiguousarray(rows[:, index]).view(f"S{width}")[..., 0]
+            values = items.astype(cur_col.np_data_type)
+        if n_items == 1:
+            return values[:, 0]
+        return values
+
+    def iter_chunks(self, chunk_size=65536):
+        """
+        Yields the selected columns of consecutive chunks of (at most) `chunk_size` rows, as
+        dicts of arrays. Only one chunk of the table is loaded at a time, which bounds the
+        memory used for tables larger than RAM.
+        """
+
+        self._check_interchange_format()
+        row_dtype = self._file_row_dtype
+        with open(self.filepath, "rb") as f:
+            f.seek(self.offset)
+            for chunk_start in range(0, self.n_rows, chunk_size):
+                count = min(chunk_size, self.n_rows - chunk_start)
+                rows = numpy.fromfile(f, dtype=row_dtype, count=count)
+                if len(rows) != count:
+                    raise IOError("Corrupted file...")
+                yield {
+                    cur_col.name: self._decode_column(rows, cur_col)
+                    for cur_col in self.columns
+                }
+
+    def _check_interchange_format(self):
+        if self.label["INTERCHANGE_FORMAT"] not in ("ASCII", "BINARY"):
             raise ValueError(
                 "Unknown interchange format ({})".format(
                     self.label["INTERCHANGE_FORMAT"]
                 )
             )
 
-    def _load_data_ascii(self):
-        with open(self.filepath, "r") as f:
-
-            for ii, line in enumerate(f.readlines()):
-                for cur_col in self.columns:
-                    cur_name = cur_col.name
-                    cur_byte_start = int(cur_col.start_byte)
-                    cur_byte_length = int(cur_col.bytes)
-                    if cur_col.n_items == 1:
-                        if self.verbose:
-                            print(
-                                "Loading... {}[{}] from bytes {}:{}".format(
-                                    cur_name,
-                                    ii,
-                                    cur_byte_start,
-                                    cur_byte_start + cur_byte_length,
-                                )
-                            )
-                        self[cur_name][ii] = line[
-                            cur_byte_start : cur_byte_start + cur_byte_length
-                        ]
-                    else:
-                        for cur_item in range(cur_col.n_items):
-                            if self.verbose:
-                                print(
-                                    "Loading... {}[{}, {}] from bytes {}:{}".format(
-                                        cur_name,
-                                        ii,
-                                        cur_item,
-                                        cur_byte_start,
-                                        cur_byte_start + cur_byte_length,
-                                    )
-                                )
-                            self[cur_name][ii, cur_item] = line[
-                                cur_byte_start : cur_byte_start + cur_byte_length
-                            ]
-                            cur_byte_start += cur_byte_length
-
-    def _load_data_binary(self):
-
-        import struct
-
-        with open(self.filepath, "rb") as f:
-
-            f.seek(self.offset)
-
-            buf_length = int(self.label["ROW_BYTES"])
-            if "ROW_PREFIX_BYTES" in self.label.keys():
-                buf_length += int(self.label["ROW_PREFIX_BYTES"])
-            if "ROW_SUFFIX_BYTES" in self.label.keys():
-                buf_length += int(self.label["ROW_SUFFIX_BYTES"])
-
-            for ii in range(self.n_rows):
-
-                buf_data = f.read(buf_length)
-
-                for cur_col in self.columns:
-                    cur_name = cur_col.name
-                    cur_byte_start = int(cur_col.start_byte)
-                    cur_byte_length = int(cur_col.bytes)
-
-                    if self.verbose:
-                        print(
-                            "Loading... {}[{}] from bytes {}:{} of buffer({} bytes) with format: {}".format(
-                                cur_name,
-                                ii,
-                                cur_byte_start,
-                                cur_byte_start + cur_byte_length,
-                                buf_length,
-                                cur_col.struct_format,
-                            )
-                        )
-
-                    line = struct.unpack(
-                        cur_col.struct_format,
-                        buf_data[cur_byte_start : cur_byte_start + cur_byte_length],
-                    )
+    def load_data(self):
+        # Loading data into columns
+        self._check_interchange_format()
+        for cur_col in self.columns:
+            self[cur_col.name] = self._decode_column(self.rows, cur_col)
 
-                    if cur_col.n_items == 1:
-                        self[cur_name][ii] = line[0]
-                    else:
-                        self[cur_name][ii, :] = line
+        # the rows are not needed anymore, once all the columns are decoded
+        self._rows = None
 
     def __repr__(self):
         return f"<PDSTableObject: {self.label['NAME']} ({self.n_rows} rows x {self.n_columns} columns)>"
@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 from pathlib import Path
-from typing import Union, Dict
+from typing import Union, Dict, List
 from ...pds import Pds3Data
 from ...pds.utils import PDSDataTableObject
 from maser.data.base.sweeps import Sweeps, Sweep
+from maser.data.base.mixins import classify_sweep_modes
 from .consts import (
     MEX_MARSIS_AIS_PROCESS_IDS,
     MEX_MARSIS_AIS_DATA_TYPES,
@@ -26,6 +27,8 @@ def decode_instrument_mode(instrument_mode: int):
 
 
 class MexMMarsis3RdrAisV1Sweep(Sweep):
+    __slots__ = ()
+
     def __init__(self, header, data, time, frequencies):
         super().__init__(header, data)
         self._time = time
@@ -67,11 +70,24 @@ class MexMMarsis3RdrAisV1Data(
 ):
     _iter_sweep_class = MexMMarsis3RdrAisV1Sweeps
 
+    # columns decoded when the data are loaded (times, frequencies and sweep numbers), the
+    # other columns (e.g., SPECTRAL_DENSITY) are decoded on their first access
+    _index_columns = [
+        "SCET_DAYS",
+        "SCET_MSEC",
+        "SCET_STRING",
+        "FREQUENCY",
+        "FREQUENCY_TABLE_NUMBER",
+        "FREQUENCY_NUMBER",
+    ]
+
     def __init__(
         self,
         filepath: Path,
         dataset: Union[None, str] = "__auto__",
         access_mode: str = "sweeps",
+        load_data: bool = True,
+        columns: Union[None, List[str]] = None,
     ):
         super().__init__(
             filepath,
@@ -80,28 +96,32 @@ class MexMMarsis3RdrAisV1Data(
             fmt_label_dict=FMT_LABELS["MEX-M-MARSIS-3-RDR-AIS-V1.0"],
         )
         self.table = PDSDataTableObject(
-            self.label["AIS_TABLE"], self.pointers["AIS_TABLE"]["file_name"]
+            self.label["AIS_TABLE"],
+            self.pointers["AIS_TABLE"]["file_name"],
+            data_offset=self.pointers["AIS_TABLE"]["byte_offset"],
+            columns=columns,
+            load_mode="mmap",
         )
         self.sweep_mapping: Dict[int, bool] = {}
+        self._load_data = load_data
         if self._load_data:
             self.load_data()
 
     def load_data(self):
-        self.table.load_data()
+        self.table.update(self._cached("index_columns", self._decode_index_columns))
         self._load_data = True
 
-        msec0 = self.table["SCET_MSEC"][0]
-        sweep_number = [0]
-        for msec in self.table["SCET_MSEC"][1:]:
-            if msec == msec0:
-                sweep_number.append(sweep_number[-1])
-            else:
-                msec0 = msec
-                sweep_number.append(sweep_number[-1] + 1)
-        sweep_number = numpy.array(sweep_number)
-        for sweep_id in sorted(set(sweep_number)):
+        # a new sweep starts at each change of SCET_MSEC
+        msec = self.table["SCET_MSEC"]
+        sweep_number = numpy.concatenate(([0], numpy.cumsum(msec[1:] != msec[:-1])))
+        for sweep_id in range(sweep_number[-1] + 1):
             self.sweep_mapping[sweep_id] = sweep_number == sweep_id
 
+    def _decode_index_columns(self):
+        return {
+            name: self.table[name] for name in self._index_columns if name in self.table
+        }
+
     @property
     def _sweep_masks(self):
         for item in self.sweep_mapping.items():
@@ -126,8 +146,7 @@ class MexMMarsis3RdrAisV1Data(
     def frequencies(self):
         if self._frequencies is None:
             if self._load_data is False:
-                self.table.load_data()
-                self._load_data = True
+                self.load_data()
             freq_table_nb = self.table["FREQUENCY_TABLE_NUMBER"]
             if len(set(freq_table_nb)) == 1:
                 self._frequencies = self.table["FREQUENCY"][
@@ -141,6 +160,17 @@ class MexMMarsis3RdrAisV1Data(
                 ]
         return self._frequencies
 
+    @property
+    def sweep_modes(self):
+        """Sweep mode id of each sweep, and list of the frequencies of each mode
+        (see `maser.data.base.mixins.classify_sweep_modes`)"""
+        frequencies = self.frequencies
+        if self.fixed_frequencies:
+            return numpy.zeros(len(self.sweep_mapping), dtype=numpy.int64), [
+                frequencies
+            ]
+        return classify_sweep_modes(frequencies)
+
     def as_xarray(self):
         import xarray
 
@@ -5,8 +5,19 @@ from maser.data.base import (
     CdfData,
     FitsData,
 )
+from maser.data.base.mixins import classify_sweep_modes
+from maser.data.base.detection import (
+    dataset_cache,
+    sniff_format,
+    sniff_pds3_keyword,
+)
+from maser.data.base.parallel import chunk_slices
+from maser.data.base.records import HeaderTable
+from maser.data.base.sweeps import Sweep
+from astropy.units import Unit
 from .fixtures import test_filepaths
 from pathlib import Path
+import numpy
 import pytest
 from .fixtures import skip_if_spacepy_not_available
 
@@ -83,3 +94,86 @@ def test___bin_dataset__sweeps_for_loop():
 @pytest.mark.skip(reason="not implemented")
 def test___bin_dataset__sweeps_next():
     pass
+
+
+def test_classify_sweep_modes():
+    frequencies = [
+        numpy.array([1.0, 2.0, 3.0]) * Unit("kHz"),
+        numpy.array([1.0, 2.0]) * Unit("kHz"),
+        numpy.array([1.0, 2.0, 3.0]) * Unit("kHz"),
+        numpy.array([1.0, 2.0, 4.0]) * Unit("kHz"),
+    ]
+    mode_ids, mode_frequencies = classify_sweep_modes(frequencies)
+    assert mode_ids.tolist() == [0, 1, 0, 2]
+    assert len(mode_frequencies) == 3
+    assert all(
+        numpy.array_equal(frequencies[i], mode_frequencies[mode_id])
+        for i, mode_id in enumerate(mode_ids)
+    )
+
+
+def test_sniff_format(tmp_path):
+    (tmp_path / "file.dat").write_bytes(b"SIMPLE  =                    T" + b" " * 50)
+    (tmp_path / "file.txt").write_bytes(b"\xcd\xf3\x00\x01\x00\x00\xff\xff")
+    (tmp_path / "file.lab").write_text("PDS_VERSION_ID = PDS3\r\n")
+    (tmp_path / "file.cdf").write_bytes(b"")
+    assert sniff_format(tmp_path / "file.dat") == "fits"
+    assert sniff_format(tmp_path / "file.txt") == "cdf"
+    assert sniff_format(tmp_path / "file.lab") == "pds3"
+    assert sniff_format(tmp_path / "file.cdf") == "cdf"
+    assert sniff_format(tmp_path / "toto.bin") is None
+
+
+def test_sniff_pds3_keyword(tmp_path):
+    filepath = tmp_path / "file.lbl"
+    filepath.write_text(
+        'PDS_VERSION_ID = PDS3\r\nDATA_SET_ID    = "MEX-M-MARSIS-3-RDR-AIS-V1.0"\r\n'
+        'PRODUCT_ID = "FOO\r\nBAR"\r\n'
+    )
+    assert (
+        sniff_pds3_keyword(filepath, "DATA_SET_ID") == '"MEX-M-MARSIS-3-RDR-AIS-V1.0"'
+    )
+    assert sniff_pds3_keyword(filepath, "PRODUCT_ID") is None
+    assert sniff_pds3_keyword(filepath, "TARGET_NAME") is None
+    assert Data.get_dataset(Data, filepath) == "MEX-M-MARSIS-3-RDR-AIS-V1.0"
+
+
+def test_dataset_cache(tmp_path):
+    filepath = tmp_path / "R2012180.20"
+    filepath.write_bytes(b"")
+    dataset_cache.clear()
+    assert Data.get_dataset(Data, filepath) == "co_rpws_hfr_kronos_n1"
+    key = dataset_cache.key(filepath)
+    assert dataset_cache.get(key) == "co_rpws_hfr_kronos_n1"
+
+    # the cache entry is invalidated when the file is modified
+    filepath.write_bytes(b"\x00" * 10)
+    assert dataset_cache.get(dataset_cache.key(filepath)) is None
+
+
+def test_chunk_slices():
+    assert chunk_slices(10, 3) == [slice(0, 3), slice(3, 6), slice(6, 10)]
+    assert chunk_slices(2, 4) == [slice(0, 1), slice(1, 2)]
+    assert chunk_slices(10, 1) == [slice(0, 10)]
+
+
+def test_header_table():
+    array = numpy.array(
+        [(1, 2.5, b"AB"), (3, 4.5, b"CD")],
+        dtype=[("A", ">i2"), ("B", ">f4"), ("NAME", "S2")],
+    )
+    table = HeaderTable(
+        array,
+        converters={"NAME": lambda value: value.decode()},
+        constants={"EPOCH": 1950},
+    )
+    assert len(table) == 2
+    assert table[1] == {"A": 3, "B": 4.5, "NAME": "CD", "EPOCH": 1950}
+    assert type(table[0]["A"]) is int
+    assert list(table[-1].keys()) == ["A", "B", "NAME", "EPOCH"]
+    assert [header["A"] for header in table] == [1, 3]
+    with pytest.raises(IndexError):
+        table[2]
+
+    sweep = Sweep(table[0], None)
+    assert not hasattr(sweep, "__dict__")
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+from .constants import BASEDIR
+from maser.data import Collection
+from maser.data.batch import map_files
+from maser.data.base.cache import get_cache
+import os
+import pytest
+
+
+def _nsweep(data):
+    return len(data)
+
+
+def _nsweep__worker_crash(data):
+    if data.filepath.name == "R2012180.01":
+        os._exit(1)
+    return len(data)
+
+
+def _kronos_files(tmp_path, nfiles=4):
+    filepaths = [tmp_path / f"R2012180.{hour:02d}" for hour in range(nfiles)]
+    for filepath in filepaths:
+        filepath.write_bytes(b"")
+    return filepaths
+
+
+# BATCH TESTS
+@pytest.mark.parametrize("workers", [1, 2])
+def test_map_files(tmp_path, workers):
+    filepaths = _kronos_files(tmp_path)
+    results = map_files(filepaths + [tmp_path / "toto.txt"], _nsweep, workers=workers)
+    assert [result.filepath for result in results] == filepaths + [
+        tmp_path / "toto.txt"
+    ]
+    assert all(result.ok and result.value == 0 for result in results[:-1])
+    # the failure on the last file is reported in its result
+    assert not results[-1].ok
+    assert "NotImplementedError" in results[-1].error
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_map_files__worker_crash(tmp_path, workers):
+    filepaths = _kronos_files(tmp_path, 8)
+    results = map_files(filepaths, _nsweep__worker_crash, workers=workers)
+    assert [result.filepath for result in results] == filepaths
+    # only the file killing its worker process fails
+    assert [result.ok for result in results] == [True, False] + [True] * 6
+    assert all(result.value == 0 for result in results if result.ok)
+    assert "BrokenProcessPool" in results[1].error
+
+
+def test_map_files__cache_dir(tmp_path):
+    filepaths = _kronos_files(tmp_path)
+    results = map_files(filepaths, _nsweep, workers=1, cache_dir=tmp_path / "cache")
+    assert all(result.ok for result in results)
+    assert any((tmp_path / "cache").iterdir())
+    assert get_cache() is None
+
+
+def test_map_files__dataset_error(tmp_path):
+    with pytest.raises(ValueError):
+        map_files(_kronos_files(tmp_path), _nsweep, dataset=["co_rpws_hfr_kronos_n1"])
+
+
+@pytest.mark.test_data_required
+def test_collection__map():
+    collection = Collection(BASEDIR / "kronos" / "2012_091_180" / "n1")
+    results = collection.map(_nsweep, workers=2)
+    assert [result.value for result in results] == [len(data) for data in collection]
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+from .constants import BASEDIR
+from maser.data import Data
+from maser.data.base.cache import DataCache, enable_cache, disable_cache
+import numpy
+import pytest
+
+
+# DATA CACHE TESTS
+def test_data_cache(tmp_path):
+    filepath = tmp_path / "file.dat"
+    filepath.write_bytes(b"\x00" * 16)
+    cache = DataCache(tmp_path / "cache")
+    decoded = []
+
+    def decode():
+        decoded.append(True)
+        return {
+            "times": numpy.arange(10).astype("datetime64[s]"),
+            "empty": numpy.zeros(0),
+            "arrays": {"FREQ": numpy.ones(5, dtype=">f4")},
+        }
+
+    arrays = cache.get(filepath, "foo", "decoder:1", decode)
+    cached_arrays = cache.get(filepath, "foo", "decoder:1", decode)
+    assert len(decoded) == 1
+    assert isinstance(cached_arrays["times"], numpy.memmap)
+    assert numpy.array_equal(cached_arrays["times"], arrays["times"])
+    assert numpy.array_equal(cached_arrays["arrays"]["FREQ"], arrays["arrays"]["FREQ"])
+    assert len(cached_arrays["empty"]) == 0
+
+    # the entry is not used for another decoder version, or a modified file
+    cache.get(filepath, "foo", "decoder:2", decode)
+    filepath.write_bytes(b"\x00" * 32)
+    cache.get(filepath, "foo", "decoder:1", decode)
+    assert len(decoded) == 3
+
+
+def test_data_cache__content_key(tmp_path):
+    for name in ["file1.dat", "file2.dat"]:
+        (tmp_path / name).write_bytes(b"\x00" * 16)
+    cache = DataCache(tmp_path / "cache", key_mode="content")
+    assert cache.key(tmp_path / "file1.dat", "foo", "decoder:1") == cache.key(
+        tmp_path / "file2.dat", "foo", "decoder:1"
+    )
+
+
+def test_data_cache__eviction(tmp_path):
+    filepath = tmp_path / "file.dat"
+    filepath.write_bytes(b"")
+    cache = DataCache(tmp_path / "cache", max_size=2000)
+    for i in range(4):
+        cache.get(filepath, "foo", f"decoder_{i}", lambda: {"a": numpy.zeros(100)})
+    assert cache.size <= 2000
+    assert len(cache._entries()) == 2
+    # the least recently used entries are evicted
+    assert cache.load(cache.key(filepath, "foo", "decoder_0")) is None
+    assert cache.load(cache.key(filepath, "foo", "decoder_3")) is not None
+
+
+def test_data_cache__eviction_scan(tmp_path, monkeypatch):
+    filepath = tmp_path / "file.dat"
+    filepath.write_bytes(b"")
+    cache = DataCache(tmp_path / "cache", max_size=2000)
+    scans = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, "_entries", lambda: scans.append(True) or entries())
+    cache.get(filepath, "foo", "decoder_0", lambda: {"a": numpy.zeros(100)})
+    cache.get(filepath, "foo", "decoder_1", lambda: {"a": numpy.zeros(100)})
+    # the cache directory is only scanned on the first save
+    assert len(scans) == 1
+    # ... and when the cache exceeds its maximum size
+    cache.get(filepath, "foo", "decoder_2", lambda: {"a": numpy.zeros(100)})
+    assert len(scans) == 2
+    assert len(entries()) == 2
+
+
+def test_data_cache__nested_dicts(tmp_path):
+    filepath = tmp_path / "file.dat"
+    filepath.write_bytes(b"")
+    cache = DataCache(tmp_path / "cache")
+    arrays = {
+        "a": {"b": {"c": numpy.arange(3)}, "d": numpy.ones(2)},
+        "e": {},
+    }
+    cache.get(filepath, "foo", "decoder", lambda: arrays)
+    cached_arrays = cache.load(cache.key(filepath, "foo", "decoder"))
+    assert numpy.array_equal(cached_arrays["a"]["b"]["c"], numpy.arange(3))
+    assert numpy.array_equal(cached_arrays["a"]["d"], numpy.ones(2))
+    assert cached_arrays["e"] == {}
+
+
+@pytest.mark.parametrize(
+    "arrays",
+    [
+        {"a": numpy.array([None, 1], dtype=object)},
+        {"a": {"b": [numpy.zeros(2), numpy.zeros(3)]}},
+        {"a.b": numpy.zeros(2)},
+    ],
+)
+def test_data_cache__not_cached(tmp_path, arrays):
+    filepath = tmp_path / "file.dat"
+    filepath.write_bytes(b"")
+    cache = DataCache(tmp_path / "cache")
+    # the arrays which can't be stored are returned without being cached
+    assert cache.get(filepath, "foo", "decoder", lambda: arrays) is arrays
+    assert cache.load(cache.key(filepath, "foo", "decoder")) is None
+    assert list((tmp_path / "cache").glob("*")) == []
+
+
+def test_data_cache__key_mode_error(tmp_path):
+    with pytest.raises(ValueError):
+        DataCache(tmp_path, key_mode="foo")
+
+
+@pytest.mark.test_data_required
+def test_data_cache__kronos_n1(tmp_path):
+    filepath = BASEDIR / "kronos" / "2012_091_180" / "n1" / "R2012180.20"
+    data = Data(filepath=filepath)
+    enable_cache(tmp_path)
+    try:
+        for _ in range(2):
+            cached_data = Data(filepath=filepath)
+            assert numpy.all(cached_data.times == data.times)
+            assert all(
+                numpy.array_equal(cached_frequencies, frequencies)
+                for cached_frequencies, frequencies in zip(
+                    cached_data.frequencies, data.frequencies
+                )
+            )
+    finally:
+        disable_cache()
@@ -8,6 +8,8 @@ from maser.data.cdpp import (
     InterballAuroralPolradRspSweep,
     InterballAuroralPolradRspRecord,
 )
+from maser.data.cdpp.ccsds import decode_ccsds_date, decode_ccsds_dates
+import numpy
 import pytest
 
 
@@ -20,6 +22,34 @@ TEST_FILES = {
 
 
 # CDPP/INTERBALL TESTS ==== int_aur_polrad_rst
+def test_decode_ccsds_dates():
+    epoch = Time("1950-01-01 00:00:00")
+    # CDS level 2 (with the P_Field of the Interball files)
+    t_fields = numpy.array(
+        [[0, 68, 176, 5, 36, 240, 241], [0, 68, 176, 5, 36, 248, 73]], dtype=numpy.uint8
+    )
+    dates = decode_ccsds_dates(56, t_fields, epoch)
+    assert dates.dtype == numpy.dtype("datetime64[ns]")
+    for date, t_field in zip(dates, t_fields):
+        expected = decode_ccsds_date(56, bytearray(t_field), epoch).datetime
+        assert Time(date) == expected
+    # CCS (binary and BCD), with 1e-2 and 1e-4 seconds
+    expected = numpy.datetime64("1997-11-15T23:59:34.4170", "ns")
+    t_field = numpy.array([[7, 205, 11, 15, 23, 59, 34, 41, 70]], dtype=numpy.uint8)
+    assert decode_ccsds_dates(74, t_field)[0] == expected
+    t_field = numpy.array(
+        [[0x19, 0x97, 0x11, 0x15, 0x23, 0x59, 0x34, 0x41, 0x70]], dtype=numpy.uint8
+    )
+    assert decode_ccsds_dates(74, t_field, bcd=True)[0] == expected
+    # CUC, with a sub-microsecond fine time
+    t_field = numpy.array([[0, 0, 0, 1, 0, 0, 1]], dtype=numpy.uint8)
+    assert decode_ccsds_dates(242, t_field)[0] == numpy.datetime64(
+        "1958-01-01T00:00:01.000000059", "ns"
+    )
+    with pytest.raises(Exception):
+        decode_ccsds_dates(56, t_fields[:, :6], epoch)
+
+
 @pytest.mark.test_data_required
 def test_int_aur_polrad_rsp_bin_dataset():
     for filepath in TEST_FILES["cdpp_int_aur_polrad_rspn2"]:
@@ -235,3 +265,86 @@ def test_int_aur_polrad_rsp_bin_dataset__records_for_loop__file0():
         counter += 1
         if counter > 300:
             break
+
+
+@pytest.mark.test_data_required
+def test_int_aur_polrad_rsp_bin_dataset__sweeps_random_access():
+    for filepath in TEST_FILES["cdpp_int_aur_polrad_rspn2"]:
+        data = Data(filepath=filepath)
+        sweeps = list(data.sweeps)
+        assert len(data) == len(sweeps)
+        for i in [0, 10, -1]:
+            sweep = data.sweeps[i]
+            assert isinstance(sweep, InterballAuroralPolradRspSweep)
+            assert sweep.header["SWEEP_ID"] == sweeps[i].header["SWEEP_ID"]
+            assert sweep.time == sweeps[i].time
+            assert numpy.array_equal(sweep.data["EY"], sweeps[i].data["EY"])
+            # the frequencies are shared by the sweeps with the same number of steps
+            assert sweep.frequencies is sweeps[0].frequencies
+        assert [sweep.header["SWEEP_ID"] for sweep in data.sweeps[2:8:3]] == [2, 5]
+        with pytest.raises(IndexError):
+            data.sweeps[len(sweeps)]
+
+
+@pytest.mark.test_data_required
+def test_int_aur_polrad_rsp_bin_dataset__random_access_without_loading(monkeypatch):
+    for filepath in TEST_FILES["cdpp_int_aur_polrad_rspn2"]:
+        sweeps = list(Data(filepath=filepath).sweeps)
+
+        # the whole file is only decoded when iterating over all the sweeps
+        def _decode_sweeps(self):
+            raise AssertionError("the whole file is decoded")
+
+        with monkeypatch.context() as m:
+            m.setattr(
+                InterballAuroralPolradRspBinData, "_decode_sweeps", _decode_sweeps
+            )
+            data = Data(filepath=filepath)
+            for i in [0, 10, -1]:
+                sweep = data.sweeps[i]
+                assert sweep.header["SWEEP_ID"] == sweeps[i].header["SWEEP_ID"]
+                for key in ["EX", "EY", "EZ"]:
+                    if sweeps[i].data[key] is None:
+                        assert sweep.data[key] is None
+                    else:
+                        assert sweep.data[key].dtype == sweeps[i].data[key].dtype
+                        assert numpy.array_equal(sweep.data[key], sweeps[i].data[key])
+            times = data.times
+            selected = list(data.sel(time=slice(times[2], times[5])))
+            assert [sweep.header["SWEEP_ID"] for sweep in selected] == [2, 3, 4, 5]
+            assert data._InterballAuroralPolradRspBinData__data is None
+
+
+@pytest.mark.test_data_required
+def test_int_aur_polrad_rsp_bin_dataset__len_without_loading(tmp_path):
+    for filepath in TEST_FILES["cdpp_int_aur_polrad_rspn2"]:
+        data = Data(filepath=filepath, persist_index=True, index_dir=tmp_path)
+        assert len(data) == data.index.headers.shape[0]
+        assert data._InterballAuroralPolradRspBinData__data is None
+        assert (tmp_path / (filepath.name + ".sweep_index.npz")).exists()
+
+
+@pytest.mark.test_data_required
+def test_int_aur_polrad_rsp_bin_dataset__sel():
+    filepath = TEST_FILES["cdpp_int_aur_polrad_rspn2"][0]
+    data = Data(filepath=filepath)
+    times = data.times
+    sweeps = list(data.sel(time=slice(times[2], times[5]), frequency=slice(100, 200)))
+    assert [sweep.header["SWEEP_ID"] for sweep in sweeps] == [
+        data.sweeps[i].header["SWEEP_ID"] for i in range(2, 6)
+    ]
+    for sweep in sweeps:
+        assert sweep.frequencies.value.min() >= 100
+        assert sweep.frequencies.value.max() <= 200
+        assert len(sweep.data["EY"]) == len(sweep.frequencies)
+
+
+@pytest.mark.test_data_required
+def test_int_aur_polrad_rsp_bin_dataset__as_ragged():
+    filepath = TEST_FILES["cdpp_int_aur_polrad_rspn2"][0]
+    data = Data(filepath=filepath)
+    ragged = data.as_ragged()
+    assert len(ragged) == len(data.sweeps)
+    for i, sweep in enumerate(data.sweeps):
+        assert numpy.array_equal(ragged.frequencies[i], sweep.frequencies.value)
+        assert numpy.array_equal(ragged.data["EY"][i], sweep.data["EY"])
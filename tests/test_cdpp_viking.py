@@ -5,7 +5,10 @@ from maser.data import Data
 from maser.data.cdpp import (
     VikingV4nE5BinData,
 )
+from maser.data.cdpp.viking import records
+import numpy
 import pytest
+import struct
 
 TEST_FILES = {
     "cdpp_viking_v4n_e5": [BASEDIR / "cdpp" / "viking" / "V4N_0101_003"],
@@ -41,3 +44,147 @@ def test_viking_v4n_e5_bin_dataset__sweeps_access_mode__error():
     with pytest.raises(ValueError):
         filepath = TEST_FILES["cdpp_viking_v4n_e5"][0]
         Data(filepath=filepath, access_mode="sweeps")
+
+
+def _write_viking_v4n_e5_file(filepath, nrecords, record_length):
+    """Synthetic V4N E5 file: V4H receiver active (header2), V4L receiver inactive"""
+    header2_offset = struct.calcsize(records.header1_dtype) + records.header1_spare_len
+    offsets = records._BLOCK_OFFSETS
+    with open(filepath, "wb") as f:
+        for record_id in range(nrecords):
+            record = bytearray(record_length)
+            header1 = [0] * len(records.header1_fields)
+            for name, value in [
+                ("RECORD_NUMBER", record_id + 1),
+                ("CALEND_DATE_YEAR", 1986),
+                ("CALEND_DATE_MONTH", 5),
+                ("CALEND_DATE_DAY", 2),
+                ("CALEND_DATE_HOUR", 10),
+                ("CALEND_DATE_MINUTE", record_id),
+                ("CALEND_DATE_MILLI_SECOND", 500),
+            ]:
+                header1[records.header1_fields.index(name)] = value
+            struct.pack_into(records.header1_dtype, record, 0, *header1)
+            struct.pack_into(">h", record, header2_offset, 1)  # V4H_SFA_ELEMENT_NUMBER
+
+            struct.pack_into(">8h", record, offsets["STATUS"], *range(1, 9))
+            struct.pack_into(">11f", record, offsets["ORBIT"], *range(11))
+            # SFA frequencies and electric spectrum, magnetic spectrum filled with zeros
+            struct.pack_into(">256f", record, offsets["VIKING_V4H_SFA"], *range(256))
+            struct.pack_into(
+                ">256f", record, offsets["VIKING_V4H_SFA"] + 1024, *[record_id] * 256
+            )
+            f.write(record)
+
+
+@pytest.fixture
+def viking_layout_length(monkeypatch):
+    """Use the length of the decoded record layout as the record length.
+
+    The decoded layout does not match RECORD_LENGTH (see `records._LAYOUT_LENGTH`),
+    so the synthetic files only check the consistency of the readers, not the layout.
+    """
+    from maser.data.cdpp.viking import data
+
+    monkeypatch.setattr(records, "RECORD_LENGTH", records._LAYOUT_LENGTH)
+    monkeypatch.setattr(data, "RECORD_LENGTH", records._LAYOUT_LENGTH)
+    return records._LAYOUT_LENGTH
+
+
+@pytest.mark.parametrize("products", [None, ["ORBIT"]])
+def test_viking_v4n_e5_bin_dataset__wrong_record_length(tmp_path, products):
+    assert records._LAYOUT_LENGTH != records.RECORD_LENGTH
+    filepath = tmp_path / "V4N_0000_000"
+    _write_viking_v4n_e5_file(filepath, 2, records.RECORD_LENGTH)
+    data = Data(filepath=filepath, dataset="cdpp_viking_v4n_e5", products=products)
+    with pytest.raises(Exception, match="Wrong record length."):
+        list(data.records)
+
+
+def test_viking_v4n_e5_bin_dataset__products(tmp_path, viking_layout_length):
+    # the blocks follow each other, up to the end of the record
+    blocks = [name for name, _ in records._BLOCKS]
+    for name, next_name in zip(blocks[:-1], blocks[1:]):
+        assert (
+            records._BLOCK_OFFSETS[name] + records._BLOCK_LENGTHS[name]
+            == records._BLOCK_OFFSETS[next_name]
+        )
+    assert records._BLOCK_OFFSETS["VIKING_V4L_DFT_WF"] + 16384 == viking_layout_length
+
+    filepath = tmp_path / "V4N_0000_000"
+    _write_viking_v4n_e5_file(filepath, 3, viking_layout_length)
+    data = Data(
+        filepath=filepath,
+        dataset="cdpp_viking_v4n_e5",
+        products=["ORBIT", "VIKING_V4H_SFA", "VIKING_V4L_Ni"],
+    )
+    assert len(data.times) == 3
+    assert data.times[1] == Time("1986-05-02 10:01:00.500")
+
+    records_list = list(data.records)
+    assert len(records_list) == 3
+    for record_id, ((header1, _, _), status, orbit, products) in enumerate(
+        records_list
+    ):
+        assert header1["RECORD_NUMBER"] == record_id + 1
+        assert status is None
+        assert orbit["SPACECRAFT_GEOGRAPHIC_LAT"] == 1.0
+        assert list(products) == ["VIKING_V4H_SFA", "VIKING_V4L_Ni"]
+
+        sfa = products["VIKING_V4H_SFA"]
+        for values in sfa.values():
+            assert isinstance(values, numpy.ma.MaskedArray)
+            assert values.shape == (256,)
+        if record_id == 0:
+            # no spectrum (only zeros): the frequencies are masked too
+            assert sfa["ELECTRIC_SFA"].mask.all()
+            assert sfa["FREQUENCY_SFA"].mask.all()
+        else:
+            assert sfa["FREQUENCY_SFA"].tolist() == list(range(256))
+            assert sfa["ELECTRIC_SFA"].tolist() == [record_id] * 256
+        assert sfa["MAGNETIC_SFA"].mask.all()
+
+        # V4L receiver inactive
+        for values in products["VIKING_V4L_Ni"].values():
+            assert values.mask.all()
+
+    # all the products (legacy decoding)
+    data = Data(filepath=filepath, dataset="cdpp_viking_v4n_e5")
+    records_list = list(data.records)
+    assert len(records_list) == 3
+    (header1, _, _), status, orbit, products = records_list[1]
+    assert header1["RECORD_NUMBER"] == 2
+    assert status[0]["G"] == tuple(range(1, 9))
+    assert orbit["SPACECRAFT_GEOGRAPHIC_LAT"] == 1.0
+    assert products["VIKING_V4H_SFA"]["FREQUENCY_SFA"] == tuple(range(256))
+    assert products["VIKING_V4H_SFA"]["ELECTRIC_SFA"] == (1.0,) * 256
+
+
+@pytest.mark.test_data_required
+def test_viking_v4n_e5_bin_dataset__products__error():
+    with pytest.raises(ValueError):
+        filepath = TEST_FILES["cdpp_viking_v4n_e5"][0]
+        Data(filepath=filepath, products=["VIKING_V4H_SFB"])
+
+
+@pytest.mark.parametrize("products", [None, ["ORBIT", "VIKING_V4H_SFA"]])
+def test_viking_v4n_e5_bin_dataset__workers(tmp_path, viking_layout_length, products):
+    filepath = tmp_path / "V4N_0000_000"
+    _write_viking_v4n_e5_file(filepath, 5, viking_layout_length)
+    serial = list(
+        Data(filepath=filepath, dataset="cdpp_viking_v4n_e5", products=products).records
+    )
+    data = Data(
+        filepath=filepath, dataset="cdpp_viking_v4n_e5", products=products, workers=2
+    )
+    data._min_chunk_size = 2
+    chunked = list(data.records)
+    assert len(chunked) == len(serial) == 5
+    for (headers, status, orbit, products_i), expected in zip(chunked, serial):
+        assert (headers, status, orbit) == expected[:3]
+        if products is None:
+            assert products_i == expected[3]
+        else:
+            sfa = products_i["VIKING_V4H_SFA"]
+            for name, values in expected[3]["VIKING_V4H_SFA"].items():
+                assert sfa[name].tolist() == values.tolist()
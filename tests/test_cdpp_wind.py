@@ -13,7 +13,10 @@ from maser.data.cdpp import (
     WindWavesRad1L260sV1BinData,
     WindWavesRad2L260sV1BinData,
     WindWavesTnrL260sV1BinData,
+    SweepIndex,
 )
+from maser.data.cdpp.utils import _header_datetime64
+import numpy
 import pytest
 
 TEST_FILES = {
@@ -48,6 +51,43 @@ TEST_FILES = {
 
 
 # CDPP/WIND TESTS ===== wi_wa_rad1_l2_60s
+def test_header_datetime64():
+    expected = numpy.array(
+        ["1994-11-10T16:38:06.000", "1994-11-10T16:41:03.500"], dtype="datetime64[ns]"
+    )
+    calendar_headers = {
+        "CALEND_DATE_YEAR": [1994, 1994],
+        "CALEND_DATE_MONTH": [11, 11],
+        "CALEND_DATE_DAY": [10, 10],
+        "CALEND_DATE_HOUR": [16, 16],
+        "CALEND_DATE_MINUTE": [38, 41],
+        "CALEND_DATE_SECOND": [6, 3],
+        "CALEND_DATE_MILLI_SECOND": [0, 500],
+    }
+    assert numpy.array_equal(_header_datetime64(calendar_headers), expected)
+    julian_sec_headers = {
+        "JULIAN_SEC": [1415637486, 1415637663],
+        "JULIAN_SEC_FRAC": [0.0, 0.5],
+    }
+    assert numpy.array_equal(_header_datetime64(julian_sec_headers), expected)
+    with pytest.raises(ValueError):
+        _header_datetime64({"FOO": [0]})
+
+
+@pytest.mark.test_data_required
+def test_wi_wa_rad1_l2_60s_bin_dataset__times():
+    for filepath in TEST_FILES["cdpp_wi_wa_rad1_l2_60s_v2"]:
+        data = Data(filepath=filepath)
+        assert isinstance(data.times, Time)
+        assert len(data.times) == len(data)
+        header, _ = data.sweeps[0]
+        assert data.times[0] == Time(
+            f"{header['CALEND_DATE_YEAR']}-{header['CALEND_DATE_MONTH']}-"
+            f"{header['CALEND_DATE_DAY']} {header['CALEND_DATE_HOUR']}:"
+            f"{header['CALEND_DATE_MINUTE']}:{header['CALEND_DATE_SECOND']}"
+        )
+
+
 @pytest.mark.test_data_required
 def test_wi_wa_rad1_l2_60s_bin_dataset():
     for filepath in TEST_FILES["cdpp_wi_wa_rad1_l2_60s_v2"]:
@@ -55,6 +95,66 @@ def test_wi_wa_rad1_l2_60s_bin_dataset():
         assert isinstance(data, WindWavesRad1L260sV2BinData)
 
 
+@pytest.mark.test_data_required
+def test_wi_wa_rad1_l2_60s_bin_dataset__sweeps_random_access():
+    for filepath in TEST_FILES["cdpp_wi_wa_rad1_l2_60s_v2"]:
+        data = Data(filepath=filepath)
+        sweeps = list(data.sweeps)
+        assert len(data) == len(sweeps)
+        assert len(data.sweeps) == len(sweeps)
+        for i in [0, 10, -1]:
+            header, data_i = data.sweeps[i]
+            assert header == sweeps[i][0]
+            assert data_i == sweeps[i][1]
+        assert [header for header, _ in data.sweeps[2:8:3]] == [
+            header for header, _ in sweeps[2:8:3]
+        ]
+        with pytest.raises(IndexError):
+            data.sweeps[len(sweeps)]
+
+
+@pytest.mark.test_data_required
+def test_wi_wa_rad1_l2_60s_bin_dataset__persist_index(tmp_path):
+    for filepath in TEST_FILES["cdpp_wi_wa_rad1_l2_60s_v2"]:
+        data = Data(filepath=filepath, persist_index=True, index_dir=tmp_path)
+        nsweep = len(data)
+        index_path = SweepIndex.sidecar_path(filepath, tmp_path)
+        assert index_path.exists()
+        data = Data(filepath=filepath, persist_index=True, index_dir=tmp_path)
+        assert len(data) == nsweep
+        numpy.testing.assert_array_equal(
+            data.index.offsets,
+            SweepIndex.build(filepath, data._index_header_dtype).offsets,
+        )
+
+
+@pytest.mark.test_data_required
+@pytest.mark.parametrize(
+    "dataset",
+    [
+        "cdpp_wi_wa_rad1_l2_60s_v2",
+        "cdpp_wi_wa_rad2_l2_60s_v2",
+        "cdpp_wi_wa_tnr_l2_60s_v2",
+    ],
+)
+def test_wi_wa_l2_60s_bin_dataset__sweeps_decoded_once(dataset):
+    for filepath in TEST_FILES[dataset]:
+        data = Data(filepath=filepath)
+        sweeps = list(data.sweeps)
+        assert len(sweeps) == len(data) > 0
+        # the sweeps are decoded once: iterating again doesn't read the file
+        data.file.close()
+        assert len(list(data.sweeps)) == len(sweeps)
+        header, data_i = sweeps[0]
+        assert list(data_i.keys()) == ["FREQ", "SMOY", "SMIN", "SMAX", "ORBIT"]
+        assert len(data_i["FREQ"]) == header["NFREQ"]
+        assert numpy.array_equal(data.frequencies[0].value, data_i["FREQ"])
+        assert len(data.times) == len(sweeps)
+        datasets = data.as_xarray()
+        assert set(datasets) == {"SMOY", "SMIN", "SMAX"}
+        assert datasets["SMOY"].shape == (len(sweeps), data._max_sweep_length)
+
+
 # CDPP/WIND TESTS ===== wi_wa_rad1_l2
 @pytest.mark.test_data_required
 def test_wi_wa_rad1_l2_bin_dataset():
@@ -144,6 +244,82 @@ def test_wi_wa_rad1_l2_bin_dataset__sweeps_next():
         assert data_i["FREQ"][-1] == 20.0
 
 
+@pytest.mark.test_data_required
+def test_wi_wa_rad1_l2_bin_dataset__decode_modes():
+    filepath = TEST_FILES["cdpp_wi_wa_rad1_l2"][0]
+    data_seq = Data(filepath=filepath, decode_mode="sequential")
+    data_vec = Data(filepath=filepath, decode_mode="vectorized")
+    assert len(data_vec._headers) == 120
+    assert data_vec._arrays["VSPAL"].dtype == numpy.float32
+    for (header_seq, data_seq_i), (header_vec, data_vec_i) in zip(
+        data_seq.sweeps, data_vec.sweeps
+    ):
+        assert header_seq == header_vec
+        for key in data_seq_i.keys():
+            assert numpy.array_equal(data_seq_i[key], data_vec_i[key])
+
+
+@pytest.mark.test_data_required
+def test_wi_wa_rad1_l2_bin_dataset__decode_mode__error():
+    with pytest.raises(ValueError):
+        filepath = TEST_FILES["cdpp_wi_wa_rad1_l2"][0]
+        Data(filepath=filepath, decode_mode="toto")
+
+
+@pytest.mark.test_data_required
+def test_wi_wa_rad1_l2_bin_dataset__sel():
+    for filepath in TEST_FILES["cdpp_wi_wa_rad1_l2"]:
+        data = Data(filepath=filepath)
+        times = data.times
+        sweeps = list(
+            data.sel(time=slice(times[5], times[7]), frequency=slice(None, 500))
+        )
+        assert len(sweeps) == 3
+        for header, data_i in sweeps:
+            assert numpy.all(data_i["FREQ"] <= 500)
+            assert len(data_i["VSPAL"]) == len(data_i["FREQ"]) * header["NSPALF"]
+
+
+@pytest.mark.test_data_required
+def test_wi_wa_rad1_l2_bin_dataset__as_ragged():
+    filepath = TEST_FILES["cdpp_wi_wa_rad1_l2"][0]
+    data = Data(filepath=filepath)
+    ragged = data.as_ragged()
+    assert len(ragged) == len(data.times)
+    assert set(ragged.data) == {"VSPAL", "VZPAL", "TSPAL", "TZPAL"}
+    for i, (header, data_i) in enumerate(data.sweeps):
+        assert numpy.array_equal(ragged.frequencies[i], data_i["FREQ"])
+        assert numpy.array_equal(ragged.data["VSPAL"][i], data_i["VSPAL"])
+    sequential_ragged = Data(filepath=filepath, decode_mode="sequential").as_ragged()
+    assert numpy.array_equal(
+        sequential_ragged.data["VSPAL"].max(),
+        ragged.data["VSPAL"].max(),
+        equal_nan=True,
+    )
+
+
+@pytest.mark.test_data_required
+def test_wi_wa_rad1_l2_bin_dataset__as_xarray():
+    filepath = TEST_FILES["cdpp_wi_wa_rad1_l2"][0]
+    data = Data(filepath=filepath)
+    datasets = data.as_xarray()
+    assert set(datasets) == {"VSPAL", "VZPAL", "TSPAL", "TZPAL"}
+    for i, (header, data_i) in enumerate(data.sweeps):
+        for key, nspectra in [("VSPAL", "NSPALF"), ("VZPAL", "NZPALF")]:
+            # all the spectra of the sweep are kept
+            values = datasets[key].values[i, : header[nspectra], : header["NPALIF"]]
+            assert numpy.array_equal(values.ravel(), data_i[key])
+            assert numpy.isnan(datasets[key].values[i, header[nspectra] :]).all()
+
+
+@pytest.mark.test_data_required
+def test_wi_wa_rad1_l2_60s_bin_dataset__sel__error():
+    for filepath in TEST_FILES["cdpp_wi_wa_rad1_l2_60s_v2"]:
+        data = Data(filepath=filepath)
+        with pytest.raises(NotImplementedError):
+            list(data.sel(frequency=slice(100, 200)))
+
+
 # CDPP/WIND TESTS ===== wi_wa_rad2_l2_60s
 @pytest.mark.test_data_required
 def test_wi_wa_rad2_l2_60s_bin_dataset():
@@ -235,6 +411,21 @@ def test_wi_wa_tnr_l3_bqt_1mn_bin_dataset__records_next():
         }
 
 
+@pytest.mark.test_data_required
+@pytest.mark.parametrize("load_mode", ["memory", "mmap"])
+def test_wi_wa_tnr_l3_bqt_1mn_bin_dataset__columns(load_mode):
+    for filepath in TEST_FILES["cdpp_wi_wa_tnr_l3_bqt_1mn"]:
+        data = Data(filepath=filepath, load_mode=load_mode)
+        plasma_frequency = data["PLASMA_FREQUENCY"]
+        assert len(plasma_frequency) == len(data)
+        assert plasma_frequency[0] == pytest.approx(19.697528839111328)
+        for i, (header_i, data_i) in enumerate(data.records):
+            assert data_i["PLASMA_FREQUENCY"] == plasma_frequency[i]
+            assert header_i["UR8_TIME"] == data["UR8_TIME"][i]
+        with pytest.raises(KeyError):
+            data["RECORD_LENGTH"]
+
+
 # CDPP/WIND TESTS ===== wi_wa_tnr_l3_nn
 @pytest.mark.test_data_required
 def test_wi_wa_tnr_l3_nn_bin_dataset():
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+from .constants import BASEDIR
+from maser.data import Collection
+from maser.data.collection import filename_time_range
+from maser.data.padc.cassini.data import CoRpwsHfrKronosN1Data
+from astropy.time import Time
+import numpy
+import pytest
+
+TEST_DIRECTORIES = {
+    "co_rpws_hfr_kronos_n1": BASEDIR / "kronos" / "2012_091_180" / "n1",
+}
+
+
+# COLLECTION TESTS
+def test_filename_time_range__daily():
+    start, end = filename_time_range(
+        "wi_wa_rad1_l2_19941110_v01.dat", "cdpp_wi_wa_rad1_l2"
+    )
+    assert start == numpy.datetime64("1994-11-09T23:00")
+    assert end == numpy.datetime64("1994-11-11T01:00")
+
+
+def test_filename_time_range__kronos():
+    start, end = filename_time_range("R2012180.20", "co_rpws_hfr_kronos_n1")
+    assert start == numpy.datetime64("2012-06-28T19:59")
+    assert end == numpy.datetime64("2012-06-28T21:01")
+
+
+def test_filename_time_range__none():
+    assert filename_time_range("V4N_0101_003", "cdpp_viking_v4n_e5") is None
+    # the dates in the file names are only used for the datasets of daily files
+    assert (
+        filename_time_range(
+            "DMT_N1_1134_018401_20041105_235807_20041106_003155.DAT",
+            "cdpp_dmt_n1_1134",
+        )
+        is None
+    )
+
+
+@pytest.mark.test_data_required
+def test_collection__kronos_n1():
+    collection = Collection(TEST_DIRECTORIES["co_rpws_hfr_kronos_n1"])
+    assert len(collection) == 3
+    assert [filepath.name for filepath in collection.files] == [
+        "R2012180.20",
+        "R2012180.21",
+        "R2012180.22",
+    ]
+    for data in collection:
+        assert isinstance(data, CoRpwsHfrKronosN1Data)
+
+
+@pytest.mark.test_data_required
+def test_collection__kronos_n1__sel():
+    collection = Collection(TEST_DIRECTORIES["co_rpws_hfr_kronos_n1"])
+    start, end = Time("2012-06-28T20:50:00"), Time("2012-06-28T21:10:00")
+    assert len(collection.files_in_range(start, end)) == 2
+    times = Time([sweep.time for sweep in collection.sel(start, end)])
+    assert numpy.all(times >= start) and numpy.all(times <= end)
+    assert numpy.all(numpy.diff(times.jd) >= 0)
+    expected_times = Time(
+        numpy.concatenate([data.times.datetime64 for data in collection])
+    )
+    assert len(times) == numpy.count_nonzero(
+        (expected_times >= start) & (expected_times <= end)
+    )
+
+
+@pytest.mark.test_data_required
+def test_collection__header_time_range():
+    # no time pattern for these file names: the time ranges are read from the files
+    collection = Collection(
+        BASEDIR / "cdpp" / "interball" / "POLR_RSPN2_*",
+        dataset="cdpp_int_aur_polrad_rspn2",
+    )
+    assert len(collection) == 2
+    for item, data in zip(collection.index, collection):
+        assert item.start == data.times[0].datetime64
+        assert item.end == data.times[-1].datetime64
+
+    times = collection.open(collection.files[0]).times
+    start, end = times[2], times[5]
+    times = Time([sweep.time for sweep in collection.sel(start, end)])
+    assert numpy.all(times >= start) and numpy.all(times <= end)
+    assert numpy.all(numpy.diff(times.jd) >= 0)
+    expected_times = Time(
+        numpy.concatenate([data.times.datetime64 for data in collection])
+    )
+    assert len(times) == numpy.count_nonzero(
+        (expected_times >= start) & (expected_times <= end)
+    )
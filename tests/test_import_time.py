@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+
+from maser.data.base.registry import build_manifest, dataset_modules
+
+# modules which must not be imported by `import maser.data`
+LAZY_MODULES = [
+    "astropy",
+    "spacepy",
+    "xarray",
+    "nenupy",
+    "maser.data.cdpp",
+    "maser.data.ecallisto",
+    "maser.data.nancay",
+    "maser.data.padc",
+    "maser.data.pds",
+    "maser.data.psa",
+    "maser.data.rpw",
+]
+
+# budget for the (self) import time of the maser.data modules, in seconds
+IMPORT_TIME_BUDGET = 0.1
+
+
+def _run_python(code, *options):
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+
+
+def _self_import_times(stderr):
+    """Self import times (in seconds) of the modules, from `python -X importtime`"""
+    import_times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, _, module = line[len("import time:") :].split("|")
+        import_times[module.strip()] = int(self_time) * 1e-6
+    return import_times
+
+
+def test_import__lazy_modules():
+    result = _run_python("import sys, maser.data; print('\\n'.join(sys.modules))")
+    modules = result.stdout.split()
+    assert "maser.data.base" in modules
+    for module in modules:
+        assert not any(
+            module == lazy_module or module.startswith(lazy_module + ".")
+            for lazy_module in LAZY_MODULES
+        ), module
+
+
+def test_import__time():
+    result = _run_python("import maser.data", "-X", "importtime")
+    import_times = _self_import_times(result.stderr)
+    maser_data_import_time = sum(
+        import_time
+        for module, import_time in import_times.items()
+        if module.startswith("maser.data")
+    )
+    assert maser_data_import_time < IMPORT_TIME_BUDGET
+
+
+def test_import__manifest():
+    # the manifest must be regenerated when datasets are added
+    # (python -m maser.data.base.registry)
+    assert dataset_modules() == build_manifest()
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import datetime
 
+import numpy
 import pytest
 from maser.data.padc.cassini.kronos import (
     freq_abc,
@@ -8,6 +9,10 @@ from maser.data.padc.cassini.kronos import (
     ti_datetime,
     t97_datetime,
     ydh_datetime,
+    fi_freq_array,
+    ti_datetime_array,
+    t97_datetime_array,
+    ydh_datetime_array,
 )
 
 f_abc = {
@@ -244,3 +249,50 @@ def test_co_rpws_hfr_kronos__ydh_datetime__int():
 
 def test_co_rpws_hfr_kronos__ydh_datetime__str():
     assert ydh_datetime("2012180.22") == datetime.datetime(2012, 6, 28, 22, 0)
+
+
+def test_co_rpws_hfr_kronos__fi_freq_array():
+    fi = [3200, 10000800, 20001615, 31000201, 43000800]
+    freq = fi_freq_array(fi)
+    assert freq.dtype == numpy.float64
+    assert freq.tolist() == [fi_freq(x) for x in fi]
+
+
+def test_co_rpws_hfr_kronos__fi_freq_array__error():
+    with pytest.raises(ValueError):
+        fi_freq_array([3200, 1200])
+    # channel index out of the ABC table, as `fi_freq`
+    with pytest.raises(IndexError):
+        fi_freq(20000824)
+    with pytest.raises(IndexError):
+        fi_freq_array([3200, 20000824])
+
+
+def test_co_rpws_hfr_kronos__ti_datetime_array():
+    ti = [100000, 100100000, 186400, 200000]
+    c = [0, 0, 0, 1]
+    dt = ti_datetime_array(ti, c)
+    assert dt.dtype == numpy.dtype("datetime64[ns]")
+    assert dt.tolist() == [
+        numpy.datetime64(ti_datetime(x, y), "ns").astype(int) for x, y in zip(ti, c)
+    ]
+
+
+def test_co_rpws_hfr_kronos__t97_datetime_array():
+    t97 = numpy.array([1, 365.5, 366, 4017, 5000.123456789])
+    # rounding cases: half microseconds (rounded to even), and fraction of microsecond
+    # close to 0.5 (not rounded twice)
+    t97 = numpy.append(t97, [1 + 3 * 2.0**-14, 7982.175874322309])
+    dt = t97_datetime_array(t97)
+    assert dt.dtype == numpy.dtype("datetime64[ns]")
+    assert numpy.array_equal(
+        dt, numpy.array([t97_datetime(x) for x in t97], dtype="datetime64[ns]")
+    )
+
+
+def test_co_rpws_hfr_kronos__ydh_datetime_array():
+    expected = numpy.array(
+        [ydh_datetime(201218022), ydh_datetime(201218002)], dtype="datetime64[ns]"
+    )
+    assert numpy.array_equal(ydh_datetime_array([201218022, 201218002]), expected)
+    assert numpy.array_equal(ydh_datetime_array(["2012180.22", "2012180.2"]), expected)
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from .constants import BASEDIR
 import pytest
+import numpy
 from maser.data import Data
 from maser.data.base import BinData
 from maser.data.padc.cassini.data import CoRpwsHfrKronosN1Data, CoRpwsHfrKronosDataSweep
@@ -40,6 +41,24 @@ def test_co_rpws_hfr_kronos_n1_bin_dataset__len():
     assert data.file_size == 2201388
 
 
+@pytest.mark.test_data_required
+def test_co_rpws_hfr_kronos_n1_bin_dataset__load_mode_mmap():
+    filepath = TEST_FILES["co_rpws_hfr_kronos_n1"][0]
+    data = Data(filepath=filepath)
+    data_mmap = Data(filepath=filepath, load_mode="mmap")
+    assert isinstance(data_mmap._data, numpy.memmap)
+    assert numpy.array_equal(data_mmap._data, data._data)
+    assert data_mmap._nsweep == data._nsweep
+    assert data_mmap.times[-1] == data.times[-1]
+
+
+@pytest.mark.test_data_required
+def test_co_rpws_hfr_kronos_n1_bin_dataset__load_mode__error():
+    filepath = TEST_FILES["co_rpws_hfr_kronos_n1"][0]
+    with pytest.raises(ValueError):
+        Data(filepath=filepath, load_mode="foo")
+
+
 @pytest.mark.test_data_required
 def test_co_rpws_hfr_kronos_n1_bin_dataset__len_records():
     for filepath in TEST_FILES["co_rpws_hfr_kronos_n1"]:
@@ -139,8 +158,46 @@ def test_co_rpws_hfr_kronos_n1_bin_dataset__as_xarray():
         assert isinstance(xarr[k], DataArray)
 
 
+@pytest.mark.test_data_required
+def test_co_rpws_hfr_kronos_n1_bin_dataset__as_ragged():
+    filepath = TEST_FILES["co_rpws_hfr_kronos_n1"][0]
+    data = Data(filepath=filepath)
+    ragged = data.as_ragged()
+    assert len(ragged) == data._nsweep
+    assert ragged.frequencies.max_length == data._max_sweep_length
+    for i, sweep in enumerate(data.sweeps):
+        assert numpy.array_equal(ragged.frequencies[i], data.frequencies[i].value)
+        assert numpy.array_equal(ragged.data["auto1"][i], sweep.data["auto1"])
+
+
 @pytest.mark.test_data_required
 def test_co_rpws_hfr_kronos_n1_bin_dataset__records_data():
     filepath = TEST_FILES["co_rpws_hfr_kronos_n1"][0]
     data = Data(filepath=filepath)
     assert all(dd == rd for dd, rd in zip(data._data, data.records))
+
+
+@pytest.mark.test_data_required
+def test_co_rpws_hfr_kronos_n1_bin_dataset__sweeps_data():
+    filepath = TEST_FILES["co_rpws_hfr_kronos_n1"][0]
+    data = Data(filepath=filepath)
+    ti_values = numpy.unique(data._data["ti"])
+    assert data._max_sweep_length == max(
+        numpy.count_nonzero(data._data["ti"] == ti) for ti in ti_values
+    )
+    for ti, sweep in zip(ti_values, data.sweeps):
+        assert numpy.array_equal(sweep.data, data._data[data._data["ti"] == ti])
+
+
+@pytest.mark.test_data_required
+def test_co_rpws_hfr_kronos_n1_bin_dataset__sel():
+    filepath = TEST_FILES["co_rpws_hfr_kronos_n1"][0]
+    data = Data(filepath=filepath, load_mode="mmap")
+    times = data.times
+    sweeps = list(data.sel(time=slice(times[10], times[20]), frequency=slice(10, 100)))
+    assert len(sweeps) == 11
+    for sweep, time in zip(sweeps, times[10:21]):
+        assert sweep.time == time
+        assert numpy.all(sweep.frequencies.value >= 10)
+        assert numpy.all(sweep.frequencies.value <= 100)
+        assert len(sweep.data) == len(sweep.frequencies)
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from .constants import BASEDIR
 import pytest
+import numpy
 from maser.data import Data
 from maser.data.base import BinData
 from maser.data.padc.cassini.data import CoRpwsHfrKronosN2Data
@@ -38,6 +39,34 @@ def test_co_rpws_hfr_kronos_n2_bin_dataset__len():
     assert data.file_size == 3537945
 
 
+@pytest.mark.test_data_required
+def test_co_rpws_hfr_kronos_n2_bin_dataset__load_mode_mmap():
+    filepath = TEST_FILES["co_rpws_hfr_kronos_n2"][0]
+    data = Data(filepath=filepath)
+    data_mmap = Data(filepath=filepath, load_mode="mmap")
+    assert isinstance(data_mmap._data, numpy.memmap)
+    assert numpy.array_equal(data_mmap._data, data._data)
+    assert data_mmap._nsweep == data._nsweep
+    assert data_mmap.times[-1] == data.times[-1]
+
+
+@pytest.mark.test_data_required
+def test_co_rpws_hfr_kronos_n2_bin_dataset__workers():
+    filepath = TEST_FILES["co_rpws_hfr_kronos_n2"][0]
+    data = Data(filepath=filepath, access_mode="records")
+    data_workers = Data(filepath=filepath, access_mode="records", workers=2)
+    data_workers._min_chunk_size = 1000
+    assert numpy.all(data_workers.times == data.times)
+    assert numpy.array_equal(data_workers.frequencies, data.frequencies)
+
+
+@pytest.mark.test_data_required
+def test_co_rpws_hfr_kronos_n2_bin_dataset__load_mode__error():
+    filepath = TEST_FILES["co_rpws_hfr_kronos_n2"][0]
+    with pytest.raises(ValueError):
+        Data(filepath=filepath, load_mode="foo")
+
+
 @pytest.mark.test_data_required
 def test_co_rpws_hfr_kronos_n2_bin_dataset__len_records():
     for filepath in TEST_FILES["co_rpws_hfr_kronos_n2"]:
@@ -104,3 +133,15 @@ def test_co_rpws_hfr_kronos_n2_bin_dataset__frequencies_records():
     assert data.frequencies[0].value == pytest.approx(3.6856)
     assert data.frequencies[-1].value == pytest.approx(16025)
     assert data.frequencies.unit == "kHz"
+
+
+@pytest.mark.test_data_required
+def test_co_rpws_hfr_kronos_n2_bin_dataset__sweeps_data():
+    filepath = TEST_FILES["co_rpws_hfr_kronos_n2"][0]
+    data = Data(filepath=filepath)
+    t97_values = numpy.unique(data._data["t97"])
+    assert data._max_sweep_length == max(
+        numpy.count_nonzero(data._data["t97"] == t97) for t97 in t97_values
+    )
+    for t97, sweep in zip(t97_values, data.sweeps):
+        assert numpy.array_equal(sweep.data, data._data[data._data["t97"] == t97])
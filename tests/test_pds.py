@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
-from maser.data.pds.utils import PDSLabelDict
+from maser.data.pds.utils import PDSDataTableObject, PDSLabelDict, _parse_fmt_file
 from .constants import BASEDIR
 from maser.data import Data
 from maser.data.pds import (
     Pds3Data,
     Vg1JPra3RdrLowband6secV1Data,
 )
+import numpy
+import os
 import pytest
 
 TEST_FILES = {
@@ -25,6 +27,179 @@ def test_pds_label_dict():
     assert isinstance(label, PDSLabelDict)
 
 
+def test_pds_label_dict__fmt_cache(tmp_path):
+    fmt_path = tmp_path / "COLUMN.FMT"
+    fmt_path.write_text("OBJECT = COLUMN\n  NAME = A\nEND_OBJECT = COLUMN\n")
+    label_path = tmp_path / "FILE.LBL"
+    label_path.write_text(
+        'DESCRIPTION = "first line\n  second line"\nOBJECT = TABLE\n'
+        '  ^STRUCTURE = "COLUMN.FMT"\n  ROWS = 2\nEND_OBJECT = TABLE\nEND\n'
+    )
+    _parse_fmt_file.cache_clear()
+    for _ in range(2):
+        label = PDSLabelDict(label_file=label_path)
+        assert label["DESCRIPTION"] == "first line second line"
+        assert label["TABLE"] == [{"COLUMN": [{"NAME": "A"}], "ROWS": "2"}]
+    assert _parse_fmt_file.cache_info().misses == 1
+
+    # the FMT file is parsed again once modified
+    fmt_path.write_text("OBJECT = COLUMN\n  NAME = B\nEND_OBJECT = COLUMN\n")
+    os.utime(fmt_path, ns=(0, 0))
+    label = PDSLabelDict(label_file=label_path)
+    assert label["TABLE"][0]["COLUMN"] == [{"NAME": "B"}]
+
+
+@pytest.fixture
+def binary_table(tmp_path):
+    rows = numpy.zeros(
+        3,
+        dtype=[
+            ("PREFIX", ">u2"),
+            ("TIME", ">u4"),
+            ("FLUX", "<f4", (2,)),
+            ("NAME", "S3"),
+            ("SUFFIX", "u1"),
+        ],
+    )
+    rows["TIME"] = [1, 2, 2**32 - 1]
+    rows["FLUX"] = [[0.5, 1.5], [2.5, 3.5], [4.5, 5.5]]
+    rows["NAME"] = [b"ABC", b"DEF", b"GHI"]
+    data_path = tmp_path / "FILE.DAT"
+    data_path.write_bytes(b"\0" * 10 + rows.tobytes())
+    table_label = {
+        "INTERCHANGE_FORMAT": "BINARY",
+        "ROWS": "3",
+        "COLUMNS": "3",
+        "ROW_BYTES": "15",
+        "ROW_PREFIX_BYTES": "2",
+        "ROW_SUFFIX_BYTES": "1",
+        "COLUMN": [
+            {
+                "NAME": "TIME",
+                "DATA_TYPE": "MSB_UNSIGNED_INTEGER",
+                "START_BYTE": "1",
+                "BYTES": "4",
+            },
+            {
+                "NAME": "FLUX",
+                "DATA_TYPE": "PC_REAL",
+                "START_BYTE": "5",
+                "BYTES": "8",
+                "ITEMS": "2",
+                "ITEM_BYTES": "4",
+            },
+            {
+                "NAME": "NAME",
+                "DATA_TYPE": "CHARACTER",
+                "START_BYTE": "13",
+                "BYTES": "3",
+            },
+        ],
+    }
+    return table_label, data_path, rows
+
+
+@pytest.mark.parametrize("load_mode", ["memory", "mmap"])
+def test_pds_data_table_object__binary(binary_table, load_mode):
+    table_label, data_path, rows = binary_table
+    table = PDSDataTableObject(
+        table_label, data_path, data_offset=10, load_mode=load_mode
+    )
+    assert table.np_row_dtype.itemsize == 18
+    table.load_data()
+    assert table["TIME"].tolist() == [1, 2, 2**32 - 1]
+    assert table["TIME"].dtype == numpy.uint32
+    assert table["FLUX"].tolist() == rows["FLUX"].tolist()
+    assert table["NAME"][1].tolist() == ["D", "E", "F"]
+
+    table = PDSDataTableObject(
+        dict(table_label, ROWS="4"), data_path, data_offset=10, load_mode=load_mode
+    )
+    with pytest.raises(IOError):
+        table.load_data()
+
+
+@pytest.mark.parametrize("load_mode", ["memory", "mmap"])
+def test_pds_data_table_object__columns(binary_table, load_mode):
+    table_label, data_path, rows = binary_table
+    table = PDSDataTableObject(
+        table_label,
+        data_path,
+        data_offset=10,
+        columns=["TIME", "NAME"],
+        load_mode=load_mode,
+    )
+    # the selected columns are listed before being decoded
+    assert list(table) == list(table.keys()) == ["TIME", "NAME"]
+    assert len(table) == 2
+    assert "TIME" in table and "FLUX" not in table
+    assert table.get("FLUX") is None
+    assert not table.is_decoded("TIME")
+    assert table.get("TIME").tolist() == [1, 2, 2**32 - 1]
+    assert table.is_decoded("TIME") and not table.is_decoded("NAME")
+    with pytest.raises(KeyError):
+        table["FLUX"]
+    assert dict(table)["NAME"][1].tolist() == ["D", "E", "F"]
+    assert table.is_decoded("NAME")
+    table.load_data()
+    assert sorted(table) == ["NAME", "TIME"]
+    (chunk,) = table.iter_chunks()
+    assert chunk["TIME"].tolist() == table["TIME"].tolist()
+
+    with pytest.raises(ValueError):
+        PDSDataTableObject(table_label, data_path, columns=["TIME", "FOO"])
+
+
+def test_pds_data_table_object__ascii(tmp_path):
+    data_path = tmp_path / "FILE.TAB"
+    data_path.write_bytes(
+        b"1979-01-01T00:00 -12  1.5E+03,2.5E-01\r\n"
+        b"1979-01-01T00:01 345  4.0E+00,1.0E+01\r\n"
+        b"1979-01-01T00:02   7  0.0E+00,3.3E+02\r\n"
+    )
+    table_label = {
+        "INTERCHANGE_FORMAT": "ASCII",
+        "ROWS": "3",
+        "COLUMNS": "3",
+        "ROW_BYTES": "39",
+        "COLUMN": [
+            {
+                "NAME": "TIME",
+                "DATA_TYPE": "CHARACTER",
+                "START_BYTE": "1",
+                "BYTES": "16",
+            },
+            {
+                "NAME": "COUNT",
+                "DATA_TYPE": "ASCII_INTEGER",
+                "START_BYTE": "18",
+                "BYTES": "3",
+            },
+            {
+                "NAME": "FLUX",
+                "DATA_TYPE": "ASCII_REAL",
+                "START_BYTE": "23",
+                "BYTES": "15",
+                "ITEMS": "2",
+                "ITEM_BYTES": "7",
+                "ITEM_OFFSET": "8",
+            },
+        ],
+    }
+    table = PDSDataTableObject(table_label, data_path)
+    table.load_data()
+    assert "".join(table["TIME"][2]) == "1979-01-01T00:02"
+    assert table["COUNT"].tolist() == [-12, 345, 7]
+    assert table["FLUX"].tolist() == [[1500.0, 0.25], [4.0, 10.0], [0.0, 330.0]]
+
+    chunks = list(table.iter_chunks(chunk_size=2))
+    assert [len(chunk["COUNT"]) for chunk in chunks] == [2, 1]
+    for name in table:
+        assert numpy.array_equal(
+            numpy.concatenate([chunk[name] for chunk in chunks]), table[name]
+        )
+
+
 @pytest.mark.test_data_required
 def test_pds3_dataset():
     data = Data(
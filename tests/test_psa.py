@@ -7,6 +7,9 @@ from maser.data.psa import (
     MexMMarsis3RdrAisV1Sweep,
 )
 from maser.data.pds import Pds3Data
+from maser.data.pds.utils import PDSDataTableObject
+from maser.data.psa.labels import FMT_LABELS
+import numpy
 import pytest
 from astropy.units import Quantity
 
@@ -67,3 +70,56 @@ def test_mex_m_marsis_3_rdr_ais_ext4_v1_0__iter_method__sweeps(mex_data):
         "data_type",
         "mode_selection",
     }
+
+
+def test_mex_m_marsis_3_rdr_ais_v1_0__lazy_spectral_density(tmp_path):
+    label_path = tmp_path / "FRM_AIS_RDR_00001.LBL"
+    label_path.write_text(
+        "PDS_VERSION_ID = PDS3\n"
+        'DATA_SET_ID = "MEX-M-MARSIS-3-RDR-AIS-V1.0"\n'
+        "RECORD_BYTES = 400\n"
+        '^AIS_TABLE = ("FRM_AIS_RDR_00001.DAT", 1)\n'
+        "OBJECT = AIS_TABLE\n"
+        "  INTERCHANGE_FORMAT = BINARY\n"
+        "  ROWS = 4\n"
+        "  COLUMNS = 16\n"
+        "  ROW_BYTES = 400\n"
+        '  ^STRUCTURE = "AIS_FORMAT.FMT"\n'
+        "END_OBJECT = AIS_TABLE\n"
+        "END\n"
+    )
+    # 2 sweeps of 2 frequencies
+    label = Pds3Data.open_label(
+        label_path, fmt_label_dict=FMT_LABELS["MEX-M-MARSIS-3-RDR-AIS-V1.0"]
+    )
+    rows = numpy.zeros(
+        4, dtype=PDSDataTableObject(label["AIS_TABLE"][0], None).np_row_dtype
+    )
+    rows["SCET_MSEC"] = [1000, 1000, 8000, 8000]
+    rows["SCET_STRING"] = [
+        [bytes([c]) for c in b"2014-294T03:45:40.562   "],
+        [bytes([c]) for c in b"2014-294T03:45:40.562   "],
+        [bytes([c]) for c in b"2014-294T03:45:47.562   "],
+        [bytes([c]) for c in b"2014-294T03:45:47.562   "],
+    ]
+    rows["PROCESS_ID"] = 78
+    rows["INSTRUMENT_MODE"] = 0x17
+    rows["FREQUENCY"] = [1e5, 2e5, 1e5, 2e5]
+    rows["SPECTRAL_DENSITY"] = numpy.arange(4)[:, None]
+    rows.tofile(tmp_path / "FRM_AIS_RDR_00001.DAT")
+
+    data = Data(filepath=label_path)
+    assert isinstance(data, MexMMarsis3RdrAisV1Data)
+    assert len(data.times) == 2
+    assert data.frequencies.value.tolist() == [1e5, 2e5]
+    assert data.table.is_decoded("SCET_MSEC")
+    assert "SPECTRAL_DENSITY" in data.table
+    assert not data.table.is_decoded("SPECTRAL_DENSITY")
+
+    sweeps = list(data.sweeps)
+    assert data.table.is_decoded("SPECTRAL_DENSITY")
+    assert sweeps[1].data[:, 0].tolist() == [2, 3]
+
+    data = Data(filepath=label_path, load_data=False)
+    assert not data.table.is_decoded("SCET_MSEC")
+    assert len(data.times) == 2
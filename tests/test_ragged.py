@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+from maser.data.base import RaggedArray
+import numpy
+import pytest
+
+
+# RAGGED ARRAY TESTS
+def test_ragged_array():
+    ragged = RaggedArray.from_segments([[1.0, 2.0, 3.0], None, [4.0]])
+    assert len(ragged) == 3
+    assert numpy.array_equal(ragged.offsets, [0, 3, 3, 4])
+    assert numpy.array_equal(ragged.lengths, [3, 0, 1])
+    assert ragged.max_length == 3
+    assert numpy.array_equal(ragged[0], [1.0, 2.0, 3.0])
+    assert len(ragged[1]) == 0
+    assert numpy.array_equal(ragged[-1], [4.0])
+    assert numpy.array_equal(ragged.segment_ids, [0, 0, 0, 2])
+    assert numpy.array_equal(ragged.positions, [0, 1, 2, 0])
+
+
+def test_ragged_array__reductions():
+    ragged = RaggedArray.from_segments([[1.0, 2.0, 3.0], None, [4.0]])
+    assert numpy.array_equal(ragged.sum(), [6.0, 0.0, 4.0])
+    assert numpy.array_equal(ragged.min(), [1.0, numpy.nan, 4.0], equal_nan=True)
+    assert numpy.array_equal(ragged.max(), [3.0, numpy.nan, 4.0], equal_nan=True)
+    assert numpy.array_equal(ragged.mean(), [2.0, numpy.nan, 4.0], equal_nan=True)
+
+
+def test_ragged_array__to_padded():
+    ragged = RaggedArray.from_segments([[1.0, 2.0, 3.0], None, [4.0]])
+    nan = numpy.nan
+    assert numpy.array_equal(
+        ragged.to_padded(),
+        [[1.0, 2.0, 3.0], [nan, nan, nan], [4.0, nan, nan]],
+        equal_nan=True,
+    )
+    assert numpy.array_equal(
+        ragged.to_padded(edge=True),
+        [[1.0, 2.0, 3.0], [nan, nan, nan], [4.0, 4.0, 4.0]],
+        equal_nan=True,
+    )
+    assert numpy.array_equal(
+        ragged.to_padded(4, fill_value=0),
+        [[1.0, 2.0, 3.0, 0.0], [0.0, 0.0, 0.0, 0.0], [4.0, 0.0, 0.0, 0.0]],
+    )
+    # the segments are never truncated
+    with pytest.raises(ValueError):
+        ragged.to_padded(2)
+
+
+def test_ragged_array__offsets_error():
+    with pytest.raises(ValueError):
+        RaggedArray(numpy.zeros(3), [0, 2])
+    with pytest.raises(ValueError):
+        RaggedArray(numpy.zeros(3), [0, 2, 1, 3])